@@ -0,0 +1,151 @@
+"""
+Compare the output serialization paths on a synthetic inventory.
+
+Each case runs in its own process and reports the encode time, the extra peak
+memory the encoding needed on top of the inventory itself and the output size:
+
+    python benchmarks/serialization.py --size-mb 500
+"""
+
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import data_collector  # noqa: E402
+
+REGIONS = ["us-east-1", "us-west-2", "eu-west-1", "eu-central-1", "ap-southeast-1"]
+
+POLICY = {
+    "Version": "2012-10-17",
+    "Statement": [
+        {
+            "Effect": "Allow",
+            "Principal": {"AWS": "arn:aws:iam::123456789012:root"},
+            "Action": ["s3:GetObject", "s3:PutObject", "s3:ListBucket"],
+            "Resource": "arn:aws:s3:::example-bucket/*",
+        }
+    ],
+}
+
+
+def synthetic_resource(index: int, region: str) -> dict:
+    launched = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=index)
+    return {
+        "InstanceId": f"i-{index:017x}",
+        "Arn": f"arn:aws:ec2:{region}:123456789012:instance/i-{index:017x}",
+        "InstanceType": "m5.large",
+        "LaunchTime": launched,
+        "State": {"Code": 16, "Name": "running"},
+        "SecurityGroups": [{"GroupId": f"sg-{index % 50:017x}", "GroupName": "web"}],
+        "Tags": [
+            {"Key": "Environment", "Value": "production"},
+            {"Key": "Team", "Value": f"team-{index % 20}"},
+            {"Key": "CostCenter", "Value": f"cc-{index % 7}"},
+        ],
+        "Policy": POLICY,
+        "BlockDeviceMappings": [
+            {
+                "DeviceName": "/dev/xvda",
+                "Ebs": {
+                    "VolumeId": f"vol-{index:017x}",
+                    "AttachTime": launched,
+                    "DeleteOnTermination": True,
+                },
+            }
+        ],
+    }
+
+
+def synthetic_inventory(size_mb: float) -> list:
+    """Region records totalling roughly ``size_mb`` of compact JSON."""
+    resource_size = len(data_collector.dumps(synthetic_resource(0, REGIONS[0])))
+    per_region = int(size_mb * 1024 * 1024 / resource_size / len(REGIONS))
+    return [
+        {
+            "provider": "aws",
+            "account_id": "123456789012",
+            "region": region,
+            "collection_time": datetime.utcnow().isoformat(),
+            "services": {
+                "ec2": {
+                    "instances": [
+                        synthetic_resource(index, region) for index in range(per_region)
+                    ]
+                }
+            },
+        }
+        for region in REGIONS
+    ]
+
+
+class CountingWriter:
+    """A file sink that only counts what is written to it, as text or bytes."""
+
+    def __init__(self):
+        self.size = 0
+        self.buffer = self
+
+    def write(self, chunk) -> None:
+        self.size += len(chunk)
+
+    def flush(self) -> None:
+        pass
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_case(case: str, size_mb: float, results) -> None:
+    records = synthetic_inventory(size_mb)
+    before = peak_rss_mb()
+    sink = CountingWriter()
+    start = time.perf_counter()
+    if case == "stdlib-indent":
+        # The encoding the collector used before: pretty printed, default=str
+        json.dump(records, sink, indent=2, default=str)
+    else:
+        if case == "stdlib-compact":
+            data_collector.orjson = None
+        data_collector.dump(records, sink)
+    elapsed = time.perf_counter() - start
+    results.put((case, elapsed, peak_rss_mb() - before, sink.size / 1024 / 1024))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--size-mb",
+        type=float,
+        default=500,
+        help="Approximate compact size of the inventory (default: 500)",
+    )
+    args = parser.parse_args()
+
+    cases = ["stdlib-indent", "stdlib-compact"]
+    if data_collector.orjson is not None:
+        cases.append("orjson")
+    else:
+        print("orjson is not installed, skipping its case")
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    print(f"{'case':<16} {'seconds':>9} {'extra peak MB':>14} {'output MB':>10}")
+    for case in cases:
+        process = context.Process(target=run_case, args=(case, args.size_mb, results))
+        process.start()
+        name, elapsed, peak, size = results.get()
+        process.join()
+        print(f"{name:<16} {elapsed:>9.2f} {peak:>14.1f} {size:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
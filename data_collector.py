@@ -2,21 +2,61 @@ import argparse
 import json
 import sys
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, Any, List, Optional, Callable
 import os
 import logging
-from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import multiprocessing
+import shutil
+import signal
+import contextvars
+import socket
+import sqlite3
+import gzip
+import base64
+import io
+from abc import ABC, abstractmethod
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from tqdm import tqdm
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import uuid
+import hashlib
 import re
 from azure.identity import ClientSecretCredential
 from azure.mgmt.storage import StorageManagementClient
 
 import boto3
+import jmespath
+from botocore import xform_name
+from botocore.awsrequest import AWSResponse
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# CloudTrail keeps the event history lookup_events can search for 90 days
+CHANGE_LOOKBACK_DAYS = 90
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -41,10 +81,195 @@ app_config = {
 env = os.environ.get("ENV")
 
 
+def parse_service_limits(value: Optional[Any]) -> Dict[str, int]:
+    """Parse per-name limits, such as per-service caps or per-operation TTLs,
+    given as a dict or as "name=N,name=N"."""
+    if not value:
+        return {}
+    if isinstance(value, dict):
+        return {name: int(limit) for name, limit in value.items()}
+    limits = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        name, _, limit = item.partition("=")
+        limits[name.strip()] = int(limit)
+    return limits
+
+
+class CancellationToken:
+    """
+    Cooperative cancellation of a single service collection.
+    The token is cancelled once its deadline passes or ``cancel`` is called.
+    API calls made under a cancelled token are refused and services stop
+    between pages, so whatever was collected up to then is kept. ``interrupted``
+    records whether the collection was actually cut short.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.reason = None
+        self.interrupted = False
+
+    @property
+    def cancelled(self) -> bool:
+        if (
+            self.reason is None
+            and self.deadline is not None
+            and time.monotonic() >= self.deadline
+        ):
+            self.reason = "deadline exceeded"
+        return self.reason is not None
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        if self.reason is None:
+            self.reason = reason
+
+
+# Token of the service collection running in the current thread (or in the
+# thread that fanned out to it)
+current_cancellation_token: contextvars.ContextVar[Optional[CancellationToken]] = (
+    contextvars.ContextVar("current_cancellation_token", default=None)
+)
+
+
+def check_cancellation(model=None, **kwargs) -> None:
+    """botocore ``before-call`` handler refusing calls of a cancelled collection."""
+    token = current_cancellation_token.get()
+    if token is not None and token.cancelled:
+        token.interrupted = True
+        raise ClientError(
+            {
+                "Error": {
+                    "Code": "CollectionCancelled",
+                    "Message": f"Collection {token.reason}",
+                }
+            },
+            model.name if model is not None else "Unknown",
+        )
+
+
 class AWSService:
+    name = "service"
+
+    # Global services return account-wide data and are collected once per
+    # account against their home region instead of once per region.
+    is_global = False
+    home_region = "us-east-1"
+
+    # Size of the sub-pool used for per-resource detail calls
+    fan_out_workers = 8
+
+    # Rough run time in seconds, used to schedule long services first when no
+    # duration history is available
+    estimated_cost = 5.0
+
+    # Fingerprints of the previous run, set by the provider in incremental mode
+    fingerprints: Optional["ResourceFingerprints"] = None
+
+    # CloudTrail event sources of the write calls that can change this service's
+    # data. None means the data also changes without such calls (findings, job
+    # runs, counters, ...) and the service is always collected again.
+    event_sources: Optional[tuple] = None
+
+    # Cheap list calls as (operation, parameters, result key) on ``self.client``.
+    # When all of them come back empty the service has nothing to collect in
+    # the region and can be skipped in probe mode.
+    probes: Optional[tuple] = None
+
+    # Projections applied to results as pages come in, keyed by the response
+    # key they apply to, e.g. "SecurityGroups". A projection is a tuple of the
+    # fields to keep, a dict of fields to the projections of their values ("*"
+    # for every field, None to keep a value as is) or a JMESPath expression.
+    # Projected items are stripped of empty values.
+    projections: Optional[Dict[str, Any]] = None
+
     def __init__(self, session: boto3.Session):
         self.session = session
-        self.name = "service"
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the collection should stop, e.g. because its deadline passed.
+
+        Long loops check this to stop early and return what they have.
+        """
+        token = current_cancellation_token.get()
+        if token is not None and token.cancelled:
+            token.interrupted = True
+            return True
+        return False
+
+    def _paginate(self, paginator, **kwargs):
+        """Yield the projected pages of a paginator, stopping early once cancelled."""
+        for page in paginator.paginate(**kwargs):
+            yield self._project_response(page)
+            if self.cancelled:
+                return
+
+    def _apply_projection(self, value: Any, projection: Any) -> Any:
+        if isinstance(value, list):
+            return [self._apply_projection(item, projection) for item in value]
+        if projection is None or not isinstance(value, dict):
+            return value
+        if isinstance(projection, str):
+            return jmespath.search(projection, value)
+        if isinstance(projection, dict):
+            if "*" in projection:
+                return {
+                    key: self._apply_projection(child, projection["*"])
+                    for key, child in value.items()
+                }
+            return {
+                key: self._apply_projection(value[key], child_projection)
+                for key, child_projection in projection.items()
+                if key in value
+            }
+        return {key: value[key] for key in projection if key in value}
+
+    def _project(self, value: Any, projection: Any) -> Any:
+        """Project a result, or each item of a list, and strip empty values."""
+        if isinstance(value, list):
+            return [self._project(item, projection) for item in value]
+        value = self._apply_projection(value, projection)
+        return self._clean_empty_data(value) if isinstance(value, dict) else value
+
+    def _project_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        """Drop the response metadata and apply the service's projections."""
+        response.pop("ResponseMetadata", None)
+        for key, projection in (self.projections or {}).items():
+            if key in response:
+                response[key] = self._project(response[key], projection)
+        return response
+
+    def _fetch_if_changed(
+        self,
+        func: Callable[[Any], Any],
+        item: Any,
+        resource_id: str,
+        marker: Any,
+    ) -> Any:
+        """Fetch the details of a resource unless its change marker is unchanged.
+
+        ``marker`` is taken from a cheap list call (e.g. a revision or
+        modification time). In incremental mode the entry of the previous run
+        is reused when the marker matches, otherwise ``func(item)`` is called.
+        """
+        if self.fingerprints is None:
+            return func(item)
+        fingerprint = json.dumps(marker, sort_keys=True, default=str)
+        data = self.fingerprints.get(resource_id, fingerprint)
+        if data is None:
+            data = self.fingerprints.put(resource_id, fingerprint, func(item))
+        return data
+
+    def probe(self) -> Optional[bool]:
+        """Whether the probes found any resource, None if the service has none."""
+        if not self.probes:
+            return None
+        for operation, params, result_key in self.probes:
+            if getattr(self.client, operation)(**params).get(result_key):
+                return True
+        return False
 
     def _is_empty_value(self, value: Any) -> bool:
         """Check if a value is empty (empty string, list, dict, or None)."""
@@ -66,10 +291,74 @@ class AWSService:
                 nested = self._clean_empty_data(value)
                 if nested:  # Only add non-empty dictionaries
                     cleaned[key] = nested
+            elif isinstance(value, list):
+                items = [
+                    self._clean_empty_data(item) if isinstance(item, dict) else item
+                    for item in value
+                ]
+                items = [item for item in items if not self._is_empty_value(item)]
+                if items:
+                    cleaned[key] = items
             elif not self._is_empty_value(value):
                 cleaned[key] = value
         return cleaned
 
+    def _fan_out(self, func: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+        """Run a per-resource call for every item on a bounded sub-pool.
+
+        Results keep the order of ``items``. An item whose call raises is logged
+        and left out, so one failing resource does not lose the others.
+        """
+        failed = object()
+        # Worker threads do not inherit context variables such as the
+        # cancellation token, so each call runs in a copy of this thread's context
+        context = contextvars.copy_context()
+
+        def call(item):
+            if self.cancelled:
+                return failed
+            try:
+                return context.copy().run(func, item)
+            except Exception as e:
+                if self.cancelled:
+                    return failed
+                logger.warning(
+                    f"Error fetching {self.name} details in {self.session.region_name}: {str(e)}"
+                )
+                return failed
+
+        items = list(items)
+        workers = min(self.fan_out_workers, len(items))
+        if workers <= 1:
+            results = [call(item) for item in items]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(call, items))
+        return [result for result in results if result is not failed]
+
+    def handle_error(
+        self, error: ClientError, collected: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Log an API error that aborted the collection of this service.
+
+        Returns ``collected`` when the collection was cancelled, so a service
+        stopped at its deadline keeps what it gathered before, and None otherwise.
+        """
+        code = error.response.get("Error", {}).get("Code")
+        if code == "CollectionCancelled":
+            logger.warning(
+                f"{self.name} in {self.session.region_name} was stopped: {str(error)}"
+            )
+            return collected
+        elif code in APIRateLimiter.THROTTLE_CODES:
+            logger.warning(
+                f"{self.name} in {self.session.region_name} is still throttled after retries: {str(error)}"
+            )
+        else:
+            logger.error(
+                f"Error collecting {self.name} in {self.session.region_name}: {str(error)}"
+            )
+
     def generate(self) -> Dict[str, Any]:
         """Base generate method that should be overridden by child classes."""
         pass
@@ -81,9 +370,41 @@ class EC2Service(AWSService):
     Provides simplified access to EC2 instance data and related resources.
     """
 
+    name = "ec2"
+    estimated_cost = 15.0
+    event_sources = ("ec2.amazonaws.com",)
+    projections = {
+        "SecurityGroups": (
+            "GroupId",
+            "GroupName",
+            "Description",
+            "VpcId",
+            "OwnerId",
+            "SecurityGroupArn",
+            "IpPermissions",
+            "IpPermissionsEgress",
+            "Tags",
+        ),
+        "Volumes": (
+            "VolumeId",
+            "VolumeType",
+            "Size",
+            "Iops",
+            "Throughput",
+            "State",
+            "AvailabilityZone",
+            "CreateTime",
+            "Encrypted",
+            "KmsKeyId",
+            "SnapshotId",
+            "MultiAttachEnabled",
+            "Attachments",
+            "Tags",
+        ),
+    }
+
     def __init__(self, session: boto3.Session):
         super().__init__(session)
-        self.name = "ec2"
         self.client = self.session.client("ec2")
 
     def get_instances(self) -> Dict[str, Any]:
@@ -92,7 +413,7 @@ class EC2Service(AWSService):
             paginator = self.client.get_paginator("describe_instances")
             instances = []
 
-            for page in paginator.paginate():
+            for page in self._paginate(paginator):
                 for reservation in page["Reservations"]:
                     for instance in reservation["Instances"]:
                         instances.append(self._format_instance_data(instance))
@@ -105,7 +426,11 @@ class EC2Service(AWSService):
     def get_security_groups(self) -> Dict[str, Any]:
         """Get all security groups in the current region."""
         try:
-            return self.client.describe_security_groups()
+            paginator = self.client.get_paginator("describe_security_groups")
+            security_groups = []
+            for page in self._paginate(paginator):
+                security_groups.extend(page["SecurityGroups"])
+            return {"SecurityGroups": security_groups}
         except Exception as e:
             print(f"Error fetching security groups: {str(e)}")
             return {"SecurityGroups": []}
@@ -113,7 +438,11 @@ class EC2Service(AWSService):
     def get_volumes(self) -> Dict[str, Any]:
         """Get all EBS volumes in the current region."""
         try:
-            return self.client.describe_volumes()
+            paginator = self.client.get_paginator("describe_volumes")
+            volumes = []
+            for page in self._paginate(paginator):
+                volumes.extend(page["Volumes"])
+            return {"Volumes": volumes}
         except Exception as e:
             print(f"Error fetching volumes: {str(e)}")
             return {"Volumes": []}
@@ -147,9 +476,12 @@ class IAMService(AWSService):
     Provides simplified access to IAM resources and configurations.
     """
 
+    name = "iam"
+    estimated_cost = 45.0
+    is_global = True
+
     def __init__(self, session: boto3.Session):
         super().__init__(session)
-        self.name = "iam"
         self.client = self.session.client("iam")
 
     def get_users(self) -> Dict[str, Any]:
@@ -157,7 +489,7 @@ class IAMService(AWSService):
         try:
             paginator = self.client.get_paginator("list_users")
             users = []
-            for page in paginator.paginate():
+            for page in self._paginate(paginator):
                 users.extend(page["Users"])
             return {"Users": users}
         except Exception as e:
@@ -169,7 +501,7 @@ class IAMService(AWSService):
         try:
             paginator = self.client.get_paginator("list_roles")
             roles = []
-            for page in paginator.paginate():
+            for page in self._paginate(paginator):
                 roles.extend(page["Roles"])
             return {"Roles": roles}
         except Exception as e:
@@ -181,7 +513,7 @@ class IAMService(AWSService):
         try:
             paginator = self.client.get_paginator("list_policies")
             policies = []
-            for page in paginator.paginate(Scope="Local"):
+            for page in self._paginate(paginator, Scope="Local"):
                 policies.extend(page["Policies"])
             return {"Policies": policies}
         except Exception as e:
@@ -214,22 +546,22 @@ class KMSService(AWSService):
     Provides simplified access to KMS keys and their configurations.
     """
 
+    name = "kms"
+    event_sources = ("kms.amazonaws.com",)
+
     def __init__(self, session: boto3.Session):
         super().__init__(session)
-        self.name = "kms"
         self.client = self.session.client("kms")
 
     def get_keys(self) -> Dict[str, Any]:
         """Get all KMS keys and their configurations."""
         try:
             paginator = self.client.get_paginator("list_keys")
-            keys = []
-            for page in paginator.paginate():
-                for key in page["Keys"]:
-                    key_detail = self._get_key_details(key["KeyId"])
-                    if key_detail:
-                        keys.append(key_detail)
-            return {"Keys": keys}
+            key_ids = []
+            for page in self._paginate(paginator):
+                key_ids.extend(key["KeyId"] for key in page["Keys"])
+            keys = self._fan_out(self._get_key_details, key_ids)
+            return {"Keys": [key for key in keys if key]}
         except Exception as e:
             print(f"Error fetching KMS keys: {str(e)}")
             return {"Keys": []}
@@ -256,7 +588,9 @@ class KMSService(AWSService):
     def _get_key_rotation_status(self, key_id: str) -> Dict[str, Any]:
         """Get key rotation status for a specific KMS key."""
         try:
-            return self.client.get_key_rotation_status(KeyId=key_id)
+            return self._project_response(
+                self.client.get_key_rotation_status(KeyId=key_id)
+            )
         except Exception:
             return {}
 
@@ -265,7 +599,7 @@ class KMSService(AWSService):
         try:
             paginator = self.client.get_paginator("list_aliases")
             aliases = []
-            for page in paginator.paginate():
+            for page in self._paginate(paginator):
                 aliases.extend(page["Aliases"])
             return {"Aliases": aliases}
         except Exception as e:
@@ -283,16 +617,20 @@ class S3Service(AWSService):
     Provides simplified access to S3 buckets and their configurations.
     """
 
+    name = "s3"
+    estimated_cost = 60.0
+    is_global = True
+    event_sources = ("s3.amazonaws.com",)
+
     def __init__(self, session: boto3.Session):
         super().__init__(session)
-        self.name = "s3"
         self.client = self.session.client("s3")
 
     def get_buckets(self) -> Dict[str, Any]:
         """Get all S3 buckets and their basic information."""
         try:
             buckets = self.client.list_buckets()["Buckets"]
-            return {"Buckets": [self._get_bucket_details(bucket) for bucket in buckets]}
+            return {"Buckets": self._fan_out(self._get_bucket_details, buckets)}
         except Exception as e:
             print(f"Error fetching S3 buckets: {str(e)}")
             return {"Buckets": []}
@@ -335,7 +673,9 @@ class S3Service(AWSService):
     def _get_versioning(self, bucket_name: str) -> Dict[str, Any]:
         """Get versioning configuration for a bucket."""
         try:
-            return self.client.get_bucket_versioning(Bucket=bucket_name)
+            return self._project_response(
+                self.client.get_bucket_versioning(Bucket=bucket_name)
+            )
         except Exception:
             return {}
 
@@ -357,9 +697,10 @@ class CloudTrailService(AWSService):
     Provides simplified access to CloudTrail configurations and logs.
     """
 
+    name = "cloudtrail"
+
     def __init__(self, session: boto3.Session):
         super().__init__(session)
-        self.name = "cloudtrail"
         self.client = self.session.client("cloudtrail")
 
     def get_trails(self) -> Dict[str, Any]:
@@ -408,6 +749,30 @@ class CloudTrailService(AWSService):
             print(f"Error fetching event selectors: {str(e)}")
             return {"EventSelectors": {}}
 
+    def get_write_event_sources(
+        self, since: datetime, max_pages: int = 20
+    ) -> Optional[set]:
+        """Return the event sources of the write events logged since ``since``.
+
+        Returns None when there are more events than ``max_pages`` pages, in
+        which case everything should be treated as changed.
+        """
+        paginator = self.client.get_paginator("lookup_events")
+        sources = set()
+        for index, page in enumerate(
+            self._paginate(
+                paginator,
+                LookupAttributes=[
+                    {"AttributeKey": "ReadOnly", "AttributeValue": "false"}
+                ],
+                StartTime=since,
+            )
+        ):
+            if index >= max_pages:
+                return None
+            sources.update(event.get("EventSource") for event in page["Events"])
+        return sources
+
     def generate(self) -> Dict[str, Any]:
         """Generate a comprehensive report of CloudTrail resources."""
         return {
@@ -422,9 +787,15 @@ class RDSService(AWSService):
     Provides simplified access to RDS instances and their configurations.
     """
 
+    name = "rds"
+    event_sources = ("rds.amazonaws.com",)
+    probes = (
+        ("describe_db_instances", {"MaxRecords": 20}, "DBInstances"),
+        ("describe_db_snapshots", {"MaxRecords": 20}, "DBSnapshots"),
+    )
+
     def __init__(self, session: boto3.Session):
         super().__init__(session)
-        self.name = "rds"
         self.client = self.session.client("rds")
 
     def get_db_instances(self) -> Dict[str, Any]:
@@ -432,7 +803,7 @@ class RDSService(AWSService):
         try:
             paginator = self.client.get_paginator("describe_db_instances")
             instances = []
-            for page in paginator.paginate():
+            for page in self._paginate(paginator):
                 for instance in page["DBInstances"]:
                     instances.append(self._format_db_instance(instance))
             return {"DBInstances": instances}
@@ -469,7 +840,7 @@ class RDSService(AWSService):
         try:
             paginator = self.client.get_paginator("describe_db_snapshots")
             snapshots = []
-            for page in paginator.paginate():
+            for page in self._paginate(paginator):
                 for snapshot in page["DBSnapshots"]:
                     snapshots.append(
                         {
@@ -491,21 +862,22 @@ class RDSService(AWSService):
 
 
 class VPCService(AWSService):
+    name = "vpc"
+    event_sources = ("ec2.amazonaws.com",)
+
     def __init__(self, session):
         super().__init__(session)
-        self.name = "vpc"
         self.client = self.session.client("ec2")
 
     def generate(self) -> Dict[str, Any]:
+        vpc_data = {
+            "vpcs": [],
+            "subnets": [],
+            "security_groups": [],
+            "route_tables": [],
+            "internet_gateways": [],
+        }
         try:
-            vpc_data = {
-                "vpcs": [],
-                "subnets": [],
-                "security_groups": [],
-                "route_tables": [],
-                "internet_gateways": [],
-            }
-
             # Get VPCs
             vpcs = self.client.describe_vpcs()["Vpcs"]
             vpc_data["vpcs"] = [
@@ -568,23 +940,28 @@ class VPCService(AWSService):
             return vpc_data
 
         except ClientError as e:
-            self.handle_error(e)
-            return None
+            return self.handle_error(e, vpc_data)
 
 
 class LambdaService(AWSService):
+    name = "lambda"
+    estimated_cost = 20.0
+    event_sources = ("lambda.amazonaws.com",)
+    probes = (
+        ("list_functions", {"MaxItems": 1}, "Functions"),
+        ("list_layers", {"MaxItems": 1}, "Layers"),
+    )
+
     def __init__(self, session):
         super().__init__(session)
-        self.name = "lambda"
         self.client = self.session.client("lambda")
 
     def generate(self) -> Dict[str, Any]:
+        lambda_data = {"functions": [], "layers": []}
         try:
-            lambda_data = {"functions": [], "layers": []}
-
             # Get Lambda Functions
             paginator = self.client.get_paginator("list_functions")
-            for page in paginator.paginate():
+            for page in self._paginate(paginator):
                 for function in page["Functions"]:
                     function_data = {
                         "name": function["FunctionName"],
@@ -594,7 +971,7 @@ class LambdaService(AWSService):
                         "role": function.get("Role"),
                         "memory": function.get("MemorySize"),
                         "timeout": function.get("Timeout"),
-                        "last_modified": str(function.get("LastModified")),
+                        "last_modified": function.get("LastModified"),
                         "environment": function.get("Environment", {}).get(
                             "Variables", {}
                         ),
@@ -605,7 +982,7 @@ class LambdaService(AWSService):
 
             # Get Lambda Layers
             paginator = self.client.get_paginator("list_layers")
-            for page in paginator.paginate():
+            for page in self._paginate(paginator):
                 for layer in page["Layers"]:
                     layer_data = {
                         "name": layer["LayerName"],
@@ -617,20 +994,40 @@ class LambdaService(AWSService):
             return lambda_data
 
         except ClientError as e:
-            self.handle_error(e)
-            return None
+            return self.handle_error(e, lambda_data)
 
 
 class ECSService(AWSService):
+    name = "ecs"
+    probes = (
+        ("list_clusters", {"maxResults": 1}, "clusterArns"),
+        ("list_task_definitions", {"maxResults": 1}, "taskDefinitionArns"),
+    )
+
     def __init__(self, session):
         super().__init__(session)
-        self.name = "ecs"
         self.client = self.session.client("ecs")
 
+    def _get_task_definition_details(self, task_def_arn: str) -> Dict[str, Any]:
+        """Get the details of a task definition revision."""
+        task_def = self.client.describe_task_definition(taskDefinition=task_def_arn)[
+            "taskDefinition"
+        ]
+        return {
+            "family": task_def["family"],
+            "revision": task_def["revision"],
+            "arn": task_def["taskDefinitionArn"],
+            "status": task_def["status"],
+            "container_definitions": task_def["containerDefinitions"],
+            "cpu": task_def.get("cpu"),
+            "memory": task_def.get("memory"),
+            "network_mode": task_def.get("networkMode"),
+            "requires_compatibilities": task_def.get("requiresCompatibilities", []),
+        }
+
     def generate(self) -> Dict[str, Any]:
+        ecs_data = {"clusters": [], "task_definitions": [], "services": []}
         try:
-            ecs_data = {"clusters": [], "task_definitions": [], "services": []}
-
             # Get ECS Clusters
             clusters = self.client.list_clusters()["clusterArns"]
             if clusters:
@@ -676,242 +1073,281 @@ class ECSService(AWSService):
                             }
                             ecs_data["services"].append(service_data)
 
-            # Get Task Definitions
+            # Get Task Definitions; an ARN names one immutable revision, so a
+            # known ARN does not need to be described again
             task_defs = self.client.list_task_definitions()["taskDefinitionArns"]
-            if task_defs:
-                for task_def_arn in task_defs:
-                    task_def = self.client.describe_task_definition(
-                        taskDefinition=task_def_arn
-                    )["taskDefinition"]
-                    task_def_data = {
-                        "family": task_def["family"],
-                        "revision": task_def["revision"],
-                        "arn": task_def["taskDefinitionArn"],
-                        "status": task_def["status"],
-                        "container_definitions": task_def["containerDefinitions"],
-                        "cpu": task_def.get("cpu"),
-                        "memory": task_def.get("memory"),
-                        "network_mode": task_def.get("networkMode"),
-                        "requires_compatibilities": task_def.get(
-                            "requiresCompatibilities", []
-                        ),
-                    }
-                    ecs_data["task_definitions"].append(task_def_data)
+            ecs_data["task_definitions"] = self._fan_out(
+                lambda arn: self._fetch_if_changed(
+                    self._get_task_definition_details, arn, arn, arn
+                ),
+                task_defs,
+            )
 
             return ecs_data
 
         except ClientError as e:
-            self.handle_error(e)
-            return None
+            return self.handle_error(e, ecs_data)
 
 
 class SNSService(AWSService):
+    name = "sns"
+    event_sources = ("sns.amazonaws.com",)
+    probes = (("list_topics", {}, "Topics"),)
+
     def __init__(self, session):
         super().__init__(session)
-        self.name = "sns"
         self.client = self.session.client("sns")
 
+    def _get_topic_details(self, topic_arn: str) -> Dict[str, Any]:
+        """Get attributes, tags and subscriptions of a topic."""
+        topic_data = {
+            "arn": topic_arn,
+            "name": topic_arn.split(":")[-1],
+            "attributes": self.client.get_topic_attributes(TopicArn=topic_arn)[
+                "Attributes"
+            ],
+            "tags": self.client.list_tags_for_resource(ResourceArn=topic_arn).get(
+                "Tags", []
+            ),
+        }
+
+        # Get subscriptions for this topic
+        subs_paginator = self.client.get_paginator("list_subscriptions_by_topic")
+        topic_subscriptions = []
+        for subs_page in self._paginate(subs_paginator, TopicArn=topic_arn):
+            for sub in subs_page["Subscriptions"]:
+                sub_data = {
+                    "arn": sub["SubscriptionArn"],
+                    "protocol": sub["Protocol"],
+                    "endpoint": sub["Endpoint"],
+                    "owner": sub["Owner"],
+                    "topic_arn": sub["TopicArn"],
+                }
+                if sub["SubscriptionArn"] != "PendingConfirmation":
+                    try:
+                        attrs = self.client.get_subscription_attributes(
+                            SubscriptionArn=sub["SubscriptionArn"]
+                        )["Attributes"]
+                        sub_data["attributes"] = attrs
+                    except ClientError:
+                        pass
+                topic_subscriptions.append(sub_data)
+
+        topic_data["subscriptions"] = topic_subscriptions
+        return topic_data
+
     def generate(self) -> Dict[str, Any]:
+        sns_data = {"topics": [], "subscriptions": []}
         try:
-            sns_data = {"topics": [], "subscriptions": []}
-
             # Get SNS Topics
             paginator = self.client.get_paginator("list_topics")
-            for page in paginator.paginate():
-                for topic in page["Topics"]:
-                    topic_arn = topic["TopicArn"]
-                    topic_data = {
-                        "arn": topic_arn,
-                        "name": topic_arn.split(":")[-1],
-                        "attributes": self.client.get_topic_attributes(
-                            TopicArn=topic_arn
-                        )["Attributes"],
-                        "tags": self.client.list_tags_for_resource(
-                            ResourceArn=topic_arn
-                        ).get("Tags", []),
-                    }
-
-                    # Get subscriptions for this topic
-                    subs_paginator = self.client.get_paginator(
-                        "list_subscriptions_by_topic"
-                    )
-                    topic_subscriptions = []
-                    for subs_page in subs_paginator.paginate(TopicArn=topic_arn):
-                        for sub in subs_page["Subscriptions"]:
-                            sub_data = {
-                                "arn": sub["SubscriptionArn"],
-                                "protocol": sub["Protocol"],
-                                "endpoint": sub["Endpoint"],
-                                "owner": sub["Owner"],
-                                "topic_arn": sub["TopicArn"],
-                            }
-                            if sub["SubscriptionArn"] != "PendingConfirmation":
-                                try:
-                                    attrs = self.client.get_subscription_attributes(
-                                        SubscriptionArn=sub["SubscriptionArn"]
-                                    )["Attributes"]
-                                    sub_data["attributes"] = attrs
-                                except ClientError:
-                                    pass
-                            topic_subscriptions.append(sub_data)
-
-                    topic_data["subscriptions"] = topic_subscriptions
-                    sns_data["topics"].append(topic_data)
+            topic_arns = []
+            for page in self._paginate(paginator):
+                topic_arns.extend(topic["TopicArn"] for topic in page["Topics"])
+            sns_data["topics"] = self._fan_out(self._get_topic_details, topic_arns)
 
             return sns_data
 
         except ClientError as e:
-            self.handle_error(e)
-            return None
+            return self.handle_error(e, sns_data)
 
 
 class SQSService(AWSService):
+    name = "sqs"
+    probes = (("list_queues", {"MaxResults": 1}, "QueueUrls"),)
+
     def __init__(self, session):
         super().__init__(session)
-        self.name = "sqs"
         self.client = self.session.client("sqs")
 
+    def _get_queue_details(self, queue_url: str) -> Dict[str, Any]:
+        """Get attributes and tags of a queue."""
+        queue_data = {
+            "url": queue_url,
+            "name": queue_url.split("/")[-1],
+            "attributes": self.client.get_queue_attributes(
+                QueueUrl=queue_url, AttributeNames=["All"]
+            )["Attributes"],
+            "tags": self.client.list_queue_tags(QueueUrl=queue_url).get("Tags", {}),
+        }
+
+        # Get dead-letter queue if configured
+        if "RedrivePolicy" in queue_data["attributes"]:
+            queue_data["dead_letter_queue"] = queue_data["attributes"]["RedrivePolicy"]
+
+        # Get encryption details if configured
+        if "KmsMasterKeyId" in queue_data["attributes"]:
+            queue_data["encryption"] = {
+                "kms_master_key_id": queue_data["attributes"]["KmsMasterKeyId"],
+                "kms_data_key_reuse_period": queue_data["attributes"].get(
+                    "KmsDataKeyReusePeriodSeconds"
+                ),
+            }
+
+        return queue_data
+
     def generate(self) -> Dict[str, Any]:
+        sqs_data = {"queues": []}
         try:
-            sqs_data = {"queues": []}
-
             # Get SQS Queues
             queues = self.client.list_queues()
             if "QueueUrls" in queues:
-                for queue_url in queues["QueueUrls"]:
-                    queue_data = {
-                        "url": queue_url,
-                        "name": queue_url.split("/")[-1],
-                        "attributes": self.client.get_queue_attributes(
-                            QueueUrl=queue_url, AttributeNames=["All"]
-                        )["Attributes"],
-                        "tags": self.client.list_queue_tags(QueueUrl=queue_url).get(
-                            "Tags", {}
-                        ),
-                    }
-
-                    # Get dead-letter queue if configured
-                    if "RedrivePolicy" in queue_data["attributes"]:
-                        queue_data["dead_letter_queue"] = queue_data["attributes"][
-                            "RedrivePolicy"
-                        ]
-
-                    # Get encryption details if configured
-                    if "KmsMasterKeyId" in queue_data["attributes"]:
-                        queue_data["encryption"] = {
-                            "kms_master_key_id": queue_data["attributes"][
-                                "KmsMasterKeyId"
-                            ],
-                            "kms_data_key_reuse_period": queue_data["attributes"].get(
-                                "KmsDataKeyReusePeriodSeconds"
-                            ),
-                        }
-
-                    sqs_data["queues"].append(queue_data)
+                sqs_data["queues"] = self._fan_out(
+                    self._get_queue_details, queues["QueueUrls"]
+                )
 
             return sqs_data
 
         except ClientError as e:
-            self.handle_error(e)
-            return None
+            return self.handle_error(e, sqs_data)
 
 
 class ACMService(AWSService):
+    name = "acm"
+    event_sources = ("acm.amazonaws.com",)
+    probes = (("list_certificates", {"MaxItems": 1}, "CertificateSummaryList"),)
+
+    # Certificate summary fields that change whenever a certificate is issued,
+    # renewed, imported, revoked or attached
+    CHANGE_MARKERS = (
+        "Status",
+        "IssuedAt",
+        "ImportedAt",
+        "RevokedAt",
+        "NotAfter",
+        "RenewalEligibility",
+        "InUse",
+    )
+
     def __init__(self, session):
         super().__init__(session)
-        self.name = "acm"
         self.client = self.session.client("acm")
 
+    def _get_certificate_details(self, cert: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the details and tags of a certificate."""
+        cert_details = self.client.describe_certificate(
+            CertificateArn=cert["CertificateArn"]
+        )["Certificate"]
+
+        return {
+            "arn": cert_details["CertificateArn"],
+            "domain_name": cert_details.get("DomainName"),
+            "status": cert_details.get("Status"),
+            "type": cert_details.get("Type"),
+            "subject_alternative_names": cert_details.get(
+                "SubjectAlternativeNames", []
+            ),
+            "domain_validation_options": cert_details.get(
+                "DomainValidationOptions", []
+            ),
+            "issued_at": cert_details.get("IssuedAt"),
+            "not_before": cert_details.get("NotBefore"),
+            "not_after": cert_details.get("NotAfter"),
+            "key_algorithm": cert_details.get("KeyAlgorithm"),
+            "serial_number": cert_details.get("Serial"),
+            "renewal_eligibility": cert_details.get("RenewalEligibility"),
+            "tags": self.client.list_tags_for_certificate(
+                CertificateArn=cert["CertificateArn"]
+            ).get("Tags", []),
+        }
+
     def generate(self) -> Dict[str, Any]:
+        acm_data = {"certificates": []}
         try:
-            acm_data = {"certificates": []}
-
             # List certificates
             paginator = self.client.get_paginator("list_certificates")
-            for page in paginator.paginate():
-                for cert in page["CertificateSummaryList"]:
-                    cert_details = self.client.describe_certificate(
-                        CertificateArn=cert["CertificateArn"]
-                    )["Certificate"]
-
-                    cert_data = {
-                        "arn": cert_details["CertificateArn"],
-                        "domain_name": cert_details.get("DomainName"),
-                        "status": cert_details.get("Status"),
-                        "type": cert_details.get("Type"),
-                        "subject_alternative_names": cert_details.get(
-                            "SubjectAlternativeNames", []
-                        ),
-                        "domain_validation_options": cert_details.get(
-                            "DomainValidationOptions", []
-                        ),
-                        "issued_at": str(cert_details.get("IssuedAt", "")),
-                        "not_before": str(cert_details.get("NotBefore", "")),
-                        "not_after": str(cert_details.get("NotAfter", "")),
-                        "key_algorithm": cert_details.get("KeyAlgorithm"),
-                        "serial_number": cert_details.get("Serial"),
-                        "renewal_eligibility": cert_details.get("RenewalEligibility"),
-                        "tags": self.client.list_tags_for_certificate(
-                            CertificateArn=cert["CertificateArn"]
-                        ).get("Tags", []),
-                    }
-                    acm_data["certificates"].append(cert_data)
+            certificates = []
+            for page in self._paginate(paginator):
+                certificates.extend(page["CertificateSummaryList"])
+            acm_data["certificates"] = self._fan_out(
+                lambda cert: self._fetch_if_changed(
+                    self._get_certificate_details,
+                    cert,
+                    cert["CertificateArn"],
+                    {key: cert.get(key) for key in self.CHANGE_MARKERS},
+                ),
+                certificates,
+            )
 
             return acm_data
 
         except ClientError as e:
-            self.handle_error(e)
-            return None
+            return self.handle_error(e, acm_data)
 
 
 class DynamoDBService(AWSService):
+    name = "dynamodb"
+    probes = (
+        ("list_tables", {"Limit": 1}, "TableNames"),
+        ("list_backups", {"Limit": 1}, "BackupSummaries"),
+        ("list_global_tables", {"Limit": 1}, "GlobalTables"),
+    )
+
     def __init__(self, session):
         super().__init__(session)
-        self.name = "dynamodb"
         self.client = self.session.client("dynamodb")
 
-    def generate(self) -> Dict[str, Any]:
+    def _get_table_details(self, table_name: str) -> Dict[str, Any]:
+        """Get the description, tags and continuous backups status of a table."""
+        table = self.client.describe_table(TableName=table_name)["Table"]
+        table_data = {
+            "name": table["TableName"],
+            "arn": table.get("TableArn"),
+            "status": table.get("TableStatus"),
+            "creation_date": table.get("CreationDateTime"),
+            "provisioned_throughput": table.get("ProvisionedThroughput", {}),
+            "size_bytes": table.get("TableSizeBytes"),
+            "item_count": table.get("ItemCount"),
+            "key_schema": table.get("KeySchema", []),
+            "attribute_definitions": table.get("AttributeDefinitions", []),
+            "billing_mode": table.get("BillingModeSummary", {}).get("BillingMode"),
+            "encryption": table.get("SSEDescription", {}),
+        }
+        table_data.update(
+            self._fetch_if_changed(
+                self._get_table_extras,
+                table,
+                table["TableArn"],
+                {
+                    "status": table.get("TableStatus"),
+                    "size_bytes": table.get("TableSizeBytes"),
+                },
+            )
+        )
+        return table_data
+
+    def _get_table_extras(self, table: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the tags and continuous backups status of a table."""
+        extras = {
+            "tags": self.client.list_tags_of_resource(
+                ResourceArn=table["TableArn"]
+            ).get("Tags", [])
+        }
+
+        # Get continuous backups status
         try:
-            dynamodb_data = {"tables": [], "backups": [], "global_tables": []}
+            backup_status = self.client.describe_continuous_backups(
+                TableName=table["TableName"]
+            )
+            extras["continuous_backups"] = backup_status.get(
+                "ContinuousBackupsDescription", {}
+            )
+        except ClientError:
+            pass
 
+        return extras
+
+    def generate(self) -> Dict[str, Any]:
+        dynamodb_data = {"tables": [], "backups": [], "global_tables": []}
+        try:
             # List tables
             paginator = self.client.get_paginator("list_tables")
-            for page in paginator.paginate():
-                for table_name in page["TableNames"]:
-                    table = self.client.describe_table(TableName=table_name)["Table"]
-                    table_data = {
-                        "name": table["TableName"],
-                        "arn": table.get("TableArn"),
-                        "status": table.get("TableStatus"),
-                        "creation_date": str(table.get("CreationDateTime", "")),
-                        "provisioned_throughput": table.get(
-                            "ProvisionedThroughput", {}
-                        ),
-                        "size_bytes": table.get("TableSizeBytes"),
-                        "item_count": table.get("ItemCount"),
-                        "key_schema": table.get("KeySchema", []),
-                        "attribute_definitions": table.get("AttributeDefinitions", []),
-                        "billing_mode": table.get("BillingModeSummary", {}).get(
-                            "BillingMode"
-                        ),
-                        "encryption": table.get("SSEDescription", {}),
-                        "tags": self.client.list_tags_of_resource(
-                            ResourceArn=table["TableArn"]
-                        ).get("Tags", []),
-                    }
-
-                    # Get continuous backups status
-                    try:
-                        backup_status = self.client.describe_continuous_backups(
-                            TableName=table_name
-                        )
-                        table_data["continuous_backups"] = backup_status.get(
-                            "ContinuousBackupsDescription", {}
-                        )
-                    except ClientError:
-                        pass
-
-                    dynamodb_data["tables"].append(table_data)
+            table_names = []
+            for page in self._paginate(paginator):
+                table_names.extend(page["TableNames"])
+            dynamodb_data["tables"] = self._fan_out(
+                self._get_table_details, table_names
+            )
 
             # List backups
             try:
@@ -921,7 +1357,7 @@ class DynamoDBService(AWSService):
                         "arn": backup["BackupArn"],
                         "name": backup["BackupName"],
                         "status": backup["BackupStatus"],
-                        "creation_date": str(backup.get("BackupCreationDateTime", "")),
+                        "creation_date": backup.get("BackupCreationDateTime"),
                         "size_bytes": backup.get("BackupSizeBytes"),
                         "table_name": backup.get("TableName"),
                         "table_id": backup.get("TableId"),
@@ -948,20 +1384,61 @@ class DynamoDBService(AWSService):
             return dynamodb_data
 
         except ClientError as e:
-            self.handle_error(e)
-            return None
+            return self.handle_error(e, dynamodb_data)
 
 
 class EKSService(AWSService):
+    name = "eks"
+    event_sources = ("eks.amazonaws.com",)
+    probes = (("list_clusters", {"maxResults": 1}, "clusters"),)
+
     def __init__(self, session):
         super().__init__(session)
-        self.name = "eks"
         self.client = self.session.client("eks")
 
+    def _get_nodegroup_details(
+        self, cluster_name: str, nodegroup_name: str
+    ) -> Dict[str, Any]:
+        """Get detailed information about a nodegroup."""
+        nodegroup = self.client.describe_nodegroup(
+            clusterName=cluster_name, nodegroupName=nodegroup_name
+        )["nodegroup"]
+
+        return {
+            "name": nodegroup["nodegroupName"],
+            "arn": nodegroup["nodegroupArn"],
+            "status": nodegroup["status"],
+            "instance_types": nodegroup.get("instanceTypes", []),
+            "subnets": nodegroup.get("subnets", []),
+            "scaling_config": nodegroup.get("scalingConfig", {}),
+            "disk_size": nodegroup.get("diskSize"),
+            "capacity_type": nodegroup.get("capacityType"),
+            "ami_type": nodegroup.get("amiType"),
+            "remote_access": nodegroup.get("remoteAccess", {}),
+            "tags": nodegroup.get("tags", {}),
+        }
+
+    def _get_fargate_profile_details(
+        self, cluster_name: str, profile_name: str
+    ) -> Dict[str, Any]:
+        """Get detailed information about a Fargate profile."""
+        profile = self.client.describe_fargate_profile(
+            clusterName=cluster_name, fargateProfileName=profile_name
+        )["fargateProfile"]
+
+        return {
+            "name": profile["fargateProfileName"],
+            "arn": profile["fargateProfileArn"],
+            "status": profile["status"],
+            "pod_execution_role_arn": profile.get("podExecutionRoleArn"),
+            "subnets": profile.get("subnets", []),
+            "selectors": profile.get("selectors", []),
+            "tags": profile.get("tags", {}),
+        }
+
     def generate(self) -> Dict[str, Any]:
+        eks_data = {"clusters": []}
         try:
-            eks_data = {"clusters": []}
-
             # List clusters
             clusters = self.client.list_clusters()["clusters"]
             for cluster_name in clusters:
@@ -971,52 +1448,24 @@ class EKSService(AWSService):
                 nodegroups = self.client.list_nodegroups(clusterName=cluster_name)[
                     "nodegroups"
                 ]
-                nodegroup_details = []
-
-                for nodegroup_name in nodegroups:
-                    nodegroup = self.client.describe_nodegroup(
-                        clusterName=cluster_name, nodegroupName=nodegroup_name
-                    )["nodegroup"]
-
-                    nodegroup_data = {
-                        "name": nodegroup["nodegroupName"],
-                        "arn": nodegroup["nodegroupArn"],
-                        "status": nodegroup["status"],
-                        "instance_types": nodegroup.get("instanceTypes", []),
-                        "subnets": nodegroup.get("subnets", []),
-                        "scaling_config": nodegroup.get("scalingConfig", {}),
-                        "disk_size": nodegroup.get("diskSize"),
-                        "capacity_type": nodegroup.get("capacityType"),
-                        "ami_type": nodegroup.get("amiType"),
-                        "remote_access": nodegroup.get("remoteAccess", {}),
-                        "tags": nodegroup.get("tags", {}),
-                    }
-                    nodegroup_details.append(nodegroup_data)
+                nodegroup_details = self._fan_out(
+                    lambda nodegroup_name: self._get_nodegroup_details(
+                        cluster_name, nodegroup_name
+                    ),
+                    nodegroups,
+                )
 
                 # Get Fargate profiles for this cluster
                 try:
                     fargate_profiles = self.client.list_fargate_profiles(
                         clusterName=cluster_name
                     )["fargateProfileNames"]
-                    fargate_details = []
-
-                    for profile_name in fargate_profiles:
-                        profile = self.client.describe_fargate_profile(
-                            clusterName=cluster_name, fargateProfileName=profile_name
-                        )["fargateProfile"]
-
-                        profile_data = {
-                            "name": profile["fargateProfileName"],
-                            "arn": profile["fargateProfileArn"],
-                            "status": profile["status"],
-                            "pod_execution_role_arn": profile.get(
-                                "podExecutionRoleArn"
-                            ),
-                            "subnets": profile.get("subnets", []),
-                            "selectors": profile.get("selectors", []),
-                            "tags": profile.get("tags", {}),
-                        }
-                        fargate_details.append(profile_data)
+                    fargate_details = self._fan_out(
+                        lambda profile_name: self._get_fargate_profile_details(
+                            cluster_name, profile_name
+                        ),
+                        fargate_profiles,
+                    )
                 except ClientError:
                     fargate_details = []
 
@@ -1045,24 +1494,28 @@ class EKSService(AWSService):
             return eks_data
 
         except ClientError as e:
-            self.handle_error(e)
-            return None
+            return self.handle_error(e, eks_data)
 
 
 class ElastiCacheService(AWSService):
+    name = "elasticache"
+    event_sources = ("elasticache.amazonaws.com",)
+    probes = (
+        ("describe_cache_clusters", {"MaxRecords": 20}, "CacheClusters"),
+        ("describe_replication_groups", {"MaxRecords": 20}, "ReplicationGroups"),
+    )
+
     def __init__(self, session):
         super().__init__(session)
-        self.name = "elasticache"
         self.client = self.session.client("elasticache")
 
     def generate(self) -> Dict[str, Any]:
+        elasticache_data = {"clusters": [], "replication_groups": []}
         try:
-            elasticache_data = {"clusters": [], "replication_groups": []}
-
             # List clusters
             try:
                 paginator = self.client.get_paginator("describe_cache_clusters")
-                for page in paginator.paginate():
+                for page in self._paginate(paginator):
                     for cluster in page.get("CacheClusters", []):
                         cluster_data = {
                             "id": cluster["CacheClusterId"],
@@ -1093,7 +1546,7 @@ class ElastiCacheService(AWSService):
             # List replication groups
             try:
                 paginator = self.client.get_paginator("describe_replication_groups")
-                for page in paginator.paginate():
+                for page in self._paginate(paginator):
                     for group in page.get("ReplicationGroups", []):
                         group_data = {
                             "id": group["ReplicationGroupId"],
@@ -1113,20 +1566,19 @@ class ElastiCacheService(AWSService):
             return elasticache_data
 
         except ClientError as e:
-            self.handle_error(e)
-            return None
+            return self.handle_error(e, elasticache_data)
 
 
 class GuardDutyService(AWSService):
+    name = "guardduty"
+
     def __init__(self, session):
         super().__init__(session)
-        self.name = "guardduty"
         self.client = self.session.client("guardduty")
 
     def generate(self) -> Dict[str, Any]:
+        guardduty_data = {"detectors": []}
         try:
-            guardduty_data = {"detectors": []}
-
             # List detectors
             detector_ids = self.client.list_detectors()["DetectorIds"]
             for detector_id in detector_ids:
@@ -1213,20 +1665,25 @@ class GuardDutyService(AWSService):
             return guardduty_data
 
         except ClientError as e:
-            self.handle_error(e)
-            return None
+            return self.handle_error(e, guardduty_data)
 
 
 class OpenSearchService(AWSService):
+    name = "opensearch"
+    event_sources = ("es.amazonaws.com",)
+    probes = (("list_domain_names", {}, "DomainNames"),)
+    # describe_domain already has the options; keep their settings and state
+    projections = {
+        "DomainConfig": {"*": {"Options": None, "Status": ("State", "UpdateDate")}}
+    }
+
     def __init__(self, session):
         super().__init__(session)
-        self.name = "opensearch"
         self.client = self.session.client("opensearch")
 
     def generate(self) -> Dict[str, Any]:
+        opensearch_data = {"domains": []}
         try:
-            opensearch_data = {"domains": []}
-
             # List domains
             domain_names = self.client.list_domain_names()["DomainNames"]
             for domain in domain_names:
@@ -1238,8 +1695,8 @@ class OpenSearchService(AWSService):
                 ]
 
                 # Get domain configuration options
-                config_options = self.client.describe_domain_config(
-                    DomainName=domain_name
+                config_options = self._project_response(
+                    self.client.describe_domain_config(DomainName=domain_name)
                 )["DomainConfig"]
 
                 # Get VPC endpoints if available
@@ -1300,23 +1757,23 @@ class OpenSearchService(AWSService):
             return opensearch_data
 
         except ClientError as e:
-            self.handle_error(e)
-            return None
+            return self.handle_error(e, opensearch_data)
 
 
 class SecretsManagerService(AWSService):
+    name = "secretsmanager"
+    probes = (("list_secrets", {"MaxResults": 1}, "SecretList"),)
+
     def __init__(self, session):
         super().__init__(session)
-        self.name = "secretsmanager"
         self.client = self.session.client("secretsmanager")
 
     def generate(self) -> Dict[str, Any]:
+        secrets_data = {"secrets": []}
         try:
-            secrets_data = {"secrets": []}
-
             # List secrets
             paginator = self.client.get_paginator("list_secrets")
-            for page in paginator.paginate():
+            for page in self._paginate(paginator):
                 for secret in page["SecretList"]:
                     # Get policy if available
                     try:
@@ -1352,9 +1809,9 @@ class SecretsManagerService(AWSService):
                         "description": secret.get("Description"),
                         "kms_key_id": secret.get("KmsKeyId"),
                         "rotation_enabled": secret.get("RotationEnabled", False),
-                        "last_changed_date": str(secret.get("LastChangedDate", "")),
-                        "last_accessed_date": str(secret.get("LastAccessedDate", "")),
-                        "deleted_date": str(secret.get("DeletedDate", "")),
+                        "last_changed_date": secret.get("LastChangedDate"),
+                        "last_accessed_date": secret.get("LastAccessedDate"),
+                        "deleted_date": secret.get("DeletedDate"),
                         "tags": secret.get("Tags", []),
                         "secret_versions_to_stages": secret.get(
                             "SecretVersionsToStages", {}
@@ -1368,32 +1825,32 @@ class SecretsManagerService(AWSService):
             return secrets_data
 
         except ClientError as e:
-            self.handle_error(e)
-            return None
+            return self.handle_error(e, secrets_data)
 
 
 class SecurityHubService(AWSService):
+    name = "securityhub"
+    estimated_cost = 30.0
+
     def __init__(self, session):
         super().__init__(session)
-        self.name = "securityhub"
         self.client = self.session.client("securityhub")
 
     def generate(self) -> Dict[str, Any]:
+        securityhub_data = {
+            "hub_configuration": {},
+            "enabled_standards": [],
+            "custom_actions": [],
+            "finding_aggregators": [],
+            "insight_results": [],
+        }
         try:
-            securityhub_data = {
-                "hub_configuration": {},
-                "enabled_standards": [],
-                "custom_actions": [],
-                "finding_aggregators": [],
-                "insight_results": [],
-            }
-
             # Get hub configuration
             try:
                 hub_config = self.client.describe_hub()
                 securityhub_data["hub_configuration"] = {
                     "hub_arn": hub_config.get("HubArn"),
-                    "subscribed_at": str(hub_config.get("SubscribedAt", "")),
+                    "subscribed_at": hub_config.get("SubscribedAt"),
                     "auto_enable_controls": hub_config.get("AutoEnableControls"),
                     "tags": hub_config.get("Tags", {}),
                 }
@@ -1476,14 +1933,28 @@ class SecurityHubService(AWSService):
             return securityhub_data
 
         except ClientError as e:
-            self.handle_error(e)
-            return None
+            return self.handle_error(e, securityhub_data)
 
 
 class WAFv2Service(AWSService):
+    name = "wafv2"
+    event_sources = ("wafv2.amazonaws.com",)
+    probes = (
+        ("list_web_acls", {"Scope": "REGIONAL", "Limit": 1}, "WebACLs"),
+        ("list_rule_groups", {"Scope": "REGIONAL", "Limit": 1}, "RuleGroups"),
+        ("list_ip_sets", {"Scope": "REGIONAL", "Limit": 1}, "IPSets"),
+        (
+            "list_regex_pattern_sets",
+            {"Scope": "REGIONAL", "Limit": 1},
+            "RegexPatternSets",
+        ),
+    )
+
+    # CLOUDFRONT scoped resources are global and handled by WAFv2CloudFrontService
+    scopes = ["REGIONAL"]
+
     def __init__(self, session):
         super().__init__(session)
-        self.name = "wafv2"
         self.client = self.session.client("wafv2")
 
     def _get_web_acl_details(
@@ -1557,16 +2028,14 @@ class WAFv2Service(AWSService):
             return {}
 
     def generate(self) -> Dict[str, Any]:
+        wafv2_data = {
+            "web_acls": {scope.lower(): [] for scope in self.scopes},
+            "rule_groups": {scope.lower(): [] for scope in self.scopes},
+            "ip_sets": {scope.lower(): [] for scope in self.scopes},
+            "regex_pattern_sets": {scope.lower(): [] for scope in self.scopes},
+        }
         try:
-            wafv2_data = {
-                "web_acls": {"regional": [], "cloudfront": []},
-                "rule_groups": {"regional": [], "cloudfront": []},
-                "ip_sets": {"regional": [], "cloudfront": []},
-                "regex_pattern_sets": {"regional": [], "cloudfront": []},
-            }
-
-            # Process both REGIONAL and CLOUDFRONT scopes
-            for scope in ["REGIONAL", "CLOUDFRONT"]:
+            for scope in self.scopes:
                 scope_key = scope.lower()
 
                 # Get Web ACLs
@@ -1655,31 +2124,39 @@ class WAFv2Service(AWSService):
             return wafv2_data
 
         except ClientError as e:
-            self.handle_error(e)
-            return None
+            return self.handle_error(e, wafv2_data)
+
+
+class WAFv2CloudFrontService(WAFv2Service):
+    """WAFv2 resources in the CLOUDFRONT scope, which only exist in us-east-1."""
+
+    is_global = True
+    scopes = ["CLOUDFRONT"]
 
 
 class CloudFrontService(AWSService):
+    name = "cloudfront"
+    is_global = True
+    event_sources = ("cloudfront.amazonaws.com",)
+
     def __init__(self, session):
         super().__init__(session)
-        self.name = "cloudfront"
         self.client = self.session.client("cloudfront")
 
     def generate(self) -> Dict[str, Any]:
+        cloudfront_data = {
+            "distributions": [],
+            "functions": [],
+            "cache_policies": [],
+            "origin_request_policies": [],
+            "response_headers_policies": [],
+            "key_groups": [],
+        }
         try:
-            cloudfront_data = {
-                "distributions": [],
-                "functions": [],
-                "cache_policies": [],
-                "origin_request_policies": [],
-                "response_headers_policies": [],
-                "key_groups": [],
-            }
-
             # List distributions
             try:
                 paginator = self.client.get_paginator("list_distributions")
-                for page in paginator.paginate():
+                for page in self._paginate(paginator):
                     if "Items" in page.get("DistributionList", {}):
                         for dist in page["DistributionList"]["Items"]:
                             # Get detailed configuration
@@ -1870,24 +2347,23 @@ class CloudFrontService(AWSService):
             return cloudfront_data
 
         except ClientError as e:
-            self.handle_error(e)
-            return None
+            return self.handle_error(e, cloudfront_data)
 
 
 class AccessAnalyzerService(AWSService):
+    name = "accessanalyzer"
+
     def __init__(self, session):
         super().__init__(session)
-        self.name = "accessanalyzer"
         self.client = self.session.client("accessanalyzer")
 
     def generate(self) -> Dict[str, Any]:
+        analyzer_data = {"analyzers": [], "findings": []}
         try:
-            analyzer_data = {"analyzers": [], "findings": []}
-
             # List analyzers
             try:
                 paginator = self.client.get_paginator("list_analyzers")
-                for page in paginator.paginate():
+                for page in self._paginate(paginator):
                     for analyzer in page.get("analyzers", []):
                         analyzer_info = {
                             "name": analyzer["name"],
@@ -1908,8 +2384,8 @@ class AccessAnalyzerService(AWSService):
                             findings_paginator = self.client.get_paginator(
                                 "list_findings"
                             )
-                            for findings_page in findings_paginator.paginate(
-                                analyzerArn=analyzer["arn"]
+                            for findings_page in self._paginate(
+                                findings_paginator, analyzerArn=analyzer["arn"]
                             ):
                                 for finding in findings_page.get("findings", []):
                                     finding_info = {
@@ -1918,8 +2394,8 @@ class AccessAnalyzerService(AWSService):
                                         "resource_type": finding.get("resourceType"),
                                         "resource": finding.get("resource"),
                                         "status": finding.get("status"),
-                                        "created_at": str(finding.get("createdAt", "")),
-                                        "updated_at": str(finding.get("updatedAt", "")),
+                                        "created_at": finding.get("createdAt"),
+                                        "updated_at": finding.get("updatedAt"),
                                         "analyzed_at": str(
                                             finding.get("analyzedAt", "")
                                         ),
@@ -1935,28 +2411,31 @@ class AccessAnalyzerService(AWSService):
             return analyzer_data
 
         except ClientError as e:
-            self.handle_error(e)
-            return None
+            return self.handle_error(e, analyzer_data)
 
 
 class AutoScalingService(AWSService):
+    name = "autoscaling"
+    probes = (
+        ("describe_auto_scaling_groups", {"MaxRecords": 1}, "AutoScalingGroups"),
+        ("describe_launch_configurations", {"MaxRecords": 1}, "LaunchConfigurations"),
+    )
+
     def __init__(self, session):
         super().__init__(session)
-        self.name = "autoscaling"
         self.client = self.session.client("autoscaling")
 
     def generate(self) -> Dict[str, Any]:
+        autoscaling_data = {
+            "groups": [],
+            "launch_configurations": [],
+            "scaling_policies": [],
+        }
         try:
-            autoscaling_data = {
-                "groups": [],
-                "launch_configurations": [],
-                "scaling_policies": [],
-            }
-
             # List Auto Scaling groups
             try:
                 paginator = self.client.get_paginator("describe_auto_scaling_groups")
-                for page in paginator.paginate():
+                for page in self._paginate(paginator):
                     for group in page.get("AutoScalingGroups", []):
                         group_info = {
                             "name": group["AutoScalingGroupName"],
@@ -1996,8 +2475,9 @@ class AutoScalingService(AWSService):
                             policies_paginator = self.client.get_paginator(
                                 "describe_policies"
                             )
-                            for policies_page in policies_paginator.paginate(
-                                AutoScalingGroupName=group["AutoScalingGroupName"]
+                            for policies_page in self._paginate(
+                                policies_paginator,
+                                AutoScalingGroupName=group["AutoScalingGroupName"],
                             ):
                                 for policy in policies_page.get("ScalingPolicies", []):
                                     policy_info = {
@@ -2035,7 +2515,7 @@ class AutoScalingService(AWSService):
             # List Launch Configurations
             try:
                 paginator = self.client.get_paginator("describe_launch_configurations")
-                for page in paginator.paginate():
+                for page in self._paginate(paginator):
                     for config in page.get("LaunchConfigurations", []):
                         config_info = {
                             "name": config["LaunchConfigurationName"],
@@ -2051,7 +2531,7 @@ class AutoScalingService(AWSService):
                             "instance_monitoring": config.get(
                                 "InstanceMonitoring", {}
                             ).get("Enabled", False),
-                            "created_time": str(config.get("CreatedTime", "")),
+                            "created_time": config.get("CreatedTime"),
                         }
                         autoscaling_data["launch_configurations"].append(config_info)
             except ClientError:
@@ -2060,29 +2540,29 @@ class AutoScalingService(AWSService):
             return autoscaling_data
 
         except ClientError as e:
-            self.handle_error(e)
-            return None
+            return self.handle_error(e, autoscaling_data)
 
 
 class BackupService(AWSService):
+    name = "backup"
+    estimated_cost = 120.0
+
     def __init__(self, session):
         super().__init__(session)
-        self.name = "backup"
         self.client = self.session.client("backup")
 
     def generate(self) -> Dict[str, Any]:
+        backup_data = {"vaults": [], "plans": [], "selections": [], "jobs": []}
         try:
-            backup_data = {"vaults": [], "plans": [], "selections": [], "jobs": []}
-
             # List backup vaults
             try:
                 paginator = self.client.get_paginator("list_backup_vaults")
-                for page in paginator.paginate():
+                for page in self._paginate(paginator):
                     for vault in page.get("BackupVaultList", []):
                         vault_info = {
                             "name": vault["BackupVaultName"],
                             "arn": vault["BackupVaultArn"],
-                            "creation_date": str(vault.get("CreationDate", "")),
+                            "creation_date": vault.get("CreationDate"),
                             "encryption_key_arn": vault.get("EncryptionKeyArn"),
                             "creator_request_id": vault.get("CreatorRequestId"),
                             "number_of_recovery_points": vault.get(
@@ -2102,7 +2582,7 @@ class BackupService(AWSService):
             # List backup plans
             try:
                 paginator = self.client.get_paginator("list_backup_plans")
-                for page in paginator.paginate():
+                for page in self._paginate(paginator):
                     for plan in page.get("BackupPlansList", []):
                         plan_details = self.client.get_backup_plan(
                             BackupPlanId=plan["BackupPlanId"]
@@ -2113,7 +2593,7 @@ class BackupService(AWSService):
                             "arn": plan["BackupPlanArn"],
                             "name": plan["BackupPlanName"],
                             "version_id": plan.get("VersionId"),
-                            "creation_date": str(plan.get("CreationDate", "")),
+                            "creation_date": plan.get("CreationDate"),
                             "last_execution_date": str(
                                 plan.get("LastExecutionDate", "")
                             ),
@@ -2132,8 +2612,8 @@ class BackupService(AWSService):
                             selections_paginator = self.client.get_paginator(
                                 "list_backup_selections"
                             )
-                            for selections_page in selections_paginator.paginate(
-                                BackupPlanId=plan["BackupPlanId"]
+                            for selections_page in self._paginate(
+                                selections_paginator, BackupPlanId=plan["BackupPlanId"]
                             ):
                                 for selection in selections_page.get(
                                     "BackupSelectionsList", []
@@ -2170,13 +2650,13 @@ class BackupService(AWSService):
             # List backup jobs from last 30 days
             try:
                 paginator = self.client.get_paginator("list_backup_jobs")
-                for page in paginator.paginate():
+                for page in self._paginate(paginator):
                     for job in page.get("BackupJobs", []):
                         job_info = {
                             "job_id": job["BackupJobId"],
                             "vault_name": job.get("BackupVaultName"),
-                            "creation_date": str(job.get("CreationDate", "")),
-                            "completion_date": str(job.get("CompletionDate", "")),
+                            "creation_date": job.get("CreationDate"),
+                            "completion_date": job.get("CompletionDate"),
                             "state": job.get("State"),
                             "status_message": job.get("StatusMessage"),
                             "resource_type": job.get("ResourceType"),
@@ -2192,26 +2672,25 @@ class BackupService(AWSService):
             return backup_data
 
         except ClientError as e:
-            self.handle_error(e)
-            return None
+            return self.handle_error(e, backup_data)
 
 
 class CloudWatchService(AWSService):
+    name = "cloudwatch"
+
     def __init__(self, session):
         super().__init__(session)
-        self.name = "cloudwatch"
         self.client = self.session.client("cloudwatch")
         self.logs_client = self.session.client("logs")
 
     def generate(self) -> Dict[str, Any]:
+        cloudwatch_data = {
+            "alarms": [],
+            "dashboards": [],
+            "log_groups": [],
+            "metric_streams": [],
+        }
         try:
-            cloudwatch_data = {
-                "alarms": [],
-                "dashboards": [],
-                "log_groups": [],
-                "metric_streams": [],
-            }
-
             # List alarms
             try:
                 alarms = self.client.describe_alarms()
@@ -2223,7 +2702,7 @@ class CloudWatchService(AWSService):
                         "state": {
                             "value": alarm.get("StateValue"),
                             "reason": alarm.get("StateReason"),
-                            "updated": str(alarm.get("StateUpdatedTimestamp", "")),
+                            "updated": alarm.get("StateUpdatedTimestamp"),
                         },
                         "metric": {
                             "namespace": alarm.get("Namespace"),
@@ -2264,7 +2743,7 @@ class CloudWatchService(AWSService):
                         dashboard_info = {
                             "name": dashboard["DashboardName"],
                             "arn": dashboard["DashboardArn"],
-                            "last_modified": str(dashboard.get("LastModified", "")),
+                            "last_modified": dashboard.get("LastModified"),
                             "size": dashboard.get("Size"),
                             "body": dashboard_details.get("DashboardBody"),
                             "tags": self.client.list_tags_for_resource(
@@ -2284,7 +2763,7 @@ class CloudWatchService(AWSService):
                     group_info = {
                         "name": group["logGroupName"],
                         "arn": group.get("arn"),
-                        "creation_time": str(group.get("creationTime", "")),
+                        "creation_time": group.get("creationTime"),
                         "retention_in_days": group.get("retentionInDays"),
                         "metric_filter_count": group.get("metricFilterCount"),
                         "stored_bytes": group.get("storedBytes"),
@@ -2307,8 +2786,8 @@ class CloudWatchService(AWSService):
                         "firehose_arn": stream.get("FirehoseArn"),
                         "role_arn": stream.get("RoleArn"),
                         "state": stream.get("State"),
-                        "creation_date": str(stream.get("CreationDate", "")),
-                        "last_update_date": str(stream.get("LastUpdateDate", "")),
+                        "creation_date": stream.get("CreationDate"),
+                        "last_update_date": stream.get("LastUpdateDate"),
                         "output_format": stream.get("OutputFormat"),
                         "tags": self.client.list_tags_for_resource(
                             ResourceARN=stream["Arn"]
@@ -2321,25 +2800,26 @@ class CloudWatchService(AWSService):
             return cloudwatch_data
 
         except ClientError as e:
-            self.handle_error(e)
-            return None
+            return self.handle_error(e, cloudwatch_data)
 
 
 class ECRService(AWSService):
+    name = "ecr"
+    estimated_cost = 90.0
+    event_sources = ("ecr.amazonaws.com",)
+
     def __init__(self, session):
         super().__init__(session)
-        self.name = "ecr"
         self.client = self.session.client("ecr")
 
     def generate(self) -> Dict[str, Any]:
+        ecr_data = {
+            "repositories": [],
+            "registry_policy": None,
+            "registry_scanning_config": None,
+            "registry_replication_config": None,
+        }
         try:
-            ecr_data = {
-                "repositories": [],
-                "registry_policy": None,
-                "registry_scanning_config": None,
-                "registry_replication_config": None,
-            }
-
             # Get registry-level configurations
             try:
                 registry_policy = self.client.get_registry_policy()
@@ -2366,13 +2846,13 @@ class ECRService(AWSService):
             # List repositories
             try:
                 paginator = self.client.get_paginator("describe_repositories")
-                for page in paginator.paginate():
+                for page in self._paginate(paginator):
                     for repo in page.get("repositories", []):
                         repo_info = {
                             "name": repo["repositoryName"],
                             "arn": repo["repositoryArn"],
                             "uri": repo["repositoryUri"],
-                            "created_at": str(repo.get("createdAt", "")),
+                            "created_at": repo.get("createdAt"),
                             "image_tag_mutability": repo.get("imageTagMutability"),
                             "encryption_configuration": repo.get(
                                 "encryptionConfiguration", {}
@@ -2411,8 +2891,10 @@ class ECRService(AWSService):
                             image_paginator = self.client.get_paginator(
                                 "describe_images"
                             )
-                            for image_page in image_paginator.paginate(
-                                repositoryName=repo["repositoryName"], maxResults=100
+                            for image_page in self._paginate(
+                                image_paginator,
+                                repositoryName=repo["repositoryName"],
+                                maxResults=100,
                             ):
                                 for image in image_page.get("imageDetails", []):
                                     image_info = {
@@ -2439,24 +2921,27 @@ class ECRService(AWSService):
             return ecr_data
 
         except ClientError as e:
-            self.handle_error(e)
-            return None
+            return self.handle_error(e, ecr_data)
 
 
 class EFSService(AWSService):
+    name = "efs"
+    probes = (
+        ("describe_file_systems", {"MaxItems": 1}, "FileSystems"),
+        ("describe_access_points", {"MaxResults": 1}, "AccessPoints"),
+    )
+
     def __init__(self, session):
         super().__init__(session)
-        self.name = "efs"
         self.client = self.session.client("efs")
 
     def generate(self) -> Dict[str, Any]:
+        efs_data = {"file_systems": [], "access_points": []}
         try:
-            efs_data = {"file_systems": [], "access_points": []}
-
             # List file systems
             try:
                 paginator = self.client.get_paginator("describe_file_systems")
-                for page in paginator.paginate():
+                for page in self._paginate(paginator):
                     for fs in page.get("FileSystems", []):
                         # Get mount targets for this file system
                         mount_targets = []
@@ -2464,8 +2949,8 @@ class EFSService(AWSService):
                             mt_paginator = self.client.get_paginator(
                                 "describe_mount_targets"
                             )
-                            for mt_page in mt_paginator.paginate(
-                                FileSystemId=fs["FileSystemId"]
+                            for mt_page in self._paginate(
+                                mt_paginator, FileSystemId=fs["FileSystemId"]
                             ):
                                 for mt in mt_page.get("MountTargets", []):
                                     # Get mount target security groups
@@ -2519,7 +3004,7 @@ class EFSService(AWSService):
                             "arn": fs.get("FileSystemArn"),
                             "name": fs.get("Name"),
                             "size_in_bytes": fs.get("SizeInBytes", {}),
-                            "creation_time": str(fs.get("CreationTime", "")),
+                            "creation_time": fs.get("CreationTime"),
                             "life_cycle_state": fs.get("LifeCycleState"),
                             "performance_mode": fs.get("PerformanceMode"),
                             "throughput_mode": fs.get("ThroughputMode"),
@@ -2544,7 +3029,7 @@ class EFSService(AWSService):
             # List access points
             try:
                 paginator = self.client.get_paginator("describe_access_points")
-                for page in paginator.paginate():
+                for page in self._paginate(paginator):
                     for ap in page.get("AccessPoints", []):
                         ap_info = {
                             "id": ap["AccessPointId"],
@@ -2566,31 +3051,40 @@ class EFSService(AWSService):
             return efs_data
 
         except ClientError as e:
-            self.handle_error(e)
-            return None
+            return self.handle_error(e, efs_data)
 
 
 class OrganizationsService(AWSService):
+    name = "organizations"
+    is_global = True
+    event_sources = ("organizations.amazonaws.com",)
+
     def __init__(self, session):
         super().__init__(session)
-        self.name = "organizations"
         self.client = self.session.client("organizations")
 
+    def list_accounts(self) -> List[Dict[str, Any]]:
+        """List every account of the organization."""
+        paginator = self.client.get_paginator("list_accounts")
+        accounts = []
+        for page in self._paginate(paginator):
+            accounts.extend(page.get("Accounts", []))
+        return accounts
+
     def generate(self) -> Dict[str, Any]:
+        org_data = {
+            "organization": {},
+            "accounts": [],
+            "organizational_units": [],
+            "policies": {
+                "service_control": [],
+                "tag": [],
+                "backup": [],
+                "ai_services_opt_out": [],
+            },
+            "delegated_administrators": [],
+        }
         try:
-            org_data = {
-                "organization": {},
-                "accounts": [],
-                "organizational_units": [],
-                "policies": {
-                    "service_control": [],
-                    "tag": [],
-                    "backup": [],
-                    "ai_services_opt_out": [],
-                },
-                "delegated_administrators": [],
-            }
-
             # Describe organization
             try:
                 org = self.client.describe_organization()["Organization"]
@@ -2607,22 +3101,20 @@ class OrganizationsService(AWSService):
 
             # List accounts
             try:
-                paginator = self.client.get_paginator("list_accounts")
-                for page in paginator.paginate():
-                    for account in page.get("Accounts", []):
-                        account_info = {
-                            "id": account["Id"],
-                            "arn": account["Arn"],
-                            "email": account.get("Email"),
-                            "name": account.get("Name"),
-                            "status": account.get("Status"),
-                            "joined_method": account.get("JoinedMethod"),
-                            "joined_timestamp": str(account.get("JoinedTimestamp", "")),
-                            "tags": self.client.list_tags_for_resource(
-                                ResourceId=account["Id"]
-                            ).get("Tags", []),
-                        }
-                        org_data["accounts"].append(account_info)
+                for account in self.list_accounts():
+                    account_info = {
+                        "id": account["Id"],
+                        "arn": account["Arn"],
+                        "email": account.get("Email"),
+                        "name": account.get("Name"),
+                        "status": account.get("Status"),
+                        "joined_method": account.get("JoinedMethod"),
+                        "joined_timestamp": account.get("JoinedTimestamp"),
+                        "tags": self.client.list_tags_for_resource(
+                            ResourceId=account["Id"]
+                        ).get("Tags", []),
+                    }
+                    org_data["accounts"].append(account_info)
             except ClientError:
                 pass
 
@@ -2635,7 +3127,7 @@ class OrganizationsService(AWSService):
                         paginator = self.client.get_paginator(
                             "list_organizational_units_for_parent"
                         )
-                        for page in paginator.paginate(ParentId=root["Id"]):
+                        for page in self._paginate(paginator, ParentId=root["Id"]):
                             for ou in page.get("OrganizationalUnits", []):
                                 ou_info = {
                                     "id": ou["Id"],
@@ -2662,7 +3154,7 @@ class OrganizationsService(AWSService):
             for policy_type, data_key in policy_types.items():
                 try:
                     paginator = self.client.get_paginator("list_policies")
-                    for page in paginator.paginate(Filter=policy_type):
+                    for page in self._paginate(paginator, Filter=policy_type):
                         for policy in page.get("Policies", []):
                             try:
                                 policy_content = self.client.describe_policy(
@@ -2689,7 +3181,7 @@ class OrganizationsService(AWSService):
             # List delegated administrators
             try:
                 paginator = self.client.get_paginator("list_delegated_administrators")
-                for page in paginator.paginate():
+                for page in self._paginate(paginator):
                     for admin in page.get("DelegatedAdministrators", []):
                         admin_info = {
                             "id": admin["Id"],
@@ -2700,7 +3192,7 @@ class OrganizationsService(AWSService):
                             "delegation_enabled_date": str(
                                 admin.get("DelegationEnabledDate", "")
                             ),
-                            "joined_timestamp": str(admin.get("JoinedTimestamp", "")),
+                            "joined_timestamp": admin.get("JoinedTimestamp"),
                         }
                         org_data["delegated_administrators"].append(admin_info)
             except ClientError:
@@ -2709,24 +3201,25 @@ class OrganizationsService(AWSService):
             return org_data
 
         except ClientError as e:
-            self.handle_error(e)
-            return None
+            return self.handle_error(e, org_data)
 
 
 class StepFunctionsService(AWSService):
+    name = "stepfunctions"
+    estimated_cost = 90.0
+    probes = (("list_state_machines", {"maxResults": 1}, "stateMachines"),)
+
     def __init__(self, session):
         super().__init__(session)
-        self.name = "stepfunctions"
         self.client = self.session.client("stepfunctions")
 
     def generate(self) -> Dict[str, Any]:
+        stepfunctions_data = {"state_machines": [], "executions": {}}
         try:
-            stepfunctions_data = {"state_machines": [], "executions": {}}
-
             # List state machines
             try:
                 paginator = self.client.get_paginator("list_state_machines")
-                for page in paginator.paginate():
+                for page in self._paginate(paginator):
                     for machine in page.get("stateMachines", []):
                         # Get state machine details
                         try:
@@ -2738,7 +3231,7 @@ class StepFunctionsService(AWSService):
                                 "name": machine["name"],
                                 "arn": machine["stateMachineArn"],
                                 "type": machine_details.get("type"),
-                                "creation_date": str(machine.get("creationDate", "")),
+                                "creation_date": machine.get("creationDate"),
                                 "role_arn": machine_details.get("roleArn"),
                                 "definition": machine_details.get("definition"),
                                 "logging_configuration": machine_details.get(
@@ -2758,7 +3251,8 @@ class StepFunctionsService(AWSService):
                                 exec_paginator = self.client.get_paginator(
                                     "list_executions"
                                 )
-                                for exec_page in exec_paginator.paginate(
+                                for exec_page in self._paginate(
+                                    exec_paginator,
                                     stateMachineArn=machine["stateMachineArn"],
                                     maxResults=100,  # Limit to last 100 executions
                                 ):
@@ -2809,20 +3303,20 @@ class StepFunctionsService(AWSService):
             return stepfunctions_data
 
         except ClientError as e:
-            self.handle_error(e)
-            return None
+            return self.handle_error(e, stepfunctions_data)
 
 
 class TrustedAdvisorService(AWSService):
+    name = "trustedadvisor"
+    is_global = True
+
     def __init__(self, session):
         super().__init__(session)
-        self.name = "trustedadvisor"
         self.client = self.session.client("support")
 
     def generate(self) -> Dict[str, Any]:
+        advisor_data = {"checks": []}
         try:
-            advisor_data = {"checks": []}
-
             # List all available checks
             try:
                 checks = self.client.describe_trusted_advisor_checks(language="en")[
@@ -2851,7 +3345,7 @@ class TrustedAdvisorService(AWSService):
                             "metadata": check.get("metadata", []),
                             "result": {
                                 "check_id": result.get("checkId"),
-                                "timestamp": str(result.get("timestamp", "")),
+                                "timestamp": result.get("timestamp"),
                                 "status": result.get("status"),
                                 "resources_summary": result.get("resourcesSummary", {}),
                                 "categories_summary": result.get(
@@ -2869,7 +3363,7 @@ class TrustedAdvisorService(AWSService):
                                 "categories_summary": summaries.get(
                                     "categorySpecificSummary", {}
                                 ),
-                                "timestamp": str(summaries.get("timestamp", "")),
+                                "timestamp": summaries.get("timestamp"),
                             },
                         }
 
@@ -2882,9 +3376,878 @@ class TrustedAdvisorService(AWSService):
             return advisor_data
 
         except ClientError as e:
-            self.handle_error(e)
+            return self.handle_error(e, advisor_data)
+
+
+class TokenBucket:
+    """
+    Token bucket whose refill rate adapts to throttling.
+    The rate is halved when the API throttles and grows back additively on
+    success, bounded by ``min_rate`` and ``max_rate``.
+    """
+
+    DECREASE_COOLDOWN = 1.0
+
+    def __init__(self, rate: float, min_rate: float, max_rate: float):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.tokens = rate
+        self.throttles = 0
+        self._updated = time.monotonic()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.rate, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> None:
+        """Take a token, sleeping until one is available."""
+        with self._lock:
+            self._refill(time.monotonic())
+            # Reserve the token now and wait for the deficit outside the lock
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + 1.0 / self.rate)
+
+    def on_throttle(self) -> None:
+        with self._lock:
+            self.throttles += 1
+            now = time.monotonic()
+            # Concurrent requests throttled by the same burst only count once
+            if now - self._last_decrease >= self.DECREASE_COOLDOWN:
+                self._refill(now)
+                self.rate = max(self.min_rate, self.rate / 2)
+                self.tokens = min(self.tokens, 0.0)
+                self._last_decrease = now
+
+
+class APIRateLimiter:
+    """
+    Adaptive rate limiter for AWS API calls keyed by (account, region, API namespace).
+    It is attached to clients through botocore's event system, so every request
+    made by a service, including botocore's own retries, goes through it.
+    """
+
+    THROTTLE_CODES = {
+        "Throttling",
+        "ThrottlingException",
+        "ThrottledException",
+        "RequestThrottledException",
+        "TooManyRequestsException",
+        "ProvisionedThroughputExceededException",
+        "TransactionInProgressException",
+        "RequestLimitExceeded",
+        "BandwidthLimitExceeded",
+        "LimitExceededException",
+        "RequestThrottled",
+        "SlowDown",
+        "PriorRequestNotComplete",
+        "EC2ThrottledException",
+    }
+
+    DEFAULT_MAX_RATE = 100.0
+
+    def __init__(
+        self,
+        initial_rate: float = 20.0,
+        min_rate: float = 1.0,
+        max_rate: Optional[float] = None,
+    ):
+        self.initial_rate = initial_rate
+        self.min_rate = min(min_rate, initial_rate)
+        self.max_rate = max_rate or max(self.DEFAULT_MAX_RATE, initial_rate)
+        self._buckets: Dict[tuple, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, account_id: str, region: str, namespace: str) -> TokenBucket:
+        key = (account_id, region, namespace)
+        with self._lock:
+            if key not in self._buckets:
+                self._buckets[key] = TokenBucket(
+                    self.initial_rate, self.min_rate, self.max_rate
+                )
+            return self._buckets[key]
+
+    def attach(self, client, account_id: str) -> None:
+        """Route every request of a client through its bucket."""
+        bucket = self.bucket(
+            account_id,
+            client.meta.region_name,
+            client.meta.service_model.endpoint_prefix,
+        )
+
+        def before_send(**kwargs):
+            bucket.acquire()
+
+        def needs_retry(response=None, **kwargs):
+            if response is None:
+                return None
+            http_response, parsed = response
+            code = parsed.get("Error", {}).get("Code") if parsed else None
+            if code in self.THROTTLE_CODES or http_response.status_code == 429:
+                bucket.on_throttle()
+            elif http_response.status_code < 300:
+                bucket.on_success()
+            return None
+
+        client.meta.events.register("before-send", before_send)
+        client.meta.events.register("needs-retry", needs_retry)
+
+    def log_summary(self) -> None:
+        with self._lock:
+            throttled = {
+                key: bucket for key, bucket in self._buckets.items() if bucket.throttles
+            }
+        for (account_id, region, namespace), bucket in sorted(throttled.items()):
+            logger.info(
+                f"{namespace} in {region} ({account_id}) was throttled "
+                f"{bucket.throttles} times, settled at {bucket.rate:.1f} requests/s"
+            )
+
+
+class ResponseCache:
+    """
+    Persistent cache of read-only AWS API responses in a SQLite database.
+    Responses are keyed by (account, region, service, operation, parameters)
+    and expire after a per-operation TTL. The least recently used entries are
+    evicted once the database grows beyond ``max_bytes``. It is attached to
+    clients through botocore's event system, so a cached call never reaches
+    the network or the rate limiter. Responses are stored as JSON and only for
+    the inventory calls listed in ``CACHEABLE_OPERATIONS``; calls returning
+    policies, credentials or environment variables are never written to disk.
+    """
+
+    CACHEABLE_OPERATIONS = frozenset(
+        (
+            "describe_regions",
+            "describe_instances",
+            "describe_images",
+            "describe_volumes",
+            "describe_vpcs",
+            "describe_subnets",
+            "describe_security_groups",
+            "describe_route_tables",
+            "describe_internet_gateways",
+            "describe_vpc_endpoints",
+            "describe_db_instances",
+            "describe_db_snapshots",
+            "describe_cache_clusters",
+            "describe_replication_groups",
+            "describe_file_systems",
+            "describe_mount_targets",
+            "describe_mount_target_security_groups",
+            "describe_access_points",
+            "describe_auto_scaling_groups",
+            "describe_launch_configurations",
+            "describe_log_groups",
+            "describe_alarms",
+            "describe_trails",
+            "describe_table",
+            "describe_continuous_backups",
+            "describe_certificate",
+            "describe_cluster",
+            "describe_clusters",
+            "describe_nodegroup",
+            "describe_fargate_profile",
+            "describe_repositories",
+            "describe_key",
+            "get_key_rotation_status",
+            "get_bucket_encryption",
+            "get_bucket_versioning",
+            "get_public_access_block",
+            "list_buckets",
+            "list_keys",
+            "list_aliases",
+            "list_tables",
+            "list_global_tables",
+            "list_clusters",
+            "list_nodegroups",
+            "list_fargate_profiles",
+            "list_certificates",
+            "list_queues",
+            "list_topics",
+            "list_state_machines",
+            "list_backup_vaults",
+            "list_backup_plans",
+            "list_backup_selections",
+            "list_web_acls",
+            "list_ip_sets",
+            "list_regex_pattern_sets",
+            "list_rule_groups",
+            "list_domain_names",
+            "list_layers",
+            "list_tags",
+            "list_tags_for_certificate",
+            "list_tags_for_resource",
+            "list_tags_log_group",
+            "list_tags_of_resource",
+            "list_queue_tags",
+        )
+    )
+
+    # TTLs in seconds for operations whose data changes slower or faster than
+    # the default
+    DEFAULT_TTLS = {
+        "describe_regions": 6 * 3600,
+        "describe_instances": 300,
+    }
+
+    def __init__(
+        self,
+        path: Path,
+        default_ttl: float = 900,
+        ttls: Optional[Dict[str, int]] = None,
+        max_bytes: int = 512 * 1024 * 1024,
+    ):
+        self.path = Path(path)
+        self.default_ttl = default_ttl
+        self.ttls = dict(self.DEFAULT_TTLS, **(ttls or {}))
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+        )
+        conn.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+        self._size = conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections may not be shared between threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def ttl(self, operation: str) -> float:
+        return self.ttls.get(operation, self.default_ttl)
+
+    def is_cacheable(self, operation: str) -> bool:
+        return operation in self.CACHEABLE_OPERATIONS and self.ttl(operation) > 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT value FROM responses WHERE key = ? AND expires_at >= ?",
+            (key, now),
+        ).fetchone()
+        parsed = None
+        if row is not None:
+            try:
+                parsed = json.loads(row[0])
+            except ValueError:
+                # Written by an older version in another format
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        with self._lock:
+            if parsed is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        return parsed
+
+    def put(self, key: str, operation: str, parsed: Dict[str, Any]) -> None:
+        value = dumps(parsed)
+        now = time.time()
+        self._connection().execute(
+            "INSERT OR REPLACE INTO responses (key, value, size, expires_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, value, len(value), now + self.ttl(operation), now),
+        )
+        with self._lock:
+            self._size += len(value)
+            evict = self._size > self.max_bytes
+        if evict:
+            self.evict()
+
+    def evict(self) -> None:
+        """Drop expired entries, then the least recently used ones, until the
+        cache is back under 90% of ``max_bytes``."""
+        conn = self._connection()
+        conn.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+        size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[
+            0
+        ]
+        target = self.max_bytes * 0.9
+        if size > target:
+            rows = conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at"
+            ).fetchall()
+            evicted = []
+            for key, entry_size in rows:
+                if size <= target:
+                    break
+                evicted.append((key,))
+                size -= entry_size
+            conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        with self._lock:
+            self._size = size
+
+    def attach(self, client, account_id: str) -> None:
+        """Serve cacheable calls of a client from the cache and store misses."""
+        prefix = (
+            f"{account_id}/{client.meta.region_name}/"
+            f"{client.meta.service_model.service_name}"
+        )
+
+        def before_parameter_build(params=None, model=None, context=None, **kwargs):
+            operation = xform_name(model.name)
+            if context is not None and self.is_cacheable(operation):
+                context["response_cache"] = (
+                    f"{prefix}/{operation}/"
+                    + json.dumps(params, sort_keys=True, default=str),
+                    operation,
+                )
+
+        def before_call(context=None, **kwargs):
+            key, _ = (context or {}).get("response_cache", (None, None))
+            if key is None:
+                return None
+            parsed = self.get(key)
+            if parsed is None:
+                return None
+            context["response_cache_hit"] = True
+            return AWSResponse(None, 200, {}, None), parsed
+
+        def after_call(http_response=None, parsed=None, context=None, **kwargs):
+            context = context or {}
+            if "response_cache" not in context or context.get("response_cache_hit"):
+                return
+            if http_response is not None and http_response.status_code < 300:
+                key, operation = context["response_cache"]
+                self.put(key, operation, parsed)
+
+        client.meta.events.register("before-parameter-build", before_parameter_build)
+        client.meta.events.register("before-call", before_call)
+        client.meta.events.register("after-call", after_call)
+
+    def log_summary(self) -> None:
+        total = self.hits + self.misses
+        if total:
+            logger.info(
+                f"Response cache: {self.hits} hits, {self.misses} misses "
+                f"({100.0 * self.hits / total:.0f}% hit rate)"
+            )
+
+
+class PooledSession:
+    """
+    Region-bound view of an AWSClientPool.
+    Exposes the parts of boto3.Session used by services so they can keep calling
+    ``self.session.client(...)`` while sharing clients across the whole run.
+    """
+
+    def __init__(self, pool: "AWSClientPool", region_name: str):
+        self.pool = pool
+        self.region_name = region_name
+
+    def client(self, service_name: str, region_name: Optional[str] = None):
+        return self.pool.client(service_name, region_name or self.region_name)
+
+
+class AWSClientPool:
+    """
+    Thread-safe pool of boto3 clients keyed by (region, service).
+    Clients are created lazily from a single session, so service models are
+    loaded once, and reused for the rest of the run. Connection pool size and
+    retry behaviour are configured here for every client.
+    """
+
+    def __init__(
+        self,
+        session: boto3.Session,
+        max_pool_connections: int = 25,
+        max_attempts: int = 5,
+        retry_mode: str = "standard",
+        rate_limiter: Optional[APIRateLimiter] = None,
+        account_id: Optional[str] = None,
+        connect_timeout: float = 10,
+        read_timeout: float = 60,
+        response_cache: Optional[ResponseCache] = None,
+    ):
+        self.base_session = session
+        self.rate_limiter = rate_limiter
+        self.response_cache = response_cache
+        self.account_id = account_id
+        self.client_config = Config(
+            max_pool_connections=max_pool_connections,
+            retries={"total_max_attempts": max_attempts, "mode": retry_mode},
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+        )
+        self._lock = threading.Lock()
+        self._clients: Dict[tuple, Any] = {}
+
+    def client(self, service_name: str, region_name: str):
+        """Return the shared client for a service in a region."""
+        key = (region_name, service_name)
+        client = self._clients.get(key)
+        if client is None:
+            # boto3 sessions are not thread-safe, so clients are built under the lock
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self.base_session.client(
+                        service_name,
+                        region_name=region_name,
+                        config=self.client_config,
+                    )
+                    client.meta.events.register("before-call", check_cancellation)
+                    if self.rate_limiter:
+                        self.rate_limiter.attach(client, self.account_id)
+                    if self.response_cache:
+                        self.response_cache.attach(client, self.account_id)
+                    self._clients[key] = client
+        return client
+
+    def session(self, region_name: str) -> PooledSession:
+        return PooledSession(self, region_name)
+
+
+class CollectionTask:
+    """A single (region, service) unit of collection work."""
+
+    def __init__(
+        self,
+        region: str,
+        service_class,
+        service_name: str,
+        section: Optional[str] = None,
+    ):
+        # ``region`` is where the service runs, ``section`` is the output record
+        # it belongs to ("global" for account-wide services).
+        self.region = region
+        self.service_class = service_class
+        self.service_name = service_name
+        self.section = section or region
+        self.expected_duration = getattr(service_class, "estimated_cost", 0.0)
+        self.token = None
+        self.partial = False
+        self.streamed = False
+        self.result = None
+        self.error = None
+        self.submitted_at = None
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def queue_wait(self) -> float:
+        """Seconds the task waited in the queue before a worker picked it up."""
+        if self.submitted_at is None or self.started_at is None:
+            return 0.0
+        return self.started_at - self.submitted_at
+
+    @property
+    def run_time(self) -> float:
+        """Seconds the task spent running on a worker."""
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "region": self.section,
+            "service": self.service_name,
+            "queue_wait": round(self.queue_wait, 3),
+            "run_time": round(self.run_time, 3),
+            "partial": self.partial,
+            "error": self.error,
+        }
+
+
+class DurationHistory:
+    """
+    Run times of previous collections keyed by (account, region, service).
+    Stored as a small JSON file in the state directory and smoothed with an
+    exponentially weighted moving average so one slow run does not dominate.
+    """
+
+    SMOOTHING = 0.5
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._durations: Dict[str, float] = {}
+        try:
+            with open(self.path) as f:
+                self._durations = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable duration history {self.path}: {e}")
+
+    @staticmethod
+    def _key(account_id: str, region: str, service_name: str) -> str:
+        return f"{account_id}/{region}/{service_name}"
+
+    def get(self, account_id: str, region: str, service_name: str) -> Optional[float]:
+        return self._durations.get(self._key(account_id, region, service_name))
+
+    def record(
+        self, account_id: str, region: str, service_name: str, duration: float
+    ) -> None:
+        key = self._key(account_id, region, service_name)
+        with self._lock:
+            previous = self._durations.get(key)
+            if previous is not None:
+                duration = self.SMOOTHING * duration + (1 - self.SMOOTHING) * previous
+            self._durations[key] = round(duration, 3)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with self._lock:
+            with open(tmp_path, "w") as f:
+                json.dump(self._durations, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+
+class ResourceFingerprints:
+    """Fingerprinted resource entries of one service in one region."""
+
+    def __init__(self, previous: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.previous = previous or {}
+        self.current: Dict[str, Dict[str, Any]] = {}
+        self.reused = 0
+        self._lock = threading.Lock()
+
+    def get(self, resource_id: str, fingerprint: str) -> Optional[Any]:
+        """Return the previous entry of a resource if its fingerprint matches."""
+        entry = self.previous.get(resource_id)
+        if entry is None or entry["fingerprint"] != fingerprint:
+            return None
+        with self._lock:
+            self.current[resource_id] = entry
+            self.reused += 1
+        return entry["data"]
+
+    def put(self, resource_id: str, fingerprint: str, data: Any) -> Any:
+        with self._lock:
+            self.current[resource_id] = {"fingerprint": fingerprint, "data": data}
+        return data
+
+
+class FingerprintStore:
+    """
+    Resource fingerprints of the previous run, one JSON file per
+    (account, region, service) in the state directory. Each entry keeps the
+    change marker of a resource with the details collected for it, so an
+    unchanged resource can be carried over without describing it again.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def _path(self, account_id: str, region: str, service_name: str) -> Path:
+        return self.directory / account_id / region / f"{service_name}.json"
+
+    def load(
+        self, account_id: str, region: str, service_name: str
+    ) -> ResourceFingerprints:
+        path = self._path(account_id, region, service_name)
+        try:
+            with open(path) as f:
+                return ResourceFingerprints(json.load(f))
+        except FileNotFoundError:
+            return ResourceFingerprints()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable fingerprints {path}: {e}")
+            return ResourceFingerprints()
+
+    def save(
+        self,
+        account_id: str,
+        region: str,
+        service_name: str,
+        fingerprints: ResourceFingerprints,
+    ) -> None:
+        if not fingerprints.current and not fingerprints.previous:
+            return
+        path = self._path(account_id, region, service_name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(fingerprints.current, f, default=str)
+        os.replace(tmp_path, path)
+
+
+class RunCheckpoint:
+    """
+    Results of the finished (region, service) tasks of one run, one JSON file
+    per task, written as soon as a task completes so an interrupted run can be
+    resumed without collecting them again.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def _path(self, task: CollectionTask) -> Path:
+        return self.directory / task.section / f"{task.service_name}.json"
+
+    def save(self, task: CollectionTask) -> None:
+        if task.error is not None:
+            return
+        path = self._path(task)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            dump({"result": task.result, "partial": task.partial}, f)
+        os.replace(tmp_path, path)
+
+    def restore(self, task: CollectionTask) -> bool:
+        """Load the checkpointed result of a task; False if it has to run again."""
+        try:
+            with open(self._path(task)) as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return False
+        # Results cut short by a deadline or an interruption are collected again
+        if checkpoint["partial"]:
+            return False
+        task.result = checkpoint["result"]
+        return True
+
+    def discard(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class EmptyMarkers:
+    """
+    When each (region, service) pair of an account was last collected empty.
+    In probe mode a recent marker lets services without cheap probes be
+    skipped; markers expire so such pairs are still collected now and then.
+    """
+
+    MAX_AGE = 7 * 24 * 3600
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        try:
+            with open(self.path) as f:
+                self._markers: Dict[str, float] = json.load(f)
+        except FileNotFoundError:
+            self._markers = {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable empty markers {self.path}: {e}")
+            self._markers = {}
+
+    def is_empty(self, region: str, service_name: str) -> bool:
+        marked_at = self._markers.get(f"{region}/{service_name}")
+        return marked_at is not None and time.time() - marked_at < self.MAX_AGE
+
+    def update(self, region: str, service_name: str, empty: bool) -> None:
+        key = f"{region}/{service_name}"
+        if not empty:
+            self._markers.pop(key, None)
+        elif key not in self._markers:
+            self._markers[key] = time.time()
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self._markers, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+class ServiceScheduler:
+    """
+    Work-queue scheduler for collection tasks.
+    Tasks are taken from a single queue by a fixed pool of workers as soon as a
+    worker is free, honouring optional per-service and per-region concurrency caps.
+    Every task gets a cancellation token that expires ``service_timeout`` seconds
+    after it starts. Tasks with the longest expected duration are started first.
+    """
+
+    STATUS_INTERVAL = 60
+
+    def __init__(
+        self,
+        max_workers: int,
+        service_limits: Optional[Dict[str, int]] = None,
+        region_limit: Optional[int] = None,
+        service_timeout: Optional[float] = None,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.service_timeout = service_timeout
+        self.service_limits = service_limits or {}
+        self.region_limit = region_limit
+        self._cond = threading.Condition()
+        self._pending: List[CollectionTask] = []
+        self._running: List[CollectionTask] = []
+        self._running_per_service: Dict[str, int] = {}
+        self._remaining_per_region: Dict[str, int] = {}
+        self._open_regions = set()
+
+    def _is_runnable(self, task: CollectionTask) -> bool:
+        limit = self.service_limits.get(task.service_name)
+        if limit and self._running_per_service.get(task.service_name, 0) >= limit:
+            return False
+        if (
+            self.region_limit
+            and task.section not in self._open_regions
+            and len(self._open_regions) >= self.region_limit
+        ):
+            return False
+        return True
+
+    def _next_task(self) -> Optional[CollectionTask]:
+        """Block until a runnable task is available, or return None when done."""
+        with self._cond:
+            while self._pending:
+                for index, task in enumerate(self._pending):
+                    if self._is_runnable(task):
+                        del self._pending[index]
+                        task.started_at = time.monotonic()
+                        task.token = CancellationToken(self.service_timeout)
+                        self._running.append(task)
+                        self._running_per_service[task.service_name] = (
+                            self._running_per_service.get(task.service_name, 0) + 1
+                        )
+                        self._open_regions.add(task.section)
+                        return task
+                self._cond.wait()
             return None
 
+    def _finish(self, task: CollectionTask) -> None:
+        with self._cond:
+            task.finished_at = time.monotonic()
+            self._running.remove(task)
+            self._running_per_service[task.service_name] -= 1
+            self._remaining_per_region[task.section] -= 1
+            if not self._remaining_per_region[task.section]:
+                self._open_regions.discard(task.section)
+            self._cond.notify_all()
+
+    def _worker(self, run: Callable, on_complete: Callable) -> None:
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+            reset = current_cancellation_token.set(task.token)
+            try:
+                task.result = run(task)
+            except Exception as e:
+                task.error = str(e)
+                logger.error(
+                    f"Error collecting {task.service_name} in region {task.region}: {str(e)}"
+                )
+            finally:
+                current_cancellation_token.reset(reset)
+            task.partial = task.token.interrupted
+            if task.partial:
+                logger.warning(
+                    f"{task.service_name} in {task.region} was cut short "
+                    f"({task.token.reason}), keeping partial results"
+                )
+            self._finish(task)
+            try:
+                on_complete(task)
+            except Exception as e:
+                logger.error(
+                    f"Error handling result of {task.service_name} in region {task.region}: {str(e)}"
+                )
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        """Drop the queued tasks and cancel the running ones, which stop with
+        what they have collected so far."""
+        with self._cond:
+            for task in self._pending:
+                self._remaining_per_region[task.section] -= 1
+            self._pending.clear()
+            for task in self._running:
+                task.token.cancel(reason)
+            self._cond.notify_all()
+
+    def log_status(self) -> None:
+        now = time.monotonic()
+        with self._cond:
+            running = list(self._running)
+            pending = len(self._pending)
+        logger.info(f"Scheduler status: {len(running)} running, {pending} queued")
+        for task in running:
+            logger.info(
+                f"  - {task.service_name} in {task.region} has been running for "
+                f"{now - task.started_at:.1f} seconds"
+            )
+
+    def run(
+        self,
+        tasks: List[CollectionTask],
+        run: Callable[[CollectionTask], Any],
+        on_complete: Callable[[CollectionTask], None],
+    ) -> List[Dict[str, Any]]:
+        """Run all tasks and return their queue-wait and run-time statistics."""
+        submitted_at = time.monotonic()
+        with self._cond:
+            for task in tasks:
+                task.submitted_at = submitted_at
+                self._remaining_per_region[task.section] = (
+                    self._remaining_per_region.get(task.section, 0) + 1
+                )
+            self._pending.extend(tasks)
+            # Longest first, so the slowest services do not start last and
+            # leave the run waiting on a single worker at the end
+            self._pending.sort(key=lambda t: t.expected_duration, reverse=True)
+
+        workers = [
+            threading.Thread(
+                target=self._worker,
+                args=(run, on_complete),
+                name=f"collector-{i}",
+                daemon=True,
+            )
+            for i in range(min(self.max_workers, len(tasks)))
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            while worker.is_alive():
+                worker.join(self.STATUS_INTERVAL)
+                if worker.is_alive():
+                    self.log_status()
+
+        stats = [task.stats() for task in tasks]
+        if tasks:
+            wall_time = time.monotonic() - submitted_at
+            busy_time = sum(task.run_time for task in tasks)
+            logger.info(
+                f"Ran {len(tasks)} tasks in {wall_time:.1f}s on {len(workers)} workers "
+                f"(busy {busy_time:.1f}s, "
+                f"avg queue wait {sum(t.queue_wait for t in tasks) / len(tasks):.1f}s)"
+            )
+            for task in sorted(tasks, key=lambda t: t.run_time, reverse=True)[:5]:
+                logger.info(
+                    f"  - {task.service_name} in {task.region}: "
+                    f"ran {task.run_time:.1f}s after waiting {task.queue_wait:.1f}s"
+                )
+        return stats
+
 
 class AWSProvider:
     def __init__(self, config: Optional[Dict[str, Any]] = None):
@@ -2926,7 +4289,15 @@ class AWSProvider:
         self.client_session = None
 
         self.role_arn = self.config.get("role_arn") or os.environ.get("AWS_ROLE_ARN")
-        if self.role_arn:
+        if self.config.get("session"):
+            # Already authenticated, e.g. a member account in organization mode
+            self.role_arn = None
+            self.client_session = self.config["session"]
+            credentials = self.client_session.get_credentials()
+            self.aws_access_key = credentials.access_key
+            self.aws_secret_key = credentials.secret_key
+            self.aws_session_token = credentials.token
+        elif self.role_arn:
             kovr_arn = app_config[env]["role_arn"]
             self.kovr_session = self.assume_role(kovr_arn, self.main_session)
             self.client_session = self.assume_role(self.role_arn, self.kovr_session)
@@ -2938,14 +4309,225 @@ class AWSProvider:
         self.initial_session = self.client_session or self.main_session
 
         # Get target regions
-        self.target_regions = (
-            [self.config.get("region")]
-            if self.config.get("region")
-            else self.get_active_regions()
-        )
+        if self.config.get("regions"):
+            self.target_regions = list(self.config["regions"])
+        elif self.config.get("region"):
+            self.target_regions = [self.config.get("region")]
+        else:
+            self.target_regions = self.get_active_regions()
 
         logger.info(f"Will collect data from regions: {self.target_regions}")
 
+        # Number of regions collected at the same time
+        self.region_concurrency = max(
+            1,
+            int(
+                self.config.get("region_concurrency")
+                or os.environ.get("REGION_CONCURRENCY")
+                or 4
+            ),
+        )
+        self._account_id = self.config.get("account_id")
+
+        # Number of worker processes regions are spread over; 0 keeps
+        # everything in this process
+        self.region_processes = int(
+            self.config.get("region_processes")
+            or os.environ.get("REGION_PROCESSES")
+            or 0
+        )
+
+        # Size of the worker pool shared by all (region, service) tasks
+        self.max_workers = max(
+            1,
+            int(self.config.get("max_workers") or os.environ.get("MAX_WORKERS") or 12),
+        )
+        # Optional caps on how many regions may run the same service at once
+        self.service_concurrency = parse_service_limits(
+            self.config.get("service_concurrency")
+            or os.environ.get("SERVICE_CONCURRENCY")
+        )
+        self.task_stats = []
+
+        # Directory for state kept between runs, such as service durations
+        self.state_dir = Path(
+            self.config.get("state_dir")
+            or os.environ.get("STATE_DIR")
+            or Path("output") / "state"
+        )
+        self.duration_history = self.config.get("duration_history") or DurationHistory(
+            self.state_dir / "durations.json"
+        )
+
+        # In incremental mode unchanged resources are carried over from the
+        # previous run instead of being described again
+        incremental = self.config.get("incremental")
+        if incremental is None:
+            incremental = os.environ.get("INCREMENTAL", "").lower() in (
+                "1",
+                "true",
+                "yes",
+            )
+        self.fingerprint_store = (
+            FingerprintStore(self.state_dir / "fingerprints") if incremental else None
+        )
+
+        # Only collect the services CloudTrail shows write events for since the
+        # last snapshot, reusing the snapshot for the rest
+        changed_only = self.config.get("changed_only")
+        if changed_only is None:
+            changed_only = os.environ.get("CHANGED_ONLY", "").lower() in (
+                "1",
+                "true",
+                "yes",
+            )
+        self.changed_only = changed_only
+        self.output_format = (
+            self.config.get("output_format")
+            or os.environ.get("OUTPUT_FORMAT")
+            or "json"
+        )
+        pretty = self.config.get("pretty")
+        if pretty is None:
+            pretty = os.environ.get("PRETTY_OUTPUT", "").lower() in ("1", "true", "yes")
+        self.pretty = pretty
+        self.compression = resolve_compression(
+            self.config.get("compression") or os.environ.get("COMPRESS")
+        )
+        # Set to an NDJSONWriter to write each service as soon as it is collected
+        self.record_sink: Optional["NDJSONWriter"] = None
+        dedupe_blobs = self.config.get("dedupe_blobs")
+        if dedupe_blobs is None:
+            dedupe_blobs = os.environ.get("DEDUPE_BLOBS", "").lower() in (
+                "1",
+                "true",
+                "yes",
+            )
+        self.blob_store = BlobStore() if dedupe_blobs else None
+        # Called with (section, record) as soon as every service of a region is done
+        self.on_region_complete: Optional[Callable[[str, Any], None]] = None
+        # Results reused from the last snapshot keyed by (section, service)
+        self.reused: Dict[tuple, Any] = self.config.get("reused") or {}
+        # Streamed results kept for the changed-only snapshot by section
+        self.snapshot_services: Dict[str, Dict[str, Any]] = {}
+
+        # Probe regional services with cheap calls first and skip the pairs
+        # that turn out to be empty
+        probe = self.config.get("probe")
+        if probe is None:
+            probe = os.environ.get("PROBE", "").lower() in ("1", "true", "yes")
+        self.probe = probe
+        self.probed_empty = set(self.config.get("probed_empty") or ())
+
+        # Size of the sub-pool each service uses for per-resource detail calls
+        self.fan_out_workers = max(
+            1,
+            int(
+                self.config.get("fan_out_workers")
+                or os.environ.get("FAN_OUT_WORKERS")
+                or AWSService.fan_out_workers
+            ),
+        )
+
+        # API calls are rate limited per (account, region, API namespace); a rate
+        # of 0 disables the limiter
+        api_rate_limit = self.config.get("api_rate_limit")
+        if api_rate_limit is None:
+            api_rate_limit = os.environ.get("API_RATE_LIMIT") or 20
+        api_rate_limit = float(api_rate_limit)
+        self.rate_limiter = (
+            APIRateLimiter(initial_rate=api_rate_limit) if api_rate_limit > 0 else None
+        )
+
+        # Seconds a single service may run before it is stopped with what it has
+        self.service_timeout = float(
+            self.config.get("service_timeout")
+            or os.environ.get("SERVICE_TIMEOUT")
+            or 300
+        )
+
+        # Read-only API responses can be served from a local cache across runs
+        response_cache = self.config.get("response_cache")
+        if response_cache is None:
+            response_cache = os.environ.get("RESPONSE_CACHE", "").lower() in (
+                "1",
+                "true",
+                "yes",
+            )
+        self.response_cache = (
+            ResponseCache(
+                self.state_dir / "response_cache.sqlite",
+                default_ttl=float(
+                    self.config.get("cache_ttl") or os.environ.get("CACHE_TTL") or 900
+                ),
+                ttls=parse_service_limits(
+                    self.config.get("cache_ttls") or os.environ.get("CACHE_TTLS")
+                ),
+                max_bytes=int(
+                    float(
+                        self.config.get("cache_max_mb")
+                        or os.environ.get("CACHE_MAX_MB")
+                        or 512
+                    )
+                    * 1024
+                    * 1024
+                ),
+            )
+            if response_cache
+            else None
+        )
+
+        # Clients are shared by every service of the run and created on first use
+        self.client_pool = AWSClientPool(
+            self.get_session_for_region(AWSService.home_region),
+            max_pool_connections=int(
+                self.config.get("max_pool_connections")
+                or os.environ.get("MAX_POOL_CONNECTIONS")
+                or 25
+            ),
+            max_attempts=int(
+                self.config.get("max_attempts")
+                or os.environ.get("AWS_MAX_ATTEMPTS")
+                or 5
+            ),
+            retry_mode=self.config.get("retry_mode")
+            or os.environ.get("AWS_RETRY_MODE")
+            or "standard",
+            rate_limiter=self.rate_limiter,
+            account_id=self.get_account_id(),
+            connect_timeout=float(
+                self.config.get("connect_timeout")
+                or os.environ.get("AWS_CONNECT_TIMEOUT")
+                or 10
+            ),
+            read_timeout=float(
+                self.config.get("read_timeout")
+                or os.environ.get("AWS_READ_TIMEOUT")
+                or 60
+            ),
+            response_cache=self.response_cache,
+        )
+
+        # Every finished (region, service) result is checkpointed under the run
+        # ID, so an interrupted run can be resumed with the same ID
+        self.run_id = (
+            self.config.get("run_id")
+            or os.environ.get("RUN_ID")
+            or f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        )
+        self.resume = bool(self.config.get("resume"))
+        self.checkpoint = RunCheckpoint(
+            self.state_dir / "runs" / self.run_id / self.get_account_id()
+        )
+        if self.resume and not self.checkpoint.directory.is_dir():
+            logger.warning(
+                f"No checkpoints of run {self.run_id} in {self.checkpoint.directory}, "
+                "collecting everything; resuming after a restart needs --state-dir "
+                "on a persistent volume"
+            )
+        self.interrupted = threading.Event()
+        self._schedulers: List[ServiceScheduler] = []
+
         self.services = [
             EC2Service,
             IAMService,
@@ -2967,6 +4549,7 @@ class AWSProvider:
             SecretsManagerService,
             SecurityHubService,
             WAFv2Service,
+            WAFv2CloudFrontService,
             # CloudFrontService,
             AccessAnalyzerService,
             AutoScalingService,
@@ -2978,6 +4561,8 @@ class AWSProvider:
             StepFunctionsService,
             TrustedAdvisorService,
         ]
+        self.regional_services = [s for s in self.services if not s.is_global]
+        self.global_services = [s for s in self.services if s.is_global]
 
     def assume_role(self, role_arn: str, session: boto3.Session) -> boto3.Session:
         sts_client = session.client("sts")
@@ -3021,8 +4606,10 @@ class AWSProvider:
 
     def get_account_id(self) -> str:
         """Get AWS Account ID."""
-        sts = self.initial_session.client("sts")
-        return sts.get_caller_identity()["Account"]
+        if self._account_id is None:
+            sts = self.initial_session.client("sts")
+            self._account_id = sts.get_caller_identity()["Account"]
+        return self._account_id
 
     def _is_empty_nested(self, data: Any) -> bool:
         """Check if all nested values in a dictionary are empty."""
@@ -3037,29 +4624,49 @@ class AWSProvider:
         return False
 
     def process_service(self, service_class, region: str) -> tuple:
-        """Process a single service in a specific region and return its data."""
-        session = self.get_session_for_region(region)
+        """Process a single service in a specific region and return its data.
+
+        Unexpected errors are raised, so the task is marked failed and is not
+        checkpointed as if the service had nothing to collect.
+        """
+        session = self.client_pool.session(region)
         service_instance = service_class(session)
+        service_instance.fan_out_workers = self.fan_out_workers
         service_name = service_instance.name
+        if self.fingerprint_store:
+            service_instance.fingerprints = self.fingerprint_store.load(
+                self.get_account_id(), region, service_name
+            )
+        logger.debug(f"Starting collection for {service_name} in region {region}")
+        data = service_instance.generate()
+        if self.fingerprint_store and data is not None:
+            self.save_fingerprints(service_instance, region)
+        if data and not self._is_empty_nested(data):
+            logger.debug(
+                f"Successfully collected data for {service_name} in region {region}"
+            )
+            return service_name, data
+        logger.debug(f"No data collected for {service_name} in region {region}")
+        return service_name, None
+
+    def save_fingerprints(self, service_instance: AWSService, region: str) -> None:
+        fingerprints = service_instance.fingerprints
+        if fingerprints.reused:
+            logger.info(
+                f"Reused {fingerprints.reused} unchanged {service_instance.name} "
+                f"resources in region {region}"
+            )
         try:
-            logger.debug(f"Starting collection for {service_name} in region {region}")
-            data = service_instance.generate()
-            if data and not self._is_empty_nested(data):
-                logger.debug(
-                    f"Successfully collected data for {service_name} in region {region}"
-                )
-                return service_name, data
-            logger.debug(f"No data collected for {service_name} in region {region}")
-            return service_name, None
-        except Exception as e:
-            logger.error(
-                f"Error collecting data for {service_name} in region {region}: {str(e)}"
+            self.fingerprint_store.save(
+                self.get_account_id(), region, service_instance.name, fingerprints
+            )
+        except OSError as e:
+            logger.warning(
+                f"Could not save {service_instance.name} fingerprints for {region}: {e}"
             )
-            return service_name, None
 
-    def collect_region_details(self, region: str) -> Dict[str, Any]:
-        """Collect details for a specific region."""
-        account_details = {
+    def _new_region_record(self, region: str) -> Dict[str, Any]:
+        return {
             "provider": "aws",
             "account_id": self.get_account_id(),
             "region": region,
@@ -3067,125 +4674,1673 @@ class AWSProvider:
             "services": {},
         }
 
-        logger.info(f"Starting AWS service data collection for region {region}")
-        total_services = len(self.services)
+    def _new_global_record(self) -> Dict[str, Any]:
+        record = self._new_region_record("global")
+        record["home_region"] = AWSService.home_region
+        return record
+
+    def _build_tasks(
+        self, regions: List[str], include_global: bool = False
+    ) -> List[CollectionTask]:
+        """Build the (region, service) tasks of the given regions, plus the
+        account-global services if requested, with their expected durations."""
+        tasks = []
+        if include_global:
+            tasks.extend(
+                CollectionTask(
+                    service.home_region,
+                    service,
+                    service.name,
+                    section="global",
+                )
+                for service in self.global_services
+            )
+        tasks.extend(
+            CollectionTask(region, service, service.name)
+            for region in regions
+            for service in self.regional_services
+        )
+        for task in tasks:
+            duration = self.duration_history.get(
+                self.get_account_id(), task.section, task.service_name
+            )
+            if duration is not None:
+                task.expected_duration = duration
+        return tasks
+
+    def _run_tasks(
+        self,
+        regions: List[str],
+        pbar: tqdm,
+        region_limit: Optional[int] = None,
+        include_global: bool = False,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Collect every regional service of every given region through one
+        scheduler, plus the account-global services once if requested."""
+        records = {region: self._new_region_record(region) for region in regions}
+        if include_global and self.global_services:
+            records["global"] = self._new_global_record()
+        tasks = self._build_tasks(regions, include_global)
+        for task in tasks:
+            if (task.section, task.service_name) in self.reused:
+                task.result = self.reused[(task.section, task.service_name)]
+            elif (task.section, task.service_name) in self.probed_empty:
+                records[task.section].setdefault("probed_empty_services", []).append(
+                    task.service_name
+                )
+        pending = [
+            task
+            for task in tasks
+            if (task.section, task.service_name) not in self.reused
+            and (task.section, task.service_name) not in self.probed_empty
+            and not (self.resume and self.checkpoint.restore(task))
+        ]
+        if len(pending) < len(tasks):
+            logger.info(
+                f"{len(tasks) - len(pending)} of {len(tasks)} tasks were already "
+                f"collected, are unchanged since the last snapshot or probed empty"
+            )
+            pbar.update(len(tasks) - len(pending))
 
-        # Track running services
-        running_services = set()
-        completed_services = set()
-        service_start_times = {}
+        def run(task: "CollectionTask") -> Optional[Dict[str, Any]]:
+            _, data = self.process_service(task.service_class, task.region)
+            return data
 
-        # Create batches of 3 services
-        service_batches = [
-            self.services[i : i + 10] for i in range(0, len(self.services), 10)
-        ]
+        lock = threading.Lock()
 
-        def log_service_status():
-            current_time = datetime.utcnow()
-            logger.info(f"Current service status for region {region}:")
-            for service_name in running_services:
-                elapsed = current_time - service_start_times[service_name]
-                logger.info(
-                    f"  - {service_name} has been running for {elapsed.total_seconds():.1f} seconds"
+        def stream(task: "CollectionTask") -> None:
+            if self.blob_store is not None and task.result:
+                self.blob_store.intern(task.result, task.service_name)
+            if self.record_sink is None or not task.result:
+                return
+            self.record_sink.write_service(
+                records[task.section], task.service_name, task.result, task.partial
+            )
+            task.streamed = True
+            if self.changed_only:
+                # The records no longer hold the data, the snapshot still needs it
+                with lock:
+                    self.snapshot_services.setdefault(task.section, {})[
+                        task.service_name
+                    ] = task.result
+            task.result = None
+
+        remaining = {section: 0 for section in records}
+        for task in pending:
+            remaining[task.section] += 1
+        assembled = set()
+
+        def assemble(section: str, notify: bool = True) -> None:
+            with lock:
+                if section in assembled:
+                    return
+                assembled.add(section)
+            # Assemble in task order so the output does not depend on completion order
+            for task in tasks:
+                if task.section != section:
+                    continue
+                if task.result and not task.streamed:
+                    records[section]["services"][task.service_name] = task.result
+                elif task.streamed:
+                    records[section].setdefault("streamed_services", []).append(
+                        task.service_name
+                    )
+                if task.partial:
+                    records[section].setdefault("partial_services", []).append(
+                        task.service_name
+                    )
+            if notify and self.on_region_complete is not None:
+                self.on_region_complete(section, records[section])
+
+        def on_complete(task: "CollectionTask") -> None:
+            try:
+                self.checkpoint.save(task)
+            except OSError as e:
+                logger.warning(
+                    f"Could not checkpoint {task.service_name} in {task.section}: {e}"
                 )
+            stream(task)
+            pbar.update(1)
+            with lock:
+                remaining[task.section] -= 1
+                finished = remaining[task.section] == 0
+            if finished and not self.interrupted.is_set():
+                assemble(task.section)
+
+        # Reused and restored results are final already
+        for task in tasks:
+            stream(task)
+        for section, count in remaining.items():
+            if count == 0:
+                assemble(section)
+
+        scheduler = ServiceScheduler(
+            max_workers=self.max_workers,
+            service_limits=self.service_concurrency,
+            region_limit=region_limit,
+            service_timeout=self.service_timeout,
+        )
+        self._schedulers.append(scheduler)
+        try:
+            if self.interrupted.is_set():
+                scheduler.cancel("interrupted")
+            self.task_stats.extend(scheduler.run(pending, run, on_complete))
+        finally:
+            self._schedulers.remove(scheduler)
+
+        # Regions that were cut short are not handed on as finished
+        for section in records:
+            assemble(section, notify=False)
+        return records
+
+    def collect_region_details(
+        self, region: str, pbar: Optional[tqdm] = None
+    ) -> Dict[str, Any]:
+        """Collect details of the regional services for a specific region.
 
-        with ThreadPoolExecutor(max_workers=3) as executor:
+        When ``pbar`` is given, progress is reported on that shared bar instead of
+        a per-region one.
+        """
+        logger.info(f"Starting AWS service data collection for region {region}")
+        if pbar is None:
             with tqdm(
-                total=total_services, desc=f"Collecting AWS service data for {region}"
-            ) as pbar:
-                for batch in service_batches:
-                    # Submit batch of services to executor
-                    futures = []
-                    for service in batch:
-                        service_name = service(self.get_session_for_region(region)).name
-                        running_services.add(service_name)
-                        service_start_times[service_name] = datetime.utcnow()
-                        futures.append(
-                            executor.submit(self.process_service, service, region)
-                        )
+                total=len(self.regional_services),
+                desc=f"Collecting AWS service data for {region}",
+            ) as own_pbar:
+                record = self._run_tasks([region], own_pbar)[region]
+        else:
+            record = self._run_tasks([region], pbar)[region]
+        logger.info(f"Completed AWS service data collection for region {region}")
+        return record
 
-                    # Wait for batch to complete with timeout
-                    try:
-                        for future in futures:
-                            try:
-                                service_name, data = future.result(
-                                    timeout=300
-                                )  # 5 minute timeout per service
-                                if data:
-                                    account_details["services"][service_name] = data
-                                running_services.remove(service_name)
-                                completed_services.add(service_name)
-                                pbar.update(1)
-                            except TimeoutError:
-                                logger.error(
-                                    f"Services still running after timeout in region {region}: {running_services}"
-                                )
-                                log_service_status()
-                                pbar.update(1)
-                            except Exception as e:
-                                logger.error(
-                                    f"Error processing services in region {region}: {str(e)}"
-                                )
-                                log_service_status()
-                                pbar.update(1)
-                    except Exception as e:
-                        logger.error(
-                            f"Batch processing error in region {region}: {str(e)}"
-                        )
-                        log_service_status()
+    def generate_output(self) -> List[Dict[str, Any]]:
+        """Generate output for all target regions.
+
+        All (region, service) pairs are fed through a single scheduler. At most
+        ``region_concurrency`` regions are in flight at once and the result keeps
+        the order of ``target_regions`` regardless of which region finishes first.
+        Account-global services are collected once and returned as a leading
+        record whose region is "global".
+        """
+        # Resolve the account ID once instead of racing on it from every worker
+        self.get_account_id()
+
+        if self.changed_only:
+            self.reused = self.plan_rescan()
+        if self.probe:
+            empty_markers = EmptyMarkers(
+                self.state_dir / "empty_markers" / f"{self.get_account_id()}.json"
+            )
+            self.probed_empty = self.probe_empty_services(empty_markers)
 
-                    # Log status after each batch
-                    if running_services:
-                        log_service_status()
+        if self.region_processes > 0:
+            output = self._generate_output_in_processes()
+        else:
+            output = self._generate_output_in_threads()
 
-        if running_services:
-            logger.warning(
-                f"Services that did not complete in region {region}: {running_services}"
+        if self.blob_store is not None and self.blob_store.blobs:
+            logger.info(
+                f"Interned {self.blob_store.references} blobs as "
+                f"{len(self.blob_store.blobs)} distinct ones"
             )
-        logger.info(f"Completed services in region {region}: {completed_services}")
-        logger.info(f"Completed AWS service data collection for region {region}")
-        return account_details
+            blobs = self.blob_store.record(self.get_account_id())
+            output.append(blobs)
+            if self.on_region_complete is not None and not self.interrupted.is_set():
+                self.on_region_complete(BLOBS_SECTION, blobs)
 
-    def generate_output(self) -> List[Dict[str, Any]]:
-        """Generate output for all target regions."""
-        all_regions_data = []
+        if self.probe and not self.interrupted.is_set():
+            self.update_empty_markers(empty_markers, output)
 
-        for i, region in enumerate(self.target_regions):
+        if self.changed_only and not self.interrupted.is_set():
             try:
-                logger.info(f"Starting collection for region: {region}")
-                region_data = self.collect_region_details(region)
-                all_regions_data.append(region_data)
-                logger.info(f"Completed collection for region: {region}")
-            except Exception as e:
-                logger.error(f"Error collecting data for region {region}: {str(e)}")
+                self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+                write_output(self._snapshot_records(output), self.snapshot_path)
+            except OSError as e:
+                logger.warning(f"Could not save snapshot {self.snapshot_path}: {e}")
+        return output
+
+    def _generate_output_in_threads(self) -> List[Dict[str, Any]]:
+        """Collect all regions on this process' worker threads."""
+        total = len(self.target_regions) * len(self.regional_services) + len(
+            self.global_services
+        )
+        logger.info(
+            f"Collecting {len(self.target_regions)} regions with up to "
+            f"{self.region_concurrency} in parallel on {self.max_workers} workers"
+        )
 
-        return all_regions_data
+        with tqdm(total=total, desc="Collecting AWS service data") as pbar:
+            records = self._run_tasks(
+                self.target_regions,
+                pbar,
+                region_limit=self.region_concurrency,
+                include_global=True,
+            )
 
+        self.log_api_summary()
+        self.save_duration_history()
+
+        sections = (["global"] if "global" in records else []) + self.target_regions
+        return [records[section] for section in sections]
+
+    @property
+    def snapshot_path(self) -> Path:
+        """Output of the last run of this account, the base of changed-only runs."""
+        return self.state_dir / "snapshots" / f"{self.get_account_id()}.json"
+
+    def _snapshot_records(self, output: List[Any]) -> List[Any]:
+        """Output records with the data of their streamed services put back."""
+        records = []
+        for record in output:
+            streamed = (
+                self.snapshot_services.get(record["region"])
+                if isinstance(record, dict)
+                else None
+            )
+            if streamed:
+                record = {
+                    key: value
+                    for key, value in record.items()
+                    if key != "streamed_services"
+                }
+                record["services"] = {**record["services"], **streamed}
+            records.append(record)
+        return records
 
-class AzureProvider:
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
-        self.config = config or {}
+    def plan_rescan(self) -> Dict[tuple, Any]:
+        """Find the (section, service) results that can be reused from the last
+        snapshot because CloudTrail logged no write event for them since."""
+        try:
+            with open(self.snapshot_path) as f:
+                snapshot = {record["region"]: record for record in json.load(f)}
+        except FileNotFoundError:
+            logger.info("No previous snapshot, collecting everything")
+            return {}
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable snapshot {self.snapshot_path}: {e}")
+            return {}
+        snapshot_blobs = snapshot.pop(BLOBS_SECTION, {}).get("blobs", {})
+
+        # Events can show up in CloudTrail some minutes after they happened
+        since = min(
+            datetime.fromisoformat(record["collection_time"])
+            for record in snapshot.values()
+        ) - timedelta(minutes=15)
+        if datetime.utcnow() - since > timedelta(days=CHANGE_LOOKBACK_DAYS):
+            logger.info("Snapshot is older than CloudTrail's event history")
+            return {}
 
-        self.client = StorageManagementClient(
-            credential=ClientSecretCredential(
-                client_id=self.config.get("azure_client_id"),
-                client_secret=self.config.get("azure_client_secret"),
-                tenant_id=self.config.get("azure_tenant_id"),
-            ),
-            subscription_id=self.config.get("azure_subscription_id"),
+        def lookup(region: str) -> Optional[set]:
+            try:
+                return CloudTrailService(
+                    self.client_pool.session(region)
+                ).get_write_event_sources(since)
+            except ClientError as e:
+                logger.warning(f"Could not look up CloudTrail events in {region}: {e}")
+                return None
+
+        regions = list(self.target_regions)
+        if self.global_services and AWSService.home_region not in regions:
+            regions.append(AWSService.home_region)
+        with ThreadPoolExecutor(max_workers=self.region_concurrency) as executor:
+            sources = dict(zip(regions, executor.map(lookup, regions)))
+        # Global services log their events in their home region, except S3
+        # which logs them in the bucket's region
+        global_sources = (
+            None if None in sources.values() else set().union(*sources.values())
         )
 
-    def generate_output(self) -> List[Dict[str, Any]]:
-        data = self.client.storage_accounts.list()
-        items = []
-        for account in data:
-            items.append(
+        reused = {}
+        tasks = self._build_tasks(self.target_regions, include_global=True)
+        for task in tasks:
+            record = snapshot.get(task.section)
+            event_sources = task.service_class.event_sources
+            if (
+                record is None
+                or event_sources is None
+                or task.service_name not in record.get("services", {})
+                or task.service_name in record.get("partial_services", [])
+            ):
+                # Nothing to reuse, or not known to be complete
+                continue
+            changed = (
+                global_sources if task.section == "global" else sources[task.section]
+            )
+            if changed is None or changed.intersection(event_sources):
+                continue
+            reused[(task.section, task.service_name)] = record["services"][
+                task.service_name
+            ]
+        if self.blob_store is not None and snapshot_blobs:
+            # Reused results refer to blobs of the snapshot
+            referenced = self.blob_store.references_in(list(reused.values()))
+            self.blob_store.merge(
                 {
-                    "id": account.id,
-                    "name": account.name,
-                    "location": account.location,
-                    "provisioning_state": account.provisioning_state,
-                    "sku": account.sku,
+                    digest: snapshot_blobs[digest]
+                    for digest in referenced
+                    if digest in snapshot_blobs
+                }
+            )
+        logger.info(
+            f"CloudTrail shows no changes for {len(reused)} of {len(tasks)} "
+            f"services since {since.isoformat()}, reusing them from the last snapshot"
+        )
+        return reused
+
+    def _tagged_namespaces(self, region: str, max_pages: int = 10) -> set:
+        """ARN service namespaces of the tagged resources in a region."""
+        namespaces = set()
+        try:
+            client = self.client_pool.client("resourcegroupstaggingapi", region)
+            paginator = client.get_paginator("get_resources")
+            for index, page in enumerate(paginator.paginate(ResourcesPerPage=100)):
+                namespaces.update(
+                    mapping["ResourceARN"].split(":")[2]
+                    for mapping in page["ResourceTagMappingList"]
+                )
+                if index + 1 >= max_pages:
+                    break
+        except ClientError as e:
+            logger.warning(f"Could not list tagged resources in {region}: {e}")
+        return namespaces
+
+    def probe_empty_services(self, empty_markers: EmptyMarkers) -> set:
+        """Find the (region, service) pairs with nothing to collect.
+
+        A pair is collected when the tagging API shows resources of its
+        namespace or when one of its probes finds a resource. Services without
+        probes are only skipped while a recent empty marker says they were
+        empty last time. Global services are always collected.
+        """
+        with ThreadPoolExecutor(max_workers=self.region_concurrency) as executor:
+            tagged = dict(
+                zip(
+                    self.target_regions,
+                    executor.map(self._tagged_namespaces, self.target_regions),
+                )
+            )
+
+        def is_empty(task: CollectionTask) -> bool:
+            service = task.service_class(self.client_pool.session(task.region))
+            client = getattr(service, "client", None)
+            if (
+                client is not None
+                and client.meta.service_model.endpoint_prefix in tagged[task.region]
+            ):
+                return False
+            try:
+                found = service.probe()
+            except ClientError as e:
+                logger.debug(
+                    f"Probe of {task.service_name} in {task.region} failed: {e}"
+                )
+                return False
+            if found is None:
+                return empty_markers.is_empty(task.region, task.service_name)
+            return not found
+
+        tasks = [
+            task
+            for task in self._build_tasks(self.target_regions)
+            if (task.section, task.service_name) not in self.reused
+        ]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            empty = {
+                (task.section, task.service_name)
+                for task, task_empty in zip(tasks, executor.map(is_empty, tasks))
+                if task_empty
+            }
+        logger.info(
+            f"Probes found {len(empty)} of {len(tasks)} regional services empty, "
+            f"skipping them"
+        )
+        return empty
+
+    def update_empty_markers(
+        self, empty_markers: EmptyMarkers, output: List[Any]
+    ) -> None:
+        """Remember which collected regional services came back empty."""
+        records = {
+            record["region"]: record
+            for record in (
+                json.loads(record) if isinstance(record, str) else record
+                for record in output
+            )
+        }
+        for task in self._build_tasks(self.target_regions):
+            key = (task.section, task.service_name)
+            record = records.get(task.section)
+            if record is None or key in self.probed_empty or key in self.reused:
+                continue
+            if task.service_name in record.get("partial_services", []):
+                continue
+            empty_markers.update(
+                task.section,
+                task.service_name,
+                task.service_name not in record["services"]
+                and task.service_name not in record.get("streamed_services", []),
+            )
+        try:
+            empty_markers.save()
+        except OSError as e:
+            logger.warning(f"Could not save empty markers: {e}")
+
+    def interrupt(self, reason: str = "interrupted") -> None:
+        """Stop the collection, e.g. on SIGTERM.
+
+        Queued tasks are dropped and running ones are cancelled, so they flush
+        their partial results to the checkpoint and the run can be resumed.
+        """
+        if self.interrupted.is_set():
+            return
+        logger.warning(f"Stopping run {self.run_id}: {reason}")
+        self.interrupted.set()
+        for scheduler in list(self._schedulers):
+            scheduler.cancel(reason)
+        # Worker processes checkpoint their own tasks
+        for process in multiprocessing.active_children():
+            os.kill(process.pid, signal.SIGTERM)
+
+    def log_api_summary(self) -> None:
+        """Log how the API rate limiter and response cache fared in this run."""
+        if self.rate_limiter:
+            self.rate_limiter.log_summary()
+        if self.response_cache:
+            self.response_cache.log_summary()
+
+    def save_duration_history(self) -> None:
+        """Fold the run times of this run's tasks into the duration history."""
+        for stats in self.task_stats:
+            if stats["error"] is None:
+                self.duration_history.record(
+                    self.get_account_id(),
+                    stats["region"],
+                    stats["service"],
+                    stats["run_time"],
+                )
+        try:
+            self.duration_history.save()
+        except OSError as e:
+            logger.warning(f"Could not save duration history: {e}")
+
+    def _worker_config(self) -> Dict[str, Any]:
+        """Picklable config that lets a worker process rebuild this provider
+        without assuming roles or discovering regions again."""
+        config = {
+            key: value
+            for key, value in self.config.items()
+            if key
+            not in ("session", "role_arn", "region", "regions", "duration_history")
+        }
+        config.update(
+            {
+                "aws_access_key_id": self.aws_access_key,
+                "aws_secret_access_key": self.aws_secret_key,
+                "aws_session_token": self.aws_session_token,
+                "account_id": self.get_account_id(),
+                "region_processes": 0,
+                "state_dir": str(self.state_dir),
+                "run_id": self.run_id,
+                "changed_only": False,
+                "probe": False,
+                "output_format": "json",
+                "compression": "none",
+            }
+        )
+        return config
+
+    def _generate_output_in_processes(self) -> List["SerializedRecord"]:
+        """Collect regions in separate worker processes.
+
+        Each region, and the global services, runs in a worker process with its
+        own thread pool so parsing and JSON encoding are not bound to this
+        process' GIL. Workers return already serialized records.
+        """
+        config = self._worker_config()
+        groups = [(region, [region], False) for region in self.target_regions]
+        if self.global_services:
+            groups.insert(0, ("global", [], True))
+
+        logger.info(
+            f"Collecting {len(self.target_regions)} regions in "
+            f"{self.region_processes} worker processes"
+        )
+
+        records = {}
+        # Spawn rather than fork: boto3 clients and their connection pools are
+        # not safe to share with a forked child
+        with ProcessPoolExecutor(
+            max_workers=self.region_processes,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            futures = {
+                executor.submit(
+                    collect_regions_in_worker,
+                    dict(
+                        config,
+                        reused={
+                            key: value
+                            for key, value in self.reused.items()
+                            if key[0] == section
+                        },
+                        probed_empty=[
+                            key for key in self.probed_empty if key[0] == section
+                        ],
+                    ),
+                    regions,
+                    include_global,
+                ): (section, regions, include_global)
+                for section, regions, include_global in groups
+            }
+            total = len(self.target_regions) * len(self.regional_services) + len(
+                self.global_services
+            )
+            with tqdm(total=total, desc="Collecting AWS service data") as pbar:
+                for future in as_completed(futures):
+                    section, regions, include_global = futures[future]
+                    try:
+                        shards, stats, blobs = future.result()
+                        if self.blob_store is not None:
+                            self.blob_store.merge(blobs)
+                        if self.on_region_complete is not None:
+                            for shard_section, record in shards.items():
+                                self.on_region_complete(shard_section, record)
+                        if self.record_sink is not None:
+                            decoded = {
+                                section: json.loads(record)
+                                for section, record in shards.items()
+                            }
+                            if self.changed_only:
+                                for section, record in decoded.items():
+                                    self.snapshot_services[section] = dict(
+                                        record["services"]
+                                    )
+                            shards = {
+                                section: self.record_sink.write_services(record)
+                                for section, record in decoded.items()
+                            }
+                        records.update(shards)
+                        self.task_stats.extend(stats)
+                    except Exception as e:
+                        logger.error(
+                            f"Error collecting data for {section} in a worker process: {str(e)}"
+                        )
+                    pbar.update(
+                        len(regions) * len(self.regional_services)
+                        + (len(self.global_services) if include_global else 0)
+                    )
+
+        self.save_duration_history()
+
+        sections = ["global"] + self.target_regions
+        return [records[section] for section in sections if section in records]
+
+
+def json_default(value: Any) -> Any:
+    """Encode the non-JSON types found in boto3 responses.
+
+    Datetimes become ISO-8601 in UTC, bytes base64 and Decimals numbers.
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode("ascii")
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return str(value)
+
+
+_COMPACT_ENCODER = json.JSONEncoder(
+    default=json_default,
+    ensure_ascii=False,
+    check_circular=False,
+    separators=(",", ":"),
+)
+_PRETTY_ENCODER = json.JSONEncoder(
+    default=json_default, ensure_ascii=False, check_circular=False, indent=2
+)
+
+
+def _orjson_dumps(value: Any, pretty: bool) -> Optional[bytes]:
+    if orjson is None:
+        return None
+    option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    if pretty:
+        option |= orjson.OPT_INDENT_2
+    try:
+        return orjson.dumps(value, default=json_default, option=option)
+    except TypeError:
+        # E.g. integers beyond 64 bits, which the stdlib encoder handles
+        return None
+
+
+def dumps(value: Any, pretty: bool = False) -> str:
+    """Encode a value as JSON with orjson when it is installed."""
+    encoded = _orjson_dumps(value, pretty)
+    if encoded is not None:
+        return encoded.decode()
+    return (_PRETTY_ENCODER if pretty else _COMPACT_ENCODER).encode(value)
+
+
+def dump(value: Any, f, pretty: bool = False) -> None:
+    """Write a value as JSON to a text file."""
+    encoded = _orjson_dumps(value, pretty)
+    if encoded is not None:
+        buffer = getattr(f, "buffer", None)
+        if buffer is None:
+            f.write(encoded.decode())
+        else:
+            # Skip decoding into a second copy of the document
+            f.flush()
+            buffer.write(encoded)
+        return
+    # Encode in chunks so the whole document is never held as one string
+    for chunk in (_PRETTY_ENCODER if pretty else _COMPACT_ENCODER).iterencode(value):
+        f.write(chunk)
+
+
+# Output section holding the interned blobs of a run
+BLOBS_SECTION = "blobs"
+
+
+class BlobStore:
+    """
+    Interns large, often repeated values such as policy documents, dashboard
+    bodies or container definitions into a content-addressed table. Every
+    copy in the output is replaced by a ``{"$blob": "sha256:<hex>"}``
+    reference and only the first copy is kept in memory.
+    """
+
+    # Fields interned per service, as dotted paths into the service's data
+    # where "*" stands for every item of a list
+    PATHS = {
+        "iam": ("roles.Roles.*.AssumeRolePolicyDocument",),
+        "s3": ("buckets.Buckets.*.Policy",),
+        "ecs": ("task_definitions.*.container_definitions",),
+        "sns": (
+            "topics.*.attributes.Policy",
+            "topics.*.attributes.DeliveryPolicy",
+            "topics.*.attributes.EffectiveDeliveryPolicy",
+        ),
+        "sqs": ("queues.*.attributes.Policy",),
+        "secretsmanager": ("secrets.*.policy",),
+        "cloudwatch": ("dashboards.*.body",),
+        "ecr": ("registry_policy", "repositories.*.policy"),
+    }
+    MIN_SIZE = 128
+
+    def __init__(self, blobs: Optional[Dict[str, Any]] = None):
+        self.blobs: Dict[str, Any] = dict(blobs or {})
+        self._lock = threading.Lock()
+        self.references = 0
+
+    @staticmethod
+    def is_reference(value: Any) -> bool:
+        return isinstance(value, dict) and len(value) == 1 and "$blob" in value
+
+    def _store(self, value: Any) -> Optional[Dict[str, str]]:
+        encoded = canonical_json(value)
+        if len(encoded) < self.MIN_SIZE:
+            return None
+        digest = f"sha256:{hashlib.sha256(encoded).hexdigest()}"
+        with self._lock:
+            self.blobs.setdefault(digest, value)
+            self.references += 1
+        return {"$blob": digest}
+
+    def _intern_path(self, value: Any, path: List[str]) -> None:
+        key, rest = path[0], path[1:]
+        if key == "*":
+            for item in value if isinstance(value, list) else ():
+                self._intern_path(item, rest)
+            return
+        if not isinstance(value, dict) or key not in value:
+            return
+        if rest:
+            self._intern_path(value[key], rest)
+            return
+        child = value[key]
+        if child and not self.is_reference(child):
+            reference = self._store(child)
+            if reference is not None:
+                value[key] = reference
+
+    def intern(self, value: Any, service_name: str) -> Any:
+        """Replace the blobs in the data of a service by references, in place."""
+        for path in self.PATHS.get(service_name, ()):
+            self._intern_path(value, path.split("."))
+        return value
+
+    def references_in(self, value: Any) -> set:
+        """The blob IDs a value refers to."""
+        if self.is_reference(value):
+            return {value["$blob"]}
+        if isinstance(value, dict):
+            children = value.values()
+        elif isinstance(value, list):
+            children = value
+        else:
+            return set()
+        return set().union(*(self.references_in(child) for child in children))
+
+    def merge(self, blobs: Dict[str, Any]) -> None:
+        with self._lock:
+            for digest, value in blobs.items():
+                self.blobs.setdefault(digest, value)
+
+    def record(self, account_id: str) -> Dict[str, Any]:
+        """The output record holding the blobs."""
+        return {
+            "provider": "aws",
+            "account_id": account_id,
+            "region": BLOBS_SECTION,
+            "services": {},
+            "blobs": self.blobs,
+        }
+
+
+class SerializedRecord(str):
+    """An output record that was already JSON encoded, e.g. by a worker process."""
+
+
+def collect_regions_in_worker(
+    config: Dict[str, Any], regions: List[str], include_global: bool
+) -> tuple:
+    """Entry point of a region worker process.
+
+    Rebuilds the provider from ``config``, collects the given regions and
+    returns the JSON encoded records keyed by section with the task statistics
+    and the blobs the records refer to.
+    """
+    worker_config = dict(config, regions=regions or [AWSService.home_region])
+    # Reuse the parent's (possibly assumed) credentials as they are
+    worker_config["session"] = boto3.Session(
+        aws_access_key_id=worker_config.pop("aws_access_key_id"),
+        aws_secret_access_key=worker_config.pop("aws_secret_access_key"),
+        aws_session_token=worker_config.pop("aws_session_token"),
+    )
+    provider = AWSProvider(worker_config)
+    signal.signal(
+        signal.SIGTERM, lambda signum, frame: provider.interrupt("terminated")
+    )
+    with tqdm(disable=True) as pbar:
+        records = provider._run_tasks(regions, pbar, include_global=include_global)
+    provider.log_api_summary()
+    shards = {
+        section: SerializedRecord(dumps(record, provider.pretty))
+        for section, record in records.items()
+    }
+    blobs = provider.blob_store.blobs if provider.blob_store is not None else {}
+    return shards, provider.task_stats, blobs
+
+
+class NDJSONWriter:
+    """
+    Writes the output as newline-delimited JSON while it is collected.
+    Every (region, service) result becomes one compact line as soon as it is
+    finished, so only the services in flight are held in memory. A closing
+    summary line lists the region records without their service data.
+    """
+
+    def __init__(self, output_file: Path):
+        self.output_file = Path(output_file)
+        self._file = open_output(self.output_file, "w")
+        self._lock = threading.Lock()
+        self._written = set()
+        self.lines = 0
+
+    def write(self, line: Dict[str, Any]) -> None:
+        encoded = dumps(line)
+        with self._lock:
+            self._file.write(encoded)
+            self._file.write("\n")
+            self.lines += 1
+
+    def write_service(
+        self,
+        record: Dict[str, Any],
+        service_name: str,
+        data: Any,
+        partial: bool = False,
+    ) -> None:
+        """Write one service of a region record."""
+        line = {
+            "type": "service",
+            "provider": record.get("provider"),
+            "account_id": record.get("account_id"),
+            "region": record["region"],
+            "service": service_name,
+            "collection_time": datetime.utcnow().isoformat(),
+            "data": data,
+        }
+        if partial:
+            line["partial"] = True
+        self.write(line)
+        with self._lock:
+            self._written.add((record["region"], service_name))
+
+    def write_services(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Write the services of a region record not written yet and return the
+        record without their data."""
+        streamed = list(record.get("streamed_services", []))
+        for service_name, data in record["services"].items():
+            if (record["region"], service_name) not in self._written:
+                self.write_service(
+                    record,
+                    service_name,
+                    data,
+                    service_name in record.get("partial_services", []),
+                )
+            streamed.append(service_name)
+        return dict(record, services={}, streamed_services=streamed)
+
+    def finish(self, records: List[Any]) -> None:
+        """Write what is left of the records and the summary line, then close."""
+        summary = []
+        for record in records:
+            if isinstance(record, SerializedRecord):
+                record = json.loads(record)
+            if not (isinstance(record, dict) and "services" in record):
+                # Not made of region records, e.g. Azure output
+                self.write(record)
+                continue
+            for digest, value in record.get("blobs", {}).items():
+                self.write({"type": "blob", "id": digest, "data": value})
+            record = self.write_services(
+                {key: value for key, value in record.items() if key != "blobs"}
+            )
+            summary.append(
+                {
+                    key: value
+                    for key, value in record.items()
+                    if key not in ("services", "streamed_services")
+                }
+            )
+            summary[-1]["services"] = record["streamed_services"]
+        if summary:
+            self.write({"type": "summary", "records": summary, "lines": self.lines})
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+OUTPUT_EXTENSIONS = {"json": "json", "ndjson": "ndjson"}
+
+# File suffix and HTTP Content-Encoding of each output compression
+COMPRESSIONS = {"none": ("", None), "gzip": (".gz", "gzip"), "zstd": (".zst", "zstd")}
+
+
+def resolve_compression(compression: Optional[str]) -> str:
+    """The compression to use, falling back to gzip when zstd is not installed."""
+    compression = compression or "none"
+    if compression == "zstd" and zstandard is None:
+        logger.warning("zstandard is not installed, compressing the output with gzip")
+        return "gzip"
+    return compression
+
+
+def output_path(
+    output_dir: Path, name: str, output_format: str = "json", compression: str = "none"
+) -> Path:
+    return (
+        Path(output_dir)
+        / f"{name}.{OUTPUT_EXTENSIONS[output_format]}{COMPRESSIONS[compression][0]}"
+    )
+
+
+def content_encoding(output_file: Path) -> Optional[str]:
+    """Content-Encoding of an output file, judging by its suffix."""
+    for suffix, encoding in COMPRESSIONS.values():
+        if suffix and Path(output_file).suffix == suffix:
+            return encoding
+    return None
+
+
+def open_output(output_file: Path, mode: str = "r"):
+    """Open an output file as text, compressing or decompressing on the fly
+    according to its suffix so no uncompressed copy is written to disk."""
+    encoding = content_encoding(output_file)
+    if encoding == "gzip":
+        return gzip.open(output_file, f"{mode}t", encoding="utf-8", compresslevel=6)
+    if encoding == "zstd":
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is needed to open {output_file}")
+        raw = open(output_file, f"{mode}b")
+        if mode == "w":
+            stream = zstandard.ZstdCompressor(level=3).stream_writer(raw)
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(raw)
+        return io.TextIOWrapper(stream, encoding="utf-8")
+    return open(output_file, mode, encoding="utf-8")
+
+
+def read_output(output_file: Path) -> Any:
+    """Load an output file back as the records it was written from."""
+    with open_output(output_file) as f:
+        if ".ndjson" not in Path(output_file).suffixes:
+            return json.load(f)
+        lines = [json.loads(line) for line in f if line.strip()]
+    if not lines or lines[-1].get("type") != "summary":
+        return lines
+    records = {}
+    for record in lines[-1]["records"]:
+        records[record["region"]] = dict(record, services={})
+    for line in lines[:-1]:
+        if line.get("type") == "service" and line["region"] in records:
+            records[line["region"]]["services"][line["service"]] = line["data"]
+        elif line.get("type") == "blob" and BLOBS_SECTION in records:
+            records[BLOBS_SECTION].setdefault("blobs", {})[line["id"]] = line["data"]
+    return list(records.values())
+
+
+def write_output(
+    records: List[Any],
+    output_file: Path,
+    output_format: str = "json",
+    pretty: bool = False,
+) -> None:
+    """Write the output records as a JSON list, or as NDJSON lines.
+
+    Records that were already serialized are written as they are instead of
+    being decoded and encoded again.
+    """
+    if output_format == "ndjson":
+        NDJSONWriter(output_file).finish(records)
+        return
+    with open_output(output_file, "w") as f:
+        if not any(isinstance(record, SerializedRecord) for record in records):
+            dump(records, f, pretty)
+            return
+        newline = "\n" if pretty else ""
+        f.write(f"[{newline}")
+        for index, record in enumerate(records):
+            if index:
+                f.write(f",{newline}")
+            if isinstance(record, SerializedRecord):
+                f.write(record)
+            else:
+                dump(record, f, pretty)
+        f.write(f"{newline}]")
+
+
+class ParquetExporter:
+    """
+    Flattens the resources of output records into one table per resource type,
+    e.g. ``ec2_instances`` or ``iam_roles``, with ``account_id`` and ``region``
+    columns and writes them as Parquet. Scalar columns keep their type, nested
+    values are stored as JSON strings and strings are dictionary encoded.
+    """
+
+    MAX_DEPTH = 3
+    ISO_TIMESTAMP = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}")
+
+    def __init__(self):
+        self.tables: Dict[str, List[Dict[str, Any]]] = {}
+
+    def add(self, records: List[Any]) -> None:
+        for record in records:
+            if isinstance(record, SerializedRecord):
+                record = json.loads(record)
+            if not (isinstance(record, dict) and "services" in record):
+                continue
+            for service_name, data in record["services"].items():
+                self._collect(service_name, data, record, 0)
+
+    def _collect(self, name: str, value: Any, record: Dict[str, Any], depth: int):
+        if (
+            isinstance(value, list)
+            and value
+            and all(isinstance(item, dict) for item in value)
+        ):
+            rows = self.tables.setdefault(name, [])
+            for item in value:
+                row = {
+                    "account_id": record.get("account_id"),
+                    "region": record["region"],
+                }
+                row.update(
+                    (key, field) for key, field in item.items() if key not in row
+                )
+                rows.append(row)
+        elif isinstance(value, dict) and depth < self.MAX_DEPTH:
+            for key, child in value.items():
+                if key == "ResponseMetadata":
+                    continue
+                part = xform_name(str(key))
+                # {"buckets": {"Buckets": [...]}} is one table, not s3_buckets_buckets
+                child_name = name if name.endswith(f"_{part}") else f"{name}_{part}"
+                self._collect(child_name, child, record, depth + 1)
+
+    def _column(self, values: List[Any]):
+        kinds = {type(value) for value in values if value is not None}
+        if kinds == {bool}:
+            return pyarrow.array(values, pyarrow.bool_())
+        if kinds == {int}:
+            try:
+                return pyarrow.array(values, pyarrow.int64())
+            except (OverflowError, pyarrow.ArrowInvalid):
+                pass
+        elif kinds == {float} or kinds == {int, float}:
+            return pyarrow.array(
+                [None if value is None else float(value) for value in values],
+                pyarrow.float64(),
+            )
+        elif kinds == {str} and all(
+            value is None or self.ISO_TIMESTAMP.match(value) for value in values
+        ):
+            try:
+                timestamps = [
+                    None if value is None else datetime.fromisoformat(value)
+                    for value in values
+                ]
+            except ValueError:
+                pass
+            else:
+                return pyarrow.array(
+                    [
+                        (
+                            None
+                            if value is None
+                            else (
+                                value.astimezone(timezone.utc)
+                                if value.tzinfo
+                                else value.replace(tzinfo=timezone.utc)
+                            )
+                        )
+                        for value in timestamps
+                    ],
+                    pyarrow.timestamp("us", tz="UTC"),
+                )
+        return pyarrow.array(
+            [
+                value if value is None or isinstance(value, str) else dumps(value)
+                for value in values
+            ],
+            pyarrow.string(),
+        ).dictionary_encode()
+
+    def write(self, directory: Path) -> List[Path]:
+        """Write every table to ``<directory>/<table>.parquet``."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for name, rows in sorted(self.tables.items()):
+            columns = list(dict.fromkeys(key for row in rows for key in row))
+            table = pyarrow.table(
+                {
+                    str(column): self._column([row.get(column) for row in rows])
+                    for column in columns
+                }
+            )
+            path = directory / f"{name}.parquet"
+            pyarrow.parquet.write_table(table, path, compression="zstd")
+            paths.append(path)
+        return paths
+
+
+class OrganizationCollector:
+    """
+    Collects every active member account of an AWS Organization.
+    Member accounts are discovered through OrganizationsService, a member role is
+    assumed in each of them in parallel and up to ``account_concurrency`` accounts
+    are collected at the same time. Each account is written as its own output shard.
+    """
+
+    def __init__(
+        self,
+        provider: "AWSProvider",
+        member_role_name: str = "OrganizationAccountAccessRole",
+        account_concurrency: int = 2,
+    ):
+        self.provider = provider
+        self.member_role_name = member_role_name
+        self.account_concurrency = max(1, account_concurrency)
+        self.interrupted = threading.Event()
+        self._member_providers: List[AWSProvider] = []
+
+    def list_member_accounts(self) -> List[str]:
+        """Return the IDs of all active accounts of the organization."""
+        organizations = OrganizationsService(
+            self.provider.client_pool.session(OrganizationsService.home_region)
+        )
+        return [
+            account["Id"]
+            for account in organizations.list_accounts()
+            if account.get("Status") == "ACTIVE"
+        ]
+
+    def assume_member_session(self, account_id: str) -> boto3.Session:
+        """Assume the member role in an account, reusing our own session for the
+        account the provider is already authenticated against."""
+        if account_id == self.provider.get_account_id():
+            return self.provider.initial_session
+        sts = self.provider.client_pool.client("sts", AWSService.home_region)
+        credentials = sts.assume_role(
+            RoleArn=f"arn:aws:iam::{account_id}:role/{self.member_role_name}",
+            RoleSessionName="kovr-data-collector",
+        )["Credentials"]
+        return boto3.Session(
+            aws_access_key_id=credentials["AccessKeyId"],
+            aws_secret_access_key=credentials["SecretAccessKey"],
+            aws_session_token=credentials["SessionToken"],
+        )
+
+    def member_config(self, session: boto3.Session) -> Dict[str, Any]:
+        """Provider config for a member account, keeping the tuning options."""
+        config = {
+            key: value
+            for key, value in self.provider.config.items()
+            if key
+            not in (
+                "role_arn",
+                "aws_access_key_id",
+                "aws_secret_access_key",
+                "aws_session_token",
+            )
+        }
+        config["session"] = session
+        # Member accounts share one history so their updates do not overwrite
+        # each other
+        config["duration_history"] = self.provider.duration_history
+        config["run_id"] = self.provider.run_id
+        return config
+
+    def collect_account(self, account_id: str, output_dir: Path) -> Optional[Path]:
+        """Collect one member account and write it to its own shard.
+
+        The member role is assumed right before collection so the temporary
+        credentials are fresh when the account starts.
+        """
+        try:
+            session = self.assume_member_session(account_id)
+        except Exception as e:
+            logger.error(
+                f"Could not assume {self.member_role_name} in account {account_id}: {str(e)}"
+            )
+            return None
+
+        if self.interrupted.is_set():
+            return None
+        try:
+            logger.info(f"Starting collection for account {account_id}")
+            provider = AWSProvider(self.member_config(session))
+            self._member_providers.append(provider)
+            if self.interrupted.is_set():
+                provider.interrupt("interrupted")
+            shard = output_path(
+                output_dir,
+                f"aws_data_{account_id}",
+                provider.output_format,
+                provider.compression,
+            )
+            if provider.output_format == "ndjson":
+                provider.record_sink = NDJSONWriter(shard)
+            try:
+                account_data = provider.generate_output()
+            finally:
+                if provider.record_sink is not None and provider.interrupted.is_set():
+                    provider.record_sink.close()
+            if provider.interrupted.is_set():
+                return None
+            if provider.record_sink is not None:
+                provider.record_sink.finish(account_data)
+            else:
+                write_output(
+                    account_data, shard, provider.output_format, provider.pretty
+                )
+            provider.checkpoint.discard()
+            logger.info(f"Completed collection for account {account_id}: {shard}")
+            return shard
+        except Exception as e:
+            logger.error(f"Error collecting account {account_id}: {str(e)}")
+            return None
+
+    def interrupt(self, reason: str = "interrupted") -> None:
+        """Stop every account in progress and skip the ones not started yet."""
+        self.interrupted.set()
+        for provider in list(self._member_providers):
+            provider.interrupt(reason)
+
+    def generate_output(self, output_dir: Path) -> List[Path]:
+        """Collect every member account and return the written shards in account order."""
+        account_ids = self.list_member_accounts()
+        logger.info(
+            f"Found {len(account_ids)} active accounts in the organization, "
+            f"collecting {self.account_concurrency} at a time"
+        )
+
+        with ThreadPoolExecutor(max_workers=self.account_concurrency) as executor:
+            shards = list(
+                executor.map(
+                    lambda account_id: self.collect_account(account_id, output_dir),
+                    account_ids,
+                )
+            )
+        return [shard for shard in shards if shard is not None]
+
+
+def filesystem_type(path: Path) -> Optional[str]:
+    """Type of the filesystem ``path`` is on, from /proc/mounts; None if unknown."""
+    try:
+        with open("/proc/mounts") as f:
+            mounts = [line.split()[1:3] for line in f if line.strip()]
+    except OSError:
+        return None
+    path = str(Path(path).resolve())
+    best = None
+    for mount_point, fstype in mounts:
+        mount_point = mount_point.replace("\\040", " ")
+        if path == mount_point or path.startswith(mount_point.rstrip("/") + "/"):
+            if best is None or len(mount_point) > len(best[0]):
+                best = (mount_point, fstype)
+    return best[1] if best else None
+
+
+class LeaseBackend(ABC):
+    """
+    Coordination backend for sharded collection.
+    A run is split into work units; replicas lease units, renew their leases
+    while working and store the results. A unit whose lease expires, e.g.
+    because its pod was lost, can be leased again by another replica.
+    """
+
+    @abstractmethod
+    def register_units(self, run_id: str, units: List[Dict[str, Any]]) -> None:
+        """Add the work units of a run, ignoring units that already exist."""
+
+    @abstractmethod
+    def acquire(self, run_id: str, owner: str, ttl: float) -> Optional[Dict[str, Any]]:
+        """Lease the next free or expired unit, or return None if there is none."""
+
+    @abstractmethod
+    def renew(self, run_id: str, owner: str, ttl: float) -> None:
+        """Extend every lease currently held by ``owner``."""
+
+    @abstractmethod
+    def complete(
+        self,
+        run_id: str,
+        unit_id: str,
+        owner: str,
+        result: Optional[str],
+        partial: bool,
+    ) -> bool:
+        """Store the JSON result of a unit; False if it was already completed."""
+
+    @abstractmethod
+    def remaining(self, run_id: str) -> int:
+        """Number of units of the run that are not completed yet."""
+
+    @abstractmethod
+    def claim_merge(self, run_id: str, owner: str) -> bool:
+        """Let exactly one replica merge the results of a finished run."""
+
+    @abstractmethod
+    def results(self, run_id: str) -> List[Dict[str, Any]]:
+        """Completed units of the run in unit order."""
+
+
+class SQLiteLeaseBackend(LeaseBackend):
+    """
+    LeaseBackend stored in a SQLite database.
+    Only for replicas on a single node sharing a local disk, e.g. through a
+    hostPath volume, and as a local stand-in for tests: SQLite locking is not
+    reliable on network filesystems, so two replicas could hold the same lease.
+    Every operation uses its own connection, so it can be shared by threads.
+    """
+
+    # Units whose lease expired this many times are given up on
+    MAX_ATTEMPTS = 3
+
+    # Filesystem types SQLite cannot lock reliably
+    NETWORK_FILESYSTEMS = ("nfs", "nfs4", "cifs", "smb3", "smbfs", "9p", "ceph")
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fstype = filesystem_type(self.path.parent)
+        if fstype in self.NETWORK_FILESYSTEMS or (fstype or "").startswith("fuse"):
+            raise ValueError(
+                f"Lease database {self.path} is on a {fstype} filesystem; SQLite "
+                "leases only work for replicas on a single node with a local disk"
+            )
+        with closing(self._connect()) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS leases (
+                    run_id TEXT NOT NULL,
+                    unit_id TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    section TEXT NOT NULL,
+                    region TEXT NOT NULL,
+                    service TEXT NOT NULL,
+                    owner TEXT,
+                    expires_at REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    done INTEGER NOT NULL DEFAULT 0,
+                    result TEXT,
+                    partial INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (run_id, unit_id)
+                )
+                """)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS merges (run_id TEXT PRIMARY KEY, owner TEXT NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def register_units(self, run_id: str, units: List[Dict[str, Any]]) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT OR IGNORE INTO leases (run_id, unit_id, position, section, region, service) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id,
+                        unit["unit_id"],
+                        unit["position"],
+                        unit["section"],
+                        unit["region"],
+                        unit["service"],
+                    )
+                    for unit in units
+                ],
+            )
+            conn.execute("COMMIT")
+
+    def acquire(self, run_id: str, owner: str, ttl: float) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT * FROM leases WHERE run_id = ? AND done = 0 "
+                "AND (expires_at IS NULL OR expires_at < ?) AND attempts < ? "
+                "ORDER BY position LIMIT 1",
+                (run_id, now, self.MAX_ATTEMPTS),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE leases SET owner = ?, expires_at = ?, attempts = attempts + 1 "
+                    "WHERE run_id = ? AND unit_id = ?",
+                    (owner, now + ttl, run_id, row["unit_id"]),
+                )
+            conn.execute("COMMIT")
+        return dict(row) if row is not None else None
+
+    def renew(self, run_id: str, owner: str, ttl: float) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE leases SET expires_at = ? WHERE run_id = ? AND owner = ? AND done = 0",
+                (time.time() + ttl, run_id, owner),
+            )
+
+    def complete(
+        self,
+        run_id: str,
+        unit_id: str,
+        owner: str,
+        result: Optional[str],
+        partial: bool,
+    ) -> bool:
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "UPDATE leases SET done = 1, owner = ?, result = ?, partial = ? "
+                "WHERE run_id = ? AND unit_id = ? AND done = 0",
+                (owner, result, int(partial), run_id, unit_id),
+            )
+            return cursor.rowcount == 1
+
+    def remaining(self, run_id: str) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM leases WHERE run_id = ? AND done = 0 "
+                "AND NOT (attempts >= ? AND expires_at < ?)",
+                (run_id, self.MAX_ATTEMPTS, time.time()),
+            ).fetchone()[0]
+
+    def claim_merge(self, run_id: str, owner: str) -> bool:
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO merges (run_id, owner) VALUES (?, ?)",
+                (run_id, owner),
+            )
+            return cursor.rowcount == 1
+
+    def results(self, run_id: str) -> List[Dict[str, Any]]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT * FROM leases WHERE run_id = ? ORDER BY position", (run_id,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+
+class ShardedCollector:
+    """
+    Collects one account cooperatively across several replicas.
+    Every replica registers the same (region, service) work units for a run ID,
+    then leases and collects units until none are left. Leases are renewed by a
+    heartbeat while a unit runs, so only the units of a lost replica are redone.
+    The replica that claims the merge assembles the final output.
+    """
+
+    POLL_INTERVAL = 5.0
+
+    def __init__(
+        self,
+        provider: "AWSProvider",
+        backend: LeaseBackend,
+        run_id: str,
+        owner: Optional[str] = None,
+        lease_ttl: float = 120.0,
+    ):
+        self.provider = provider
+        self.backend = backend
+        self.run_id = run_id
+        self.owner = owner or f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        self.lease_ttl = lease_ttl
+        # Keyed by (is_global, name): WAFv2CloudFrontService shares the name of
+        # the regional WAFv2Service
+        self.services = {
+            (service.is_global, service.name): service
+            for service in provider.regional_services + provider.global_services
+        }
+        self._done = threading.Event()
+        self.interrupted = threading.Event()
+        self._running: Dict[str, CancellationToken] = {}
+
+    def units(self) -> List[Dict[str, Any]]:
+        """Work units of the run, longest expected first."""
+        tasks = self.provider._build_tasks(
+            self.provider.target_regions, include_global=True
+        )
+        tasks.sort(key=lambda task: task.expected_duration, reverse=True)
+        return [
+            {
+                "unit_id": f"{task.section}/{task.service_name}",
+                "position": position,
+                "section": task.section,
+                "region": task.region,
+                "service": task.service_name,
+            }
+            for position, task in enumerate(tasks)
+        ]
+
+    def _heartbeat(self) -> None:
+        while not self._done.wait(self.lease_ttl / 3):
+            try:
+                self.backend.renew(self.run_id, self.owner, self.lease_ttl)
+            except Exception as e:
+                logger.warning(f"Could not renew leases of run {self.run_id}: {e}")
+
+    def collect_unit(self, unit: Dict[str, Any]) -> None:
+        """Collect a leased unit and store its result."""
+        task = CollectionTask(
+            unit["region"],
+            self.services[(unit["section"] == "global", unit["service"])],
+            unit["service"],
+            section=unit["section"],
+        )
+        task.token = CancellationToken(self.provider.service_timeout)
+        self._running[unit["unit_id"]] = task.token
+        task.submitted_at = task.started_at = time.monotonic()
+        reset = current_cancellation_token.set(task.token)
+        try:
+            _, task.result = self.provider.process_service(
+                task.service_class, task.region
+            )
+        except Exception as e:
+            task.error = str(e)
+        finally:
+            current_cancellation_token.reset(reset)
+        task.finished_at = time.monotonic()
+        task.partial = task.token.interrupted
+        self._running.pop(unit["unit_id"], None)
+        self.provider.task_stats.append(task.stats())
+        if self.interrupted.is_set():
+            # Leave the unit to the other replicas once its lease expires
+            return
+
+        result = dumps(task.result) if task.result else None
+        if not self.backend.complete(
+            self.run_id, unit["unit_id"], self.owner, result, task.partial
+        ):
+            logger.info(f"{unit['unit_id']} was already completed by another replica")
+
+    def interrupt(self, reason: str = "interrupted") -> None:
+        """Stop taking units and cancel the running ones without completing them."""
+        logger.warning(f"Replica {self.owner} is leaving run {self.run_id}: {reason}")
+        self.interrupted.set()
+        for token in list(self._running.values()):
+            token.cancel(reason)
+
+    def _work(self) -> None:
+        while not self.interrupted.is_set():
+            unit = self.backend.acquire(self.run_id, self.owner, self.lease_ttl)
+            if unit is not None:
+                self.collect_unit(unit)
+            elif not self.backend.remaining(self.run_id):
+                return
+            else:
+                # The rest is leased by other replicas; wait in case one is lost
+                time.sleep(self.POLL_INTERVAL)
+
+    def merge(self) -> List[Dict[str, Any]]:
+        """Assemble the stored results of the run into output records."""
+        records = {"global": self.provider._new_global_record()}
+        records.update(
+            (region, self.provider._new_region_record(region))
+            for region in self.provider.target_regions
+        )
+        for unit in self.backend.results(self.run_id):
+            record = records.setdefault(
+                unit["section"], self.provider._new_region_record(unit["section"])
+            )
+            if not unit["done"]:
+                logger.warning(
+                    f"Giving up on {unit['unit_id']} after {unit['attempts']} lost leases"
+                )
+                record.setdefault("partial_services", []).append(unit["service"])
+                continue
+            if unit["result"]:
+                data = json.loads(unit["result"])
+                if self.provider.blob_store is not None:
+                    self.provider.blob_store.intern(data, unit["service"])
+                record["services"][unit["service"]] = data
+            if unit["partial"]:
+                record.setdefault("partial_services", []).append(unit["service"])
+
+        # Keep the order of a regular run, services in the order of the provider
+        order = {}
+        for index, (_, name) in enumerate(self.services):
+            order.setdefault(name, index)
+        for record in records.values():
+            record["services"] = dict(
+                sorted(
+                    record["services"].items(),
+                    key=lambda item: order.get(item[0], len(order)),
+                )
+            )
+        sections = ["global"] + [section for section in records if section != "global"]
+        output = [records[section] for section in sections]
+        if self.provider.blob_store is not None and self.provider.blob_store.blobs:
+            output.append(
+                self.provider.blob_store.record(self.provider.get_account_id())
+            )
+        return output
+
+    def generate_output(self) -> Optional[List[Dict[str, Any]]]:
+        """Work on the run until it is finished.
+
+        Returns the merged output on the replica that merges, None on the others.
+        """
+        self.provider.get_account_id()
+        units = self.units()
+        self.backend.register_units(self.run_id, units)
+        logger.info(
+            f"Replica {self.owner} joined run {self.run_id} of {len(units)} units"
+        )
+
+        heartbeat = threading.Thread(target=self._heartbeat, daemon=True)
+        heartbeat.start()
+        try:
+            with ThreadPoolExecutor(max_workers=self.provider.max_workers) as executor:
+                for future in [
+                    executor.submit(self._work)
+                    for _ in range(self.provider.max_workers)
+                ]:
+                    future.result()
+        finally:
+            self._done.set()
+        if self.interrupted.is_set():
+            return None
+
+        logger.info(
+            f"Replica {self.owner} collected {len(self.provider.task_stats)} units of run {self.run_id}"
+        )
+        self.provider.log_api_summary()
+        self.provider.save_duration_history()
+
+        if not self.backend.claim_merge(self.run_id, self.owner):
+            logger.info(f"Run {self.run_id} is merged by another replica")
+            return None
+        return self.merge()
+
+
+class AzureProvider:
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config or {}
+
+        self.client = StorageManagementClient(
+            credential=ClientSecretCredential(
+                client_id=self.config.get("azure_client_id"),
+                client_secret=self.config.get("azure_client_secret"),
+                tenant_id=self.config.get("azure_tenant_id"),
+            ),
+            subscription_id=self.config.get("azure_subscription_id"),
+        )
+
+    def generate_output(self) -> List[Dict[str, Any]]:
+        data = self.client.storage_accounts.list()
+        items = []
+        for account in data:
+            items.append(
+                {
+                    "id": account.id,
+                    "name": account.name,
+                    "location": account.location,
+                    "provisioning_state": account.provisioning_state,
+                    "sku": account.sku,
                     "kind": account.kind,
                     "identity": account.identity,
                     "extended_location": account.extended_location,
@@ -3232,6 +6387,188 @@ def parse_args():
         "--role-arn",
         help="AWS Role ARN (can also be set via AWS_ROLE_ARN environment variable)",
     )
+    parser.add_argument(
+        "--region-concurrency",
+        type=int,
+        help="Number of AWS regions to collect in parallel (can also be set via REGION_CONCURRENCY environment variable)",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        help="Number of worker threads shared by all region/service tasks (can also be set via MAX_WORKERS environment variable)",
+    )
+    parser.add_argument(
+        "--service-concurrency",
+        help='Per-service concurrency caps such as "backup=1,ecr=2" (can also be set via SERVICE_CONCURRENCY environment variable)',
+    )
+    parser.add_argument(
+        "--max-pool-connections",
+        type=int,
+        help="Maximum HTTP connections per AWS client (can also be set via MAX_POOL_CONNECTIONS environment variable)",
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        help="Maximum attempts per AWS API call including retries (can also be set via AWS_MAX_ATTEMPTS environment variable)",
+    )
+    parser.add_argument(
+        "--retry-mode",
+        choices=["legacy", "standard", "adaptive"],
+        help="botocore retry mode (can also be set via AWS_RETRY_MODE environment variable)",
+    )
+    parser.add_argument(
+        "--connect-timeout",
+        type=float,
+        help="Seconds to wait for a connection to an AWS API (can also be set via AWS_CONNECT_TIMEOUT environment variable)",
+    )
+    parser.add_argument(
+        "--read-timeout",
+        type=float,
+        help="Seconds to wait for an AWS API response (can also be set via AWS_READ_TIMEOUT environment variable)",
+    )
+    parser.add_argument(
+        "--service-timeout",
+        type=float,
+        help="Seconds a service may run in a region before it is stopped and its partial results kept (can also be set via SERVICE_TIMEOUT environment variable)",
+    )
+    parser.add_argument(
+        "--api-rate-limit",
+        type=float,
+        help="Initial AWS API requests per second per account, region and API; adapts to throttling, 0 disables (can also be set via API_RATE_LIMIT environment variable)",
+    )
+    parser.add_argument(
+        "--fan-out-workers",
+        type=int,
+        help="Threads each service uses for per-resource detail calls (can also be set via FAN_OUT_WORKERS environment variable)",
+    )
+    parser.add_argument(
+        "--region-processes",
+        type=int,
+        help="Collect regions in this many worker processes instead of threads of one process, 0 disables (can also be set via REGION_PROCESSES environment variable)",
+    )
+    parser.add_argument(
+        "--state-dir",
+        help="Directory for state kept between runs, on a persistent volume for runs to be resumed after a restart (can also be set via STATE_DIR environment variable)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Carry unchanged resources over from the previous run instead of describing them again (can also be set via INCREMENTAL environment variable)",
+    )
+    parser.add_argument(
+        "--response-cache",
+        action="store_true",
+        help="Serve repeated read-only AWS API calls from a cache in the state directory (can also be set via RESPONSE_CACHE environment variable)",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        help="Seconds a cached API response stays valid (can also be set via CACHE_TTL environment variable)",
+    )
+    parser.add_argument(
+        "--cache-ttls",
+        help='Per-operation cache TTLs in seconds, e.g. "describe_regions=21600,describe_instances=300" (can also be set via CACHE_TTLS environment variable)',
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        help="Size in MB the response cache is kept under (can also be set via CACHE_MAX_MB environment variable)",
+    )
+    parser.add_argument(
+        "--run-id",
+        help="ID under which finished results of this run are checkpointed (can also be set via RUN_ID environment variable)",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Resume an interrupted run, skipping the services it already collected (can also be set via RESUME_RUN_ID environment variable)",
+    )
+    parser.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="Only collect the services CloudTrail logged write events for since the last snapshot and reuse the rest (can also be set via CHANGED_ONLY environment variable)",
+    )
+    parser.add_argument(
+        "--probe",
+        action="store_true",
+        help="Probe regional services with cheap list calls first and skip the ones that are empty (can also be set via PROBE environment variable)",
+    )
+    parser.add_argument(
+        "--organization",
+        action="store_true",
+        help="Collect every active account of the AWS Organization, one output shard per account (can also be set via ORGANIZATION_MODE environment variable)",
+    )
+    parser.add_argument(
+        "--member-role-name",
+        help="Role assumed in each member account in organization mode (can also be set via MEMBER_ROLE_NAME environment variable)",
+    )
+    parser.add_argument(
+        "--account-concurrency",
+        type=int,
+        help="Number of member accounts collected in parallel in organization mode (can also be set via ACCOUNT_CONCURRENCY environment variable)",
+    )
+    parser.add_argument(
+        "--shard-run-id",
+        help="Share the collection of this run ID with other replicas through leases (can also be set via SHARD_RUN_ID environment variable)",
+    )
+    parser.add_argument(
+        "--lease-db",
+        help="SQLite database coordinating the replicas of a sharded run, on a local disk shared by replicas on the same node, default <state-dir>/leases.sqlite (can also be set via LEASE_DB environment variable)",
+    )
+    parser.add_argument(
+        "--lease-ttl",
+        type=float,
+        help="Seconds a replica may hold a work unit without renewing its lease (can also be set via LEASE_TTL environment variable)",
+    )
+    parser.add_argument(
+        "--upload-mode",
+        choices=["full", "delta"],
+        help="Upload the whole output, or only the sections that changed since the last upload (can also be set via UPLOAD_MODE environment variable)",
+    )
+    parser.add_argument(
+        "--force-upload",
+        action="store_true",
+        help="Upload the whole output even if it is unchanged since the last upload (can also be set via FORCE_UPLOAD environment variable)",
+    )
+    parser.add_argument(
+        "--split-regions",
+        action="store_true",
+        help="Write and upload every region record as its own output file (can also be set via SPLIT_REGIONS environment variable)",
+    )
+    parser.add_argument(
+        "--upload-workers",
+        type=int,
+        help="Files uploaded in parallel (default: 4) (can also be set via UPLOAD_WORKERS environment variable)",
+    )
+    parser.add_argument(
+        "--pipeline-upload",
+        action="store_true",
+        help="Upload every region as its own file as soon as it is collected instead of after the whole run (can also be set via PIPELINE_UPLOAD environment variable)",
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=sorted(OUTPUT_EXTENSIONS),
+        help="Write the output as one JSON list, or as NDJSON with one line per region and service written as soon as it is collected (default: json) (can also be set via OUTPUT_FORMAT environment variable)",
+    )
+    parser.add_argument(
+        "--parquet-dir",
+        help="Also export the resources as one Parquet table per resource type into this directory; needs pyarrow (can also be set via PARQUET_DIR environment variable)",
+    )
+    parser.add_argument(
+        "--dedupe-blobs",
+        action="store_true",
+        help="Store policy documents and other large repeated values once in a blobs record and refer to them by hash (can also be set via DEDUPE_BLOBS environment variable)",
+    )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Indent the JSON output instead of writing it compactly (can also be set via PRETTY_OUTPUT environment variable)",
+    )
+    parser.add_argument(
+        "--compress",
+        choices=sorted(COMPRESSIONS),
+        help="Compress the output while it is written; zstd needs the zstandard package and falls back to gzip (default: none) (can also be set via COMPRESS environment variable)",
+    )
     parser.add_argument(
         "--application-id",
         help="Application ID (can also be set via APPLICATION_ID environment variable)",
@@ -3271,6 +6608,496 @@ def parse_args():
     return parser.parse_args()
 
 
+class Uploader:
+    """
+    Uploads output files to Kovr and registers them as sources.
+    Presigned URLs for all files are requested in one batch and the files are
+    PUT concurrently over one pooled session. Only idempotent requests, such as
+    the PUTs, are retried; requesting URLs and registering sources are sent once.
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    UUID_PATTERN = re.compile(
+        r"[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}"
+    )
+
+    def __init__(
+        self,
+        url: str,
+        application_id: str,
+        connection_id: str,
+        source_id: Optional[str] = None,
+        max_workers: int = 4,
+        max_attempts: int = 5,
+        timeout: tuple = (10, 300),
+        backoff_factor: float = 1,
+    ):
+        self.url = url
+        self.application_id = application_id
+        self.connection_id = connection_id
+        self.source_id = source_id
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.max_workers,
+            pool_maxsize=self.max_workers,
+            max_retries=Retry(
+                total=max_attempts - 1,
+                backoff_factor=backoff_factor,
+                status_forcelist=self.RETRY_STATUSES,
+                allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def presign(self, output_files: List[Path]) -> List[Dict[str, Any]]:
+        """Request presigned upload URLs for all files at once."""
+        endpoint = f"{self.url}/app/uploads/generate-presigned-url-internal?app_id={self.application_id}"
+        if self.source_id and self.source_id != "source_id":
+            endpoint += f"&source_id={self.source_id}"
+
+        items = [
+            {
+                "file_type": "source_documents",
+                "file_name": output_file.name,
+                "fe_id": str(uuid.uuid4()),
+            }
+            for output_file in output_files
+        ]
+        data = self._request("POST", endpoint, json={"items": items}).json()
+        presigned = data.get("data") if isinstance(data, dict) else None
+        if not isinstance(presigned, list) or len(presigned) != len(items):
+            raise ValueError(
+                f"Expected {len(items)} presigned URLs, got: {str(data)[:200]}"
+            )
+        return presigned
+
+    def _put_file(self, output_file: Path, url: str) -> None:
+        # Compressed files were compressed while written and are sent as they are
+        encoding = content_encoding(output_file)
+        headers = {"Content-Encoding": encoding} if encoding else {}
+        with open(output_file, "rb") as f:
+            self._request("PUT", url, data=f, headers=headers)
+
+    def source_uuid(self, item: Dict[str, Any]) -> str:
+        uuids = self.UUID_PATTERN.findall(item["url"])
+        if not uuids:
+            raise ValueError(f"No source ID in presigned URL {item['url']}")
+        return uuids[0]
+
+    def transfer(self, output_files: List[Path]) -> List[str]:
+        """Upload the files without registering them and return their source IDs."""
+        presigned = self.presign(output_files)
+
+        def run(job: tuple) -> None:
+            output_file, item = job
+            self._put_file(output_file, item["url"])
+            logger.info(f"Uploaded {output_file}")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(run, zip(output_files, presigned)))
+        return [self.source_uuid(item) for item in presigned]
+
+    def register(self, source_uuids: List[str]) -> None:
+        """Register uploaded files as sources of the connection."""
+        self._request(
+            "PATCH",
+            f"{self.url}/app/{self.application_id}/sources-internal?connection_id={self.connection_id}",
+            json={
+                "items": [
+                    {"control_ids": [], "tags": [], "uuid": source_uuid}
+                    for source_uuid in source_uuids
+                ]
+            },
+        )
+
+    def upload(self, output_files: List[Path]) -> List[str]:
+        """Upload the files and register them as sources."""
+        source_uuids = self.transfer(output_files)
+        self.register(source_uuids)
+        return source_uuids
+
+
+class UploadPipeline:
+    """
+    Uploads region records in the background while collection goes on.
+    Each record is written to its own file and transferred as soon as its
+    region is finished; the files are registered as sources together once
+    every transfer is done.
+    """
+
+    def __init__(
+        self,
+        uploader: Uploader,
+        upload_state: "UploadState",
+        output_dir: Path,
+        name: str,
+        output_format: str = "json",
+        compression: str = "none",
+        upload_mode: str = "full",
+        force: bool = False,
+        pretty: bool = False,
+    ):
+        self.uploader = uploader
+        self.upload_state = upload_state
+        self.output_dir = output_dir
+        self.name = name
+        self.output_format = output_format
+        self.compression = compression
+        self.upload_mode = upload_mode
+        self.force = force
+        self.pretty = pretty
+        self.output_files: List[Path] = []
+        self._lock = threading.Lock()
+        self._futures = []
+        self._executor = ThreadPoolExecutor(
+            max_workers=uploader.max_workers, thread_name_prefix="upload"
+        )
+
+    def submit(self, section: str, record: Any) -> None:
+        """Write and upload a finished region record in the background."""
+        shard = output_path(
+            self.output_dir,
+            f"{self.name}_{section}",
+            self.output_format,
+            self.compression,
+        )
+        with self._lock:
+            self.output_files.append(shard)
+            self._futures.append(self._executor.submit(self._upload, shard, record))
+
+    def _upload(self, shard: Path, record: Any) -> Optional[tuple]:
+        write_output([record], shard, self.output_format, self.pretty)
+        key = (
+            f"{self.uploader.application_id}/{self.uploader.connection_id}/{shard.name}"
+        )
+        upload_file, hashes = self.upload_state.prepare(
+            shard, key, mode=self.upload_mode, force=self.force
+        )
+        if upload_file is None:
+            logger.info(f"{shard} is unchanged since the last upload, skipping it")
+            return None
+        return key, hashes, self.uploader.transfer([upload_file])[0]
+
+    def finish(self) -> None:
+        """Wait for every transfer, then register the uploaded files."""
+        with self._lock:
+            futures = list(self._futures)
+        try:
+            uploads = [result for result in (f.result() for f in futures) if result]
+        finally:
+            self._executor.shutdown()
+        if not uploads:
+            return
+        self.uploader.register([source_uuid for _, _, source_uuid in uploads])
+        for key, hashes, _ in uploads:
+            self.upload_state.record(key, hashes)
+        self.upload_state.save()
+        logger.info(f"Uploaded and registered {len(uploads)} region files")
+
+    def abort(self) -> None:
+        """Drop the queued uploads without registering anything."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def write_region_shards(
+    records: List[Any],
+    output_dir: Path,
+    name: str,
+    output_format: str = "json",
+    compression: str = "none",
+    pretty: bool = False,
+) -> List[Path]:
+    """Write each region record to its own output file."""
+    shards = []
+    for record in records:
+        if isinstance(record, SerializedRecord):
+            record = json.loads(record)
+        shard = output_path(
+            output_dir, f"{name}_{record['region']}", output_format, compression
+        )
+        write_output([record], shard, output_format, pretty)
+        shards.append(shard)
+    return shards
+
+
+def canonical_json(value: Any) -> bytes:
+    """Key-sorted, compact UTF-8 JSON, equal for equal values."""
+    return json.dumps(
+        value,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=json_default,
+    ).encode("utf-8")
+
+
+def content_hash(value: Any) -> str:
+    """sha256 of the canonical JSON encoding of a value."""
+    return hashlib.sha256(canonical_json(value)).hexdigest()
+
+
+def json_pointer(*parts: str) -> str:
+    return "".join(
+        "/" + str(part).replace("~", "~0").replace("/", "~1") for part in parts
+    )
+
+
+class UploadState:
+    """
+    Content hashes of the last successful upload of every output file.
+    AWS output is hashed per region record and per service, so an unchanged
+    file can be skipped and a changed one uploaded as a delta of the sections
+    that changed. Collection times are left out of the hashes.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        try:
+            with open(self.path) as f:
+                self._hashes = json.load(f)
+        except FileNotFoundError:
+            self._hashes = {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable upload state {self.path}: {e}")
+            self._hashes = {}
+
+    @staticmethod
+    def section_hashes(records: Any) -> Dict[str, Any]:
+        if not isinstance(records, list) or not all(
+            isinstance(record, dict) and "region" in record and "services" in record
+            for record in records
+        ):
+            # Not made of region records, e.g. Azure output
+            return {"document": content_hash(records)}
+        hashes = {}
+        for record in records:
+            metadata = {
+                key: value
+                for key, value in record.items()
+                if key not in ("services", "collection_time")
+            }
+            hashes[record["region"]] = {
+                "record": content_hash(metadata),
+                "services": {
+                    name: content_hash(data)
+                    for name, data in record["services"].items()
+                },
+            }
+        return hashes
+
+    @staticmethod
+    def _ndjson_lines(output_file: Path):
+        with open_output(output_file) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    @classmethod
+    def ndjson_section_hashes(cls, output_file: Path) -> Optional[Dict[str, Any]]:
+        """``section_hashes`` of an NDJSON output, read one line at a time.
+
+        Returns None when the file is not made of service lines and a summary.
+        """
+        services: Dict[str, Dict[str, str]] = {}
+        blobs = {}
+        summary = None
+        for line in cls._ndjson_lines(output_file):
+            kind = line.get("type") if summary is None else None
+            if kind == "service":
+                services.setdefault(line["region"], {})[line["service"]] = content_hash(
+                    line["data"]
+                )
+            elif kind == "blob":
+                blobs[line["id"]] = line["data"]
+            elif kind == "summary":
+                summary = line
+            else:
+                return None
+        if summary is None:
+            return None
+        hashes = {}
+        for record in summary["records"]:
+            metadata = {
+                key: value
+                for key, value in record.items()
+                if key not in ("services", "collection_time")
+            }
+            if record["region"] == BLOBS_SECTION and blobs:
+                metadata["blobs"] = blobs
+            hashes[record["region"]] = {
+                "record": content_hash(metadata),
+                "services": services.get(record["region"], {}),
+            }
+        return hashes
+
+    @classmethod
+    def ndjson_delta(
+        cls, output_file: Path, hashes: Dict[str, Any], previous: Dict[str, Any]
+    ):
+        """Yield the ``delta`` operations of an NDJSON output from its lines.
+
+        Only the records replaced as a whole are held in memory; changed
+        services of the other records are yielded as their lines are read.
+        """
+        for region in previous:
+            if region not in hashes:
+                yield {"op": "remove", "path": json_pointer(region)}
+        rewritten = {
+            region: {"services": {}}
+            for region, section in hashes.items()
+            if region not in previous or section["record"] != previous[region]["record"]
+        }
+        for region, section in hashes.items():
+            if region in rewritten:
+                continue
+            for name in previous[region]["services"]:
+                if name not in section["services"]:
+                    yield {
+                        "op": "remove",
+                        "path": json_pointer(region, "services", name),
+                    }
+
+        for line in cls._ndjson_lines(output_file):
+            kind = line.get("type")
+            if kind == "blob" and BLOBS_SECTION in rewritten:
+                rewritten[BLOBS_SECTION].setdefault("blobs", {})[line["id"]] = line[
+                    "data"
+                ]
+            elif kind == "service" and line["region"] in rewritten:
+                rewritten[line["region"]]["services"][line["service"]] = line["data"]
+            elif kind == "service" and line["region"] in hashes:
+                before = previous[line["region"]]["services"]
+                if before.get(line["service"]) != content_hash(line["data"]):
+                    yield {
+                        "op": "add" if line["service"] not in before else "replace",
+                        "path": json_pointer(
+                            line["region"], "services", line["service"]
+                        ),
+                        "value": line["data"],
+                    }
+            elif kind == "summary":
+                for record in line["records"]:
+                    if record["region"] in rewritten:
+                        yield {
+                            "op": (
+                                "add" if record["region"] not in previous else "replace"
+                            ),
+                            "path": json_pointer(record["region"]),
+                            "value": dict(record, **rewritten[record["region"]]),
+                        }
+
+    @staticmethod
+    def delta(records: List[Dict[str, Any]], previous: Dict[str, Any]) -> List[Dict]:
+        """JSON-patch style operations turning the previous upload into ``records``.
+
+        Paths address region records by their ``region`` rather than by list index.
+        """
+        operations = []
+        current = {record["region"]: record for record in records}
+        for region in previous:
+            if region not in current:
+                operations.append({"op": "remove", "path": json_pointer(region)})
+        for region, record in current.items():
+            before = previous.get(region)
+            hashes = UploadState.section_hashes([record])[region]
+            if before is None:
+                operations.append(
+                    {"op": "add", "path": json_pointer(region), "value": record}
+                )
+                continue
+            if hashes["record"] != before["record"]:
+                operations.append(
+                    {"op": "replace", "path": json_pointer(region), "value": record}
+                )
+                continue
+            for name in before["services"]:
+                if name not in hashes["services"]:
+                    operations.append(
+                        {
+                            "op": "remove",
+                            "path": json_pointer(region, "services", name),
+                        }
+                    )
+            for name, digest in hashes["services"].items():
+                if before["services"].get(name) != digest:
+                    operations.append(
+                        {
+                            "op": (
+                                "add" if name not in before["services"] else "replace"
+                            ),
+                            "path": json_pointer(region, "services", name),
+                            "value": record["services"][name],
+                        }
+                    )
+        return operations
+
+    def prepare(
+        self, output_file: Path, key: str, mode: str = "full", force: bool = False
+    ) -> tuple:
+        """Decide what to upload for an output file.
+
+        Returns the file to upload, or None when nothing changed since the last
+        upload, and the hashes to record once the upload succeeded. NDJSON
+        output is streamed instead of being loaded back into memory.
+        """
+        records = None
+        hashes = (
+            self.ndjson_section_hashes(output_file)
+            if ".ndjson" in Path(output_file).suffixes
+            else None
+        )
+        if hashes is None:
+            records = read_output(output_file)
+            hashes = self.section_hashes(records)
+        previous = self._hashes.get(key)
+        if force or previous is None:
+            return output_file, hashes
+        if previous == hashes:
+            return None, hashes
+        if mode != "delta" or "document" in hashes or "document" in previous:
+            return output_file, hashes
+
+        name = output_file.name.split(".")[0]
+        # Compressed the same way as the output
+        suffix = output_file.suffix if content_encoding(output_file) else ""
+        delta_file = output_file.with_name(f"{name}.delta.json{suffix}")
+        operations = (
+            self.delta(records, previous)
+            if records is not None
+            else self.ndjson_delta(output_file, hashes, previous)
+        )
+        with open_output(delta_file, "w") as f:
+            f.write(
+                f'{{"base":{dumps(content_hash(previous))},'
+                f'"target":{dumps(content_hash(hashes))},"operations":['
+            )
+            for index, operation in enumerate(operations):
+                if index:
+                    f.write(",")
+                f.write(dumps(operation))
+            f.write("]}")
+        return delta_file, hashes
+
+    def record(self, key: str, hashes: Dict[str, Any]) -> None:
+        self._hashes[key] = hashes
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self._hashes, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
 def main():
     args = parse_args()
 
@@ -3280,6 +7107,36 @@ def main():
 
         source_provider = args.provider
 
+        application_id = args.application_id or os.environ.get("APPLICATION_ID")
+        current_source_id = args.source_id or os.environ.get("SOURCE_ID")
+        connection_id = args.connection_id or os.environ.get("CONNECTION_ID")
+        uploading = not (
+            not application_id
+            or application_id == ""
+            or application_id == "application_id"
+            or not connection_id
+            or connection_id == ""
+            or connection_id == "connection_id"
+        )
+        pipeline = None
+        if uploading:
+            upload_state = UploadState(
+                Path(args.state_dir or os.environ.get("STATE_DIR") or "output/state")
+                / "uploads.json"
+            )
+            upload_mode = args.upload_mode or os.environ.get("UPLOAD_MODE") or "full"
+            force_upload = args.force_upload or os.environ.get(
+                "FORCE_UPLOAD", ""
+            ).lower() in ("1", "true", "yes")
+            uploader = Uploader(
+                app_config[env]["url"],
+                application_id,
+                connection_id,
+                source_id=current_source_id,
+                max_workers=args.upload_workers
+                or int(os.environ.get("UPLOAD_WORKERS") or 4),
+            )
+
         if source_provider == "aws":
             # Only include args in config if they were explicitly provided
             provider_config = {}
@@ -3299,9 +7156,150 @@ def main():
                 provider_config["region"] = args.region
             if args.aws_external_id:
                 provider_config["aws_external_id"] = args.aws_external_id
+            if args.region_concurrency:
+                provider_config["region_concurrency"] = args.region_concurrency
+            if args.max_workers:
+                provider_config["max_workers"] = args.max_workers
+            if args.service_concurrency:
+                provider_config["service_concurrency"] = args.service_concurrency
+            if args.max_pool_connections:
+                provider_config["max_pool_connections"] = args.max_pool_connections
+            if args.max_attempts:
+                provider_config["max_attempts"] = args.max_attempts
+            if args.retry_mode:
+                provider_config["retry_mode"] = args.retry_mode
+            if args.connect_timeout:
+                provider_config["connect_timeout"] = args.connect_timeout
+            if args.read_timeout:
+                provider_config["read_timeout"] = args.read_timeout
+            if args.service_timeout:
+                provider_config["service_timeout"] = args.service_timeout
+            if args.api_rate_limit is not None:
+                provider_config["api_rate_limit"] = args.api_rate_limit
+            if args.fan_out_workers:
+                provider_config["fan_out_workers"] = args.fan_out_workers
+            if args.state_dir:
+                provider_config["state_dir"] = args.state_dir
+            if args.incremental:
+                provider_config["incremental"] = True
+            if args.changed_only:
+                provider_config["changed_only"] = True
+            if args.probe:
+                provider_config["probe"] = True
+            if args.output_format:
+                provider_config["output_format"] = args.output_format
+            if args.compress:
+                provider_config["compression"] = args.compress
+            if args.pretty:
+                provider_config["pretty"] = True
+            if args.dedupe_blobs:
+                provider_config["dedupe_blobs"] = True
+            if args.run_id:
+                provider_config["run_id"] = args.run_id
+            resume_run_id = args.resume or os.environ.get("RESUME_RUN_ID")
+            if resume_run_id:
+                provider_config["run_id"] = resume_run_id
+                provider_config["resume"] = True
+            if args.response_cache:
+                provider_config["response_cache"] = True
+            if args.cache_ttl is not None:
+                provider_config["cache_ttl"] = args.cache_ttl
+            if args.cache_ttls:
+                provider_config["cache_ttls"] = args.cache_ttls
+            if args.cache_max_mb:
+                provider_config["cache_max_mb"] = args.cache_max_mb
+            if args.region_processes is not None:
+                provider_config["region_processes"] = args.region_processes
 
             provider = AWSProvider(provider_config)
-            all_regions_data = provider.generate_output()
+            # Finish gracefully when the pod is stopped
+            stoppable = provider
+            signal.signal(
+                signal.SIGTERM,
+                lambda signum, frame: stoppable.interrupt("received SIGTERM"),
+            )
+            organization = args.organization or os.environ.get(
+                "ORGANIZATION_MODE", ""
+            ).lower() in ("1", "true", "yes")
+            if organization:
+                collector = OrganizationCollector(
+                    provider,
+                    member_role_name=args.member_role_name
+                    or os.environ.get("MEMBER_ROLE_NAME")
+                    or "OrganizationAccountAccessRole",
+                    account_concurrency=args.account_concurrency
+                    or int(os.environ.get("ACCOUNT_CONCURRENCY") or 2),
+                )
+                stoppable = collector
+                all_regions_data = None
+                output_files = collector.generate_output(output_dir)
+            elif args.shard_run_id or os.environ.get("SHARD_RUN_ID"):
+                collector = ShardedCollector(
+                    provider,
+                    SQLiteLeaseBackend(
+                        args.lease_db
+                        or os.environ.get("LEASE_DB")
+                        or provider.state_dir / "leases.sqlite"
+                    ),
+                    args.shard_run_id or os.environ.get("SHARD_RUN_ID"),
+                    lease_ttl=args.lease_ttl
+                    or float(os.environ.get("LEASE_TTL") or 120),
+                )
+                stoppable = collector
+                all_regions_data = collector.generate_output()
+                # Only the replica that merged the run writes and uploads it
+                output_files = []
+            elif uploading and (
+                args.pipeline_upload
+                or os.environ.get("PIPELINE_UPLOAD", "").lower() in ("1", "true", "yes")
+            ):
+                pipeline = UploadPipeline(
+                    uploader,
+                    upload_state,
+                    output_dir,
+                    "aws_data",
+                    provider.output_format,
+                    provider.compression,
+                    upload_mode=upload_mode,
+                    force=force_upload,
+                    pretty=provider.pretty,
+                )
+                provider.on_region_complete = pipeline.submit
+                try:
+                    provider.generate_output()
+                except BaseException:
+                    pipeline.abort()
+                    raise
+                if provider.interrupted.is_set():
+                    pipeline.abort()
+                else:
+                    provider.checkpoint.discard()
+                all_regions_data = None
+                output_files = pipeline.output_files
+            elif provider.output_format == "ndjson":
+                output_file = output_path(
+                    output_dir, "aws_data", "ndjson", provider.compression
+                )
+                provider.record_sink = NDJSONWriter(output_file)
+                try:
+                    all_regions_data = provider.generate_output()
+                finally:
+                    if provider.interrupted.is_set():
+                        provider.record_sink.close()
+                if not provider.interrupted.is_set():
+                    provider.record_sink.finish(all_regions_data)
+                    provider.checkpoint.discard()
+                    all_regions_data = None
+                    output_files = [output_file]
+            else:
+                all_regions_data = provider.generate_output()
+
+            if stoppable.interrupted.is_set():
+                logger.warning(
+                    f"Collection was interrupted before it finished; resume it with "
+                    f"--resume {provider.run_id}"
+                )
+                sys.exit(1)
 
         elif source_provider == "azure":
             provider_config = {}
@@ -3324,72 +7322,84 @@ def main():
             print(f"Provider {source_provider} is not yet implemented")
             sys.exit(1)
 
-        output_file = output_dir / f"{source_provider}_data.json"
-        with open(output_file, "w") as f:
-            json.dump(all_regions_data, f, indent=2, default=str)
+        if all_regions_data is not None:
+            output_format = (
+                args.output_format or os.environ.get("OUTPUT_FORMAT") or "json"
+            )
+            compression = resolve_compression(
+                args.compress or os.environ.get("COMPRESS")
+            )
+            pretty = args.pretty or os.environ.get("PRETTY_OUTPUT", "").lower() in (
+                "1",
+                "true",
+                "yes",
+            )
+            split_regions = args.split_regions or os.environ.get(
+                "SPLIT_REGIONS", ""
+            ).lower() in ("1", "true", "yes")
+            if split_regions and source_provider == "aws":
+                output_files = write_region_shards(
+                    all_regions_data,
+                    output_dir,
+                    f"{source_provider}_data",
+                    output_format,
+                    compression,
+                    pretty,
+                )
+            else:
+                output_file = output_path(
+                    output_dir, f"{source_provider}_data", output_format, compression
+                )
+                write_output(all_regions_data, output_file, output_format, pretty)
+                output_files = [output_file]
+            if source_provider == "aws":
+                provider.checkpoint.discard()
 
-        application_id = args.application_id or os.environ.get("APPLICATION_ID")
-        current_source_id = args.source_id or os.environ.get("SOURCE_ID")
-        connection_id = args.connection_id or os.environ.get("CONNECTION_ID")
+        task_stats = getattr(provider, "task_stats", None)
+        if task_stats:
+            with open(output_dir / f"{source_provider}_task_stats.json", "w") as f:
+                json.dump(task_stats, f, indent=2)
 
-        if (
-            not application_id
-            or application_id == ""
-            or application_id == "application_id"
-            or not connection_id
-            or connection_id == ""
-            or connection_id == "connection_id"
-        ):
+        if not uploading:
             logger.info("No application ID or source ID provided, skipping upload")
+        elif pipeline is not None:
+            pipeline.finish()
         else:
-            url = app_config[env]["url"]
-            endpoint = f"{url}/app/uploads/generate-presigned-url-internal?app_id={application_id}"
-
-            if (
-                current_source_id
-                and current_source_id != ""
-                and current_source_id != "source_id"
-            ):
-                endpoint += f"&source_id={current_source_id}"
-
-            data = {
-                "items": [
-                    {
-                        "file_type": "source_documents",
-                        "file_name": output_file.name,
-                        "fe_id": str(uuid.uuid4()),
-                    }
-                ]
-            }
-
-            response = requests.post(endpoint, json=data)
-
-            presigned_url = response.json()["data"][0]["url"]
-
-            uuid_pattern = re.compile(
-                r"[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}"
-            )
-            uuids = uuid_pattern.findall(presigned_url)
-            source_uuid = uuids[0]
-
-            with open(output_file, "rb") as f:
-                requests.put(presigned_url, data=f)
-
-            url_2 = f"{url}/app/{application_id}/sources-internal?connection_id={connection_id}"
-            data_2 = {
-                "items": [
-                    {
-                        "control_ids": [],
-                        "tags": [],
-                        "uuid": source_uuid,
-                    }
-                ]
-            }
-            response_2 = requests.patch(url_2, json=data_2)
+            uploads = []
+            for output_file in output_files:
+                key = f"{application_id}/{connection_id}/{output_file.name}"
+                upload_file, hashes = upload_state.prepare(
+                    output_file, key, mode=upload_mode, force=force_upload
+                )
+                if upload_file is None:
+                    logger.info(
+                        f"{output_file} is unchanged since the last upload, skipping it"
+                    )
+                    continue
+                uploads.append((upload_file, key, hashes))
+
+            if uploads:
+                uploader.upload([upload_file for upload_file, _, _ in uploads])
+                for upload_file, key, hashes in uploads:
+                    upload_state.record(key, hashes)
+                    logger.info(
+                        f"{provider} provider details have been written to {upload_file}"
+                    )
+                upload_state.save()
 
-            logger.info(
-                f"{provider} provider details have been written to {output_file}"
-            )
+        parquet_dir = args.parquet_dir or os.environ.get("PARQUET_DIR")
+        if parquet_dir and output_files:
+            if pyarrow is None:
+                logger.warning("pyarrow is not installed, skipping the Parquet export")
+            else:
+                try:
+                    exporter = ParquetExporter()
+                    for output_file in output_files:
+                        exporter.add(read_output(output_file))
+                    tables = exporter.write(Path(parquet_dir))
+                    logger.info(f"Wrote {len(tables)} Parquet tables to {parquet_dir}")
+                except (OSError, pyarrow.ArrowException) as e:
+                    logger.warning(f"Could not export Parquet tables: {e}")
 
     except Exception as e:
         print(f"Error: {str(e)}")
@@ -0,0 +1,92 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import data_collector as dc  # noqa: E402
+
+# Settings read from the environment that would otherwise leak into the tests
+ENV_VARS = [
+    "ACCOUNT_CONCURRENCY",
+    "API_RATE_LIMIT",
+    "AWS_CONNECT_TIMEOUT",
+    "AWS_EXTERNAL_ID",
+    "AWS_HOME_REGION",
+    "AWS_MAX_ATTEMPTS",
+    "AWS_READ_TIMEOUT",
+    "AWS_RETRY_MODE",
+    "AWS_ROLE_ARN",
+    "AWS_SESSION_TOKEN",
+    "CACHE_MAX_MB",
+    "CACHE_TTL",
+    "CACHE_TTLS",
+    "CHANGED_ONLY",
+    "COMPRESS",
+    "DEDUPE_BLOBS",
+    "FAN_OUT_WORKERS",
+    "INCREMENTAL",
+    "LEASE_DB",
+    "LEASE_TTL",
+    "MAX_POOL_CONNECTIONS",
+    "MAX_WORKERS",
+    "OUTPUT_FORMAT",
+    "PRETTY_OUTPUT",
+    "PROBE",
+    "REGION_CONCURRENCY",
+    "REGION_PROCESSES",
+    "RESPONSE_CACHE",
+    "RUN_ID",
+    "SERVICE_CONCURRENCY",
+    "SERVICE_TIMEOUT",
+    "STATE_DIR",
+]
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    for name in ENV_VARS:
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_EC2_METADATA_DISABLED", "true")
+
+
+def fake_service(name: str, is_global: bool = False, generate=None):
+    """Return an AWSService subclass that makes no API calls."""
+
+    class FakeService(dc.AWSService):
+        def generate(self):
+            if generate is not None:
+                return generate(self)
+            return {"Items": [{"Region": self.session.region_name}]}
+
+    FakeService.name = name
+    FakeService.is_global = is_global
+    FakeService.__name__ = f"Fake{name.title()}Service"
+    return FakeService
+
+
+@pytest.fixture
+def make_provider(tmp_path):
+    """Build a real AWSProvider with a temporary state directory and the given
+    fake services in place of the AWS ones."""
+
+    def build(services, regions=("us-east-1", "eu-west-1"), **config):
+        config.setdefault("state_dir", tmp_path / "state")
+        config.setdefault("api_rate_limit", 0)
+        provider = dc.AWSProvider(
+            {
+                "regions": list(regions),
+                "account_id": "123456789012",
+                **config,
+            }
+        )
+        provider.services = list(services)
+        provider.regional_services = [s for s in services if not s.is_global]
+        provider.global_services = [s for s in services if s.is_global]
+        return provider
+
+    return build
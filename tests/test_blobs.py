@@ -0,0 +1,56 @@
+import copy
+
+import data_collector as dc
+
+POLICY = {
+    "Version": "2012-10-17",
+    "Statement": [
+        {
+            "Effect": "Allow",
+            "Principal": {"Service": "lambda.amazonaws.com"},
+            "Action": "sts:AssumeRole",
+        }
+    ],
+}
+
+
+def test_configured_fields_are_interned_once():
+    store = dc.BlobStore()
+    data = {
+        "roles": {
+            "Roles": [
+                {"RoleName": "a", "AssumeRolePolicyDocument": copy.deepcopy(POLICY)},
+                {"RoleName": "b", "AssumeRolePolicyDocument": copy.deepcopy(POLICY)},
+            ]
+        }
+    }
+    store.intern(data, "iam")
+
+    references = [role["AssumeRolePolicyDocument"] for role in data["roles"]["Roles"]]
+    assert references[0] == references[1]
+    assert dc.BlobStore.is_reference(references[0])
+    assert store.blobs == {references[0]["$blob"]: POLICY}
+    assert store.references == 2
+
+
+def test_fields_outside_the_configured_paths_are_kept():
+    store = dc.BlobStore()
+    data = {
+        "functions": [{"name": "f", "policy": copy.deepcopy(POLICY)}],
+        "body": copy.deepcopy(POLICY),
+    }
+    store.intern(data, "lambda")
+    assert data["functions"][0]["policy"] == POLICY
+
+    nested = {"dashboards": [{"name": "d", "widgets": {"body": copy.deepcopy(POLICY)}}]}
+    store.intern(nested, "cloudwatch")
+    assert nested["dashboards"][0]["widgets"]["body"] == POLICY
+    assert not store.blobs
+
+
+def test_small_values_are_not_interned():
+    store = dc.BlobStore()
+    data = {"secrets": [{"name": "s", "policy": "{}"}]}
+    store.intern(data, "secretsmanager")
+    assert data["secrets"][0]["policy"] == "{}"
+    assert not store.blobs
@@ -0,0 +1,59 @@
+import boto3
+from botocore.stub import Stubber
+
+import data_collector as dc
+
+
+def test_service_keeps_partial_data_when_cut_off():
+    session = boto3.Session(
+        aws_access_key_id="testing",
+        aws_secret_access_key="testing",
+        region_name="us-east-1",
+    )
+    service = dc.LambdaService(session)
+    token = dc.CancellationToken()
+    events = service.client.meta.events
+    events.register("before-call", dc.check_cancellation)
+    # The deadline passes while the functions are being listed
+    events.register(
+        "after-call.lambda.ListFunctions",
+        lambda **kwargs: token.cancel("deadline exceeded"),
+    )
+
+    with Stubber(service.client) as stubber:
+        stubber.add_response(
+            "list_functions",
+            {
+                "Functions": [
+                    {
+                        "FunctionName": "handler",
+                        "FunctionArn": "arn:aws:lambda:us-east-1:123456789012:function:handler",
+                    }
+                ],
+                "NextMarker": "next",
+            },
+        )
+        # Queued so the stubber lets the call through to the cancellation hook
+        stubber.add_response("list_layers", {"Layers": []})
+        reset = dc.current_cancellation_token.set(token)
+        try:
+            data = service.generate()
+        finally:
+            dc.current_cancellation_token.reset(reset)
+
+    assert token.interrupted
+    assert data is not None
+    assert [function["name"] for function in data["functions"]] == ["handler"]
+    assert data["layers"] == []
+
+
+def test_service_drops_data_on_other_errors():
+    session = boto3.Session(
+        aws_access_key_id="testing",
+        aws_secret_access_key="testing",
+        region_name="us-east-1",
+    )
+    service = dc.LambdaService(session)
+    with Stubber(service.client) as stubber:
+        stubber.add_client_error("list_functions", "AccessDeniedException")
+        assert service.generate() is None
@@ -0,0 +1,72 @@
+import pytest
+
+import data_collector as dc
+from conftest import fake_service
+
+
+@pytest.fixture
+def no_write_events(monkeypatch):
+    monkeypatch.setattr(
+        dc.CloudTrailService, "get_write_event_sources", lambda self, since: set()
+    )
+
+
+def tracked_services(calls):
+    def generate(service):
+        calls.append((service.session.region_name, service.name))
+        return {"Items": [{"Region": service.session.region_name}]}
+
+    services = [
+        fake_service("alpha", generate=generate),
+        fake_service("beta", generate=generate),
+    ]
+    for service in services:
+        service.event_sources = (f"{service.name}.amazonaws.com",)
+    return services
+
+
+def collect(make_provider, services, output_file, **config):
+    provider = make_provider(services, changed_only=True, **config)
+    if output_file.suffix == ".ndjson":
+        provider.record_sink = dc.NDJSONWriter(output_file)
+        records = provider.generate_output()
+        provider.record_sink.finish(records)
+    else:
+        dc.write_output(provider.generate_output(), output_file)
+    return {record["region"]: record for record in dc.read_output(output_file)}
+
+
+@pytest.mark.parametrize("extension", ["json", "ndjson"])
+def test_changed_only_reuses_unchanged_services(
+    make_provider, tmp_path, no_write_events, extension
+):
+    calls = []
+    services = tracked_services(calls)
+    first = collect(make_provider, services, tmp_path / f"first.{extension}")
+    assert len(calls) == 4
+
+    calls.clear()
+    second = collect(make_provider, services, tmp_path / f"second.{extension}")
+    assert calls == []
+    for region in ("us-east-1", "eu-west-1"):
+        assert second[region]["services"] == first[region]["services"]
+        assert set(second[region]["services"]) == {"alpha", "beta"}
+
+
+def test_service_missing_from_snapshot_is_collected_again(
+    make_provider, tmp_path, no_write_events
+):
+    calls = []
+    services = tracked_services(calls)
+    collect(make_provider, services, tmp_path / "first.json")
+
+    provider = make_provider(services, changed_only=True)
+    snapshot = dc.read_output(provider.snapshot_path)
+    for record in snapshot:
+        record["services"].pop("beta")
+    dc.write_output(snapshot, provider.snapshot_path)
+
+    calls.clear()
+    second = collect(make_provider, services, tmp_path / "second.json")
+    assert sorted(calls) == [("eu-west-1", "beta"), ("us-east-1", "beta")]
+    assert set(second["eu-west-1"]["services"]) == {"alpha", "beta"}
@@ -0,0 +1,37 @@
+import logging
+
+from conftest import fake_service
+
+
+def test_resume_only_collects_missing_services(make_provider):
+    calls = []
+    fail = {"beta"}
+
+    def generate(service):
+        calls.append((service.session.region_name, service.name))
+        if service.name in fail:
+            raise RuntimeError("throttled")
+        return {"Items": [service.name]}
+
+    services = [
+        fake_service("alpha", generate=generate),
+        fake_service("beta", generate=generate),
+    ]
+    make_provider(services, run_id="run-1").generate_output()
+    assert len(calls) == 4
+
+    calls.clear()
+    fail.clear()
+    records = make_provider(services, run_id="run-1", resume=True).generate_output()
+    assert sorted(calls) == [("eu-west-1", "beta"), ("us-east-1", "beta")]
+    for record in records:
+        assert record["services"] == {
+            "alpha": {"Items": ["alpha"]},
+            "beta": {"Items": ["beta"]},
+        }
+
+
+def test_resume_without_checkpoints_warns(make_provider, caplog):
+    with caplog.at_level(logging.WARNING):
+        make_provider([fake_service("alpha")], run_id="lost", resume=True)
+    assert "persistent volume" in caplog.text
@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+
+import boto3
+from botocore.stub import Stubber
+
+import data_collector as dc
+
+
+def make_client(cache):
+    client = boto3.Session(
+        aws_access_key_id="testing",
+        aws_secret_access_key="testing",
+        region_name="us-east-1",
+    ).client("ec2")
+    cache.attach(client, "123456789012")
+    return client
+
+
+def test_cached_response_is_served_as_json(tmp_path):
+    cache = dc.ResponseCache(tmp_path / "cache.sqlite")
+    client = make_client(cache)
+    launched = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    with Stubber(client) as stubber:
+        stubber.add_response(
+            "describe_volumes",
+            {"Volumes": [{"VolumeId": "vol-1", "CreateTime": launched}]},
+        )
+        first = client.describe_volumes()
+    # Without the stubber a miss would go out to the network
+    second = client.describe_volumes()
+
+    assert first["Volumes"][0]["CreateTime"] == launched
+    assert second["Volumes"][0] == {
+        "VolumeId": "vol-1",
+        "CreateTime": dc.json_default(launched),
+    }
+    assert cache.hits == 1
+
+    with dc.closing(dc.sqlite3.connect(tmp_path / "cache.sqlite")) as conn:
+        (value,) = conn.execute("SELECT value FROM responses").fetchone()
+    assert isinstance(value, str)
+    assert dc.json.loads(value)["Volumes"][0]["VolumeId"] == "vol-1"
+
+
+def test_only_allow_listed_operations_are_cached(tmp_path):
+    cache = dc.ResponseCache(tmp_path / "cache.sqlite")
+    assert cache.is_cacheable("describe_volumes")
+    assert not cache.is_cacheable("get_credential_report")
+    assert not cache.is_cacheable("get_bucket_policy")
+    assert not cache.is_cacheable("list_functions")
+    assert not cache.is_cacheable("describe_task_definition")
+
+
+def test_unreadable_entry_is_a_miss(tmp_path):
+    cache = dc.ResponseCache(tmp_path / "cache.sqlite")
+    cache.put("key", "describe_volumes", {"Volumes": []})
+    cache._connection().execute(
+        "UPDATE responses SET value = ? WHERE key = ?", (b"\x80\x05junk", "key")
+    )
+    assert cache.get("key") is None
+    assert cache.get("key") is None
+    assert cache.misses == 2
@@ -0,0 +1,115 @@
+import threading
+import time
+
+from botocore.exceptions import ClientError
+
+import data_collector as dc
+from conftest import fake_service
+
+
+def make_tasks(regions, services):
+    return [
+        dc.CollectionTask(region, service, service.name)
+        for region in regions
+        for service in services
+    ]
+
+
+def test_scheduler_runs_every_task_once():
+    services = [fake_service(f"svc{i}") for i in range(5)]
+    tasks = make_tasks(["us-east-1", "eu-west-1", "ap-south-1"], services)
+    completed = []
+    lock = threading.Lock()
+
+    def on_complete(task):
+        with lock:
+            completed.append((task.region, task.service_name))
+
+    stats = dc.ServiceScheduler(max_workers=4).run(
+        tasks, lambda task: task.service_name, on_complete
+    )
+    assert sorted(completed) == sorted((t.region, t.service_name) for t in tasks)
+    assert len(stats) == len(tasks)
+    assert all(task.result == task.service_name for task in tasks)
+
+
+def test_scheduler_honours_service_and_region_limits():
+    services = [fake_service("slow"), fake_service("fast")]
+    tasks = make_tasks(["r1", "r2", "r3", "r4"], services)
+    lock = threading.Lock()
+    running = {"slow": 0, "regions": set()}
+    peaks = {"slow": 0, "regions": 0}
+
+    def run(task):
+        with lock:
+            if task.service_name == "slow":
+                running["slow"] += 1
+                peaks["slow"] = max(peaks["slow"], running["slow"])
+            running["regions"].add(task.region)
+            peaks["regions"] = max(peaks["regions"], len(running["regions"]))
+        time.sleep(0.02)
+        with lock:
+            if task.service_name == "slow":
+                running["slow"] -= 1
+
+    def on_complete(task):
+        with lock:
+            if all(t.finished_at is not None for t in tasks if t.region == task.region):
+                running["regions"].discard(task.region)
+
+    scheduler = dc.ServiceScheduler(
+        max_workers=8, service_limits={"slow": 1}, region_limit=2
+    )
+    scheduler.run(tasks, run, on_complete)
+    assert peaks["slow"] == 1
+    assert peaks["regions"] <= 2
+
+
+def test_failed_task_records_error_and_others_continue():
+    tasks = make_tasks(["us-east-1"], [fake_service("ok"), fake_service("bad")])
+
+    def run(task):
+        if task.service_name == "bad":
+            raise RuntimeError("boom")
+        return {"Items": []}
+
+    dc.ServiceScheduler(max_workers=2).run(tasks, run, lambda task: None)
+    by_name = {task.service_name: task for task in tasks}
+    assert by_name["bad"].error == "boom"
+    assert by_name["ok"].result == {"Items": []}
+
+
+def test_timed_out_task_is_marked_partial():
+    tasks = make_tasks(["us-east-1"], [fake_service("hang")])
+
+    def run(task):
+        # Poll the way API calls do: the before-call hook refuses them once
+        # the deadline has passed and marks the token as interrupted
+        while True:
+            try:
+                dc.check_cancellation()
+            except ClientError:
+                return {"Items": ["some"]}
+            time.sleep(0.01)
+
+    dc.ServiceScheduler(max_workers=1, service_timeout=0.05).run(
+        tasks, run, lambda task: None
+    )
+    assert tasks[0].partial
+    assert tasks[0].result == {"Items": ["some"]}
+
+
+def test_provider_keeps_region_order_and_global_record(make_provider):
+    provider = make_provider(
+        [fake_service("regional"), fake_service("account", is_global=True)],
+        regions=["eu-west-1", "us-east-1", "ap-south-1"],
+    )
+    records = provider.generate_output()
+    assert [record["region"] for record in records] == [
+        "global",
+        "eu-west-1",
+        "us-east-1",
+        "ap-south-1",
+    ]
+    assert records[1]["services"]["regional"] == {"Items": [{"Region": "eu-west-1"}]}
+    assert "account" in records[0]["services"]
@@ -0,0 +1,89 @@
+import pytest
+
+import data_collector as dc
+from conftest import fake_service
+
+
+def test_services_sharing_a_name_keep_their_scope(make_provider, tmp_path):
+    regional = fake_service("waf", generate=lambda s: {"Scope": "REGIONAL"})
+    account = fake_service(
+        "waf", is_global=True, generate=lambda s: {"Scope": "CLOUDFRONT"}
+    )
+    provider = make_provider([regional, account], regions=["eu-west-1"])
+    collector = dc.ShardedCollector(
+        provider, dc.SQLiteLeaseBackend(tmp_path / "leases.sqlite"), "run"
+    )
+    collector.POLL_INTERVAL = 0.01
+
+    records = {record["region"]: record for record in collector.generate_output()}
+    assert records["global"]["services"]["waf"] == {"Scope": "CLOUDFRONT"}
+    assert records["eu-west-1"]["services"]["waf"] == {"Scope": "REGIONAL"}
+
+
+UNITS = [
+    {
+        "unit_id": f"us-east-1/{name}",
+        "position": position,
+        "section": "us-east-1",
+        "region": "us-east-1",
+        "service": name,
+    }
+    for position, name in enumerate(["ec2", "s3"])
+]
+
+
+def test_lease_is_exclusive_until_it_expires(tmp_path):
+    backend = dc.SQLiteLeaseBackend(tmp_path / "leases.sqlite")
+    backend.register_units("run", UNITS)
+    backend.register_units("run", UNITS)
+
+    first = backend.acquire("run", "a", ttl=60)
+    second = backend.acquire("run", "b", ttl=60)
+    assert first["unit_id"] == "us-east-1/ec2"
+    assert second["unit_id"] == "us-east-1/s3"
+    assert backend.acquire("run", "c", ttl=60) is None
+    assert backend.remaining("run") == 2
+
+
+def test_expired_lease_is_taken_over(tmp_path):
+    backend = dc.SQLiteLeaseBackend(tmp_path / "leases.sqlite")
+    backend.register_units("run", UNITS[:1])
+    assert backend.acquire("run", "lost", ttl=-1)["unit_id"] == "us-east-1/ec2"
+
+    unit = backend.acquire("run", "survivor", ttl=60)
+    assert unit["unit_id"] == "us-east-1/ec2"
+    assert unit["attempts"] == 1
+    assert backend.complete("run", unit["unit_id"], "survivor", '{"x": 1}', False)
+    # The lost replica finishing late does not overwrite the result
+    assert not backend.complete("run", unit["unit_id"], "lost", '{"x": 2}', False)
+    assert backend.remaining("run") == 0
+    assert backend.results("run")[0]["result"] == '{"x": 1}'
+
+
+def test_renewed_lease_is_not_taken_over(tmp_path):
+    backend = dc.SQLiteLeaseBackend(tmp_path / "leases.sqlite")
+    backend.register_units("run", UNITS[:1])
+    backend.acquire("run", "a", ttl=-1)
+    backend.renew("run", "a", ttl=60)
+    assert backend.acquire("run", "b", ttl=60) is None
+
+
+def test_unit_is_given_up_after_max_attempts(tmp_path):
+    backend = dc.SQLiteLeaseBackend(tmp_path / "leases.sqlite")
+    backend.register_units("run", UNITS[:1])
+    for _ in range(backend.MAX_ATTEMPTS):
+        assert backend.acquire("run", "a", ttl=-1) is not None
+    assert backend.acquire("run", "a", ttl=60) is None
+    assert backend.remaining("run") == 0
+
+
+def test_only_one_replica_merges(tmp_path):
+    backend = dc.SQLiteLeaseBackend(tmp_path / "leases.sqlite")
+    assert backend.claim_merge("run", "a")
+    assert not backend.claim_merge("run", "b")
+
+
+def test_network_filesystem_is_refused(tmp_path, monkeypatch):
+    monkeypatch.setattr(dc, "filesystem_type", lambda path: "nfs4")
+    with pytest.raises(ValueError):
+        dc.SQLiteLeaseBackend(tmp_path / "leases.sqlite")
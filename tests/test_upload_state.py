@@ -0,0 +1,96 @@
+import pytest
+
+import data_collector as dc
+
+
+def records(lambda_memory=128, with_queue=True):
+    region = {
+        "provider": "aws",
+        "account_id": "123456789012",
+        "region": "us-east-1",
+        "collection_time": "2026-01-01T00:00:00",
+        "services": {
+            "lambda": {"functions": [{"name": "f", "memory": lambda_memory}]},
+            "sqs": {"queues": ["q"]} if with_queue else None,
+        },
+    }
+    if not with_queue:
+        del region["services"]["sqs"]
+    account = {
+        "provider": "aws",
+        "account_id": "123456789012",
+        "region": "global",
+        "collection_time": "2026-01-01T00:00:00",
+        "services": {"iam": {"users": ["u"]}},
+    }
+    blobs = {
+        "provider": "aws",
+        "account_id": "123456789012",
+        "region": dc.BLOBS_SECTION,
+        "services": {},
+        "blobs": {"abc": {"Statement": []}},
+    }
+    return [account, region, blobs]
+
+
+def write(tmp_path, name, output):
+    path = tmp_path / f"{name}.ndjson"
+    dc.write_output(output, path, "ndjson")
+    return path
+
+
+def test_streamed_hashes_match_loaded_ones(tmp_path):
+    path = write(tmp_path, "aws", records())
+    assert dc.UploadState.ndjson_section_hashes(path) == dc.UploadState.section_hashes(
+        dc.read_output(path)
+    )
+
+
+def test_prepare_streams_ndjson(tmp_path, monkeypatch):
+    state = dc.UploadState(tmp_path / "uploads.json")
+    first = write(tmp_path, "first", records())
+    upload_file, hashes = state.prepare(first, "aws", mode="delta")
+    assert upload_file == first
+    state.record("aws", hashes)
+
+    def fail(path):
+        raise AssertionError("the output was loaded back into memory")
+
+    monkeypatch.setattr(dc, "read_output", fail)
+    unchanged = write(tmp_path, "unchanged", records())
+    assert state.prepare(unchanged, "aws", mode="delta")[0] is None
+
+    changed = write(tmp_path, "changed", records(lambda_memory=256, with_queue=False))
+    delta_file, _ = state.prepare(changed, "aws", mode="delta")
+    with dc.open_output(delta_file) as f:
+        delta = dc.json.load(f)
+    assert sorted(delta["operations"], key=lambda op: op["path"]) == [
+        {
+            "op": "replace",
+            "path": "/us-east-1/services/lambda",
+            "value": {"functions": [{"name": "f", "memory": 256}]},
+        },
+        {"op": "remove", "path": "/us-east-1/services/sqs"},
+    ]
+
+
+@pytest.mark.parametrize("change", ["region", "blobs"])
+def test_streamed_delta_matches_loaded_delta(tmp_path, change):
+    before = records()
+    after = records(lambda_memory=256)
+    if change == "region":
+        after[1]["partial_services"] = ["lambda"]
+    else:
+        after[2]["blobs"]["def"] = {"Statement": [{"Effect": "Allow"}]}
+    previous = dc.UploadState.section_hashes(
+        dc.read_output(write(tmp_path, "a", before))
+    )
+    path = write(tmp_path, "b", after)
+    hashes = dc.UploadState.ndjson_section_hashes(path)
+
+    def key(operation):
+        return operation["path"]
+
+    streamed = sorted(dc.UploadState.ndjson_delta(path, hashes, previous), key=key)
+    loaded = sorted(dc.UploadState.delta(dc.read_output(path), previous), key=key)
+    assert streamed == loaded
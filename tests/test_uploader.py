@@ -0,0 +1,136 @@
+import gzip
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import data_collector as dc
+
+
+class StandIn:
+    """Local stand-in for the presign, S3 and sources endpoints."""
+
+    def __init__(self):
+        self.requests = []
+        self.uploads = {}
+        self.failures = {}
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def fail(self, method: str, times: int) -> None:
+        self.failures[method] = times
+
+    def count(self, method):
+        return sum(1 for request in self.requests if request[0] == method)
+
+
+@pytest.fixture
+def stand_in():
+    state = StandIn()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def reply(self, code=200, data=None):
+            body = json.dumps(data).encode() if data is not None else b""
+            self.send_response(code)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def handle_request(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            with state.lock:
+                state.requests.append((self.command, self.path))
+                if state.failures.get(self.command):
+                    state.failures[self.command] -= 1
+                    return self.reply(503)
+            if self.command == "POST":
+                base = f"http://127.0.0.1:{server.server_address[1]}/s3"
+                return self.reply(
+                    200,
+                    {
+                        "data": [
+                            {"url": f"{base}/{uuid.uuid4()}"}
+                            for _ in json.loads(body)["items"]
+                        ]
+                    },
+                )
+            if self.command == "PUT":
+                with state.lock:
+                    state.running += 1
+                    state.peak = max(state.peak, state.running)
+                time.sleep(0.05)
+                with state.lock:
+                    state.running -= 1
+                    state.uploads[self.path.rsplit("/", 1)[-1]] = (
+                        body,
+                        self.headers.get("Content-Encoding"),
+                    )
+            elif self.command == "PATCH":
+                state.registered = json.loads(body)
+            self.reply(200)
+
+        do_POST = do_PUT = do_PATCH = handle_request
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def make_uploader(stand_in):
+    return dc.Uploader(
+        stand_in.url, "app", "connection", max_workers=4, backoff_factor=0
+    )
+
+
+def output_files(tmp_path, count=3):
+    files = []
+    for index in range(count):
+        path = tmp_path / f"aws-{index}.json"
+        path.write_text(json.dumps({"index": index}))
+        files.append(path)
+    compressed = tmp_path / "aws-gz.json.gz"
+    compressed.write_bytes(gzip.compress(b'{"compressed": true}'))
+    return files + [compressed]
+
+
+def test_files_are_uploaded_in_parallel_and_registered(stand_in, tmp_path):
+    files = output_files(tmp_path)
+    source_uuids = make_uploader(stand_in).upload(files)
+
+    assert stand_in.count("POST") == 1
+    assert stand_in.count("PATCH") == 1
+    assert stand_in.peak > 1
+    assert [item["uuid"] for item in stand_in.registered["items"]] == source_uuids
+    for path, source_uuid in zip(files, source_uuids):
+        body, encoding = stand_in.uploads[source_uuid]
+        assert body == path.read_bytes()
+        assert encoding == ("gzip" if path.suffix == ".gz" else None)
+
+
+def test_failed_put_is_retried_with_the_whole_file(stand_in, tmp_path):
+    stand_in.fail("PUT", 2)
+    files = output_files(tmp_path, count=1)[:1]
+    [source_uuid] = make_uploader(stand_in).upload(files)
+
+    assert stand_in.count("PUT") == 3
+    assert stand_in.uploads[source_uuid][0] == files[0].read_bytes()
+
+
+@pytest.mark.parametrize("method", ["POST", "PATCH"])
+def test_non_idempotent_requests_are_not_retried(stand_in, tmp_path, method):
+    stand_in.fail(method, 1)
+    with pytest.raises(requests.HTTPError):
+        make_uploader(stand_in).upload(output_files(tmp_path, count=1)[:1])
+    assert stand_in.count(method) == 1